@@ -548,6 +548,22 @@ TXC_SCHEMA_ZIP_URL = env(
     default="http://www.transxchange.org.uk/schema/2.4/TransXChange_schema_2.4.zip",
 )
 TXC_XSD_PATH = env("TXC_XSD_PATH", default="TransXChange_general.xsd")
+# Upper bound, in bytes, of the estimated memory of the parsed TransXChange
+# documents each worker process keeps so that pipeline stages can share a single
+# parse of each file. A tree is estimated at 10 times the size of its source XML,
+# and every prefork worker process holds its own cache.
+TXC_DOCUMENT_CACHE_MAX_BYTES = env.int(
+    "TXC_DOCUMENT_CACHE_MAX_BYTES", default=256 * 1024 * 1024
+)
+# Number of worker processes the timetable ETL extracts the files of a zip with.
+# 0 or 1 extracts them serially in the Celery worker itself.
+TXC_EXTRACT_WORKERS = env.int("TXC_EXTRACT_WORKERS", default=0)
+# Number of worker processes PTI validation of the files of a zip is spread over.
+# 0 or 1 validates them serially in the Celery worker itself.
+PTI_VALIDATION_WORKERS = env.int("PTI_VALIDATION_WORKERS", default=0)
+# Number of worker processes schema validation of the files of a zip is spread over.
+# 0 or 1 validates them serially in the Celery worker itself.
+XML_VALIDATION_WORKERS = env.int("XML_VALIDATION_WORKERS", default=0)
 
 
 # NeTeX Schema
@@ -557,6 +573,9 @@ NETEX_SCHEMA_ZIP_URL = env(
     default="http://netex.uk/netex/schema/1.09c/NeTEx_Xml-v1.09c_2019.05.17.zip",
 )
 NETEX_XSD_PATH = env("NETEX_XSD_PATH", default="xsd/NeTEx_publication.xsd")
+# Compile the TxC and NeTEx schemas when a Celery worker starts, before its pool
+# forks, so that the children share them rather than each compiling its own.
+WARM_XSD_SCHEMA_CACHE = env.bool("WARM_XSD_SCHEMA_CACHE", default=True)
 
 # PTI
 # ------------------------------------------------------------------------------
@@ -631,6 +650,32 @@ AVL_CONSUMER_API_BASE_URL = env("AVL_CONSUMER_API_BASE_URL", default="")
 AVL_PRODUCER_API_BASE_URL = env("AVL_PRODUCER_API_BASE_URL", default="")
 AVL_PRODUCER_API_KEY = env("AVL_PRODUCER_API_KEY", default="")
 AVL_IP_ADDRESS_LIST = env("AVL_IP_ADDRESS_LIST", default="")
+# Number of threads the daily AVL validation round validates feeds with.
+# 1 validates them one after another in the Celery worker itself.
+AVL_VALIDATION_WORKERS = env.int("AVL_VALIDATION_WORKERS", default=8)
+# Seconds a single feed is given to validate before it is reported as timed out.
+AVL_VALIDATION_FEED_TIMEOUT = env.int("AVL_VALIDATION_FEED_TIMEOUT", default=120)
+
+# BULK DATA ARCHIVES
+# ------------------------------------------------------------------------------
+# Number of threads the bulk and change data archives fetch upload files with.
+# 1 fetches them one after another in the Celery worker itself.
+BULK_ARCHIVE_FETCH_WORKERS = env.int("BULK_ARCHIVE_FETCH_WORKERS", default=8)
+# Upload files fetched ahead of the one being written into the archive at most.
+BULK_ARCHIVE_PREFETCH = env.int("BULK_ARCHIVE_PREFETCH", default=16)
+# Bytes of a fetched upload file held in memory, larger files are spooled to disk.
+BULK_ARCHIVE_SPOOL_MAX_SIZE = env.int(
+    "BULK_ARCHIVE_SPOOL_MAX_SIZE", default=16 * 1024 * 1024
+)
+
+# API REQUEST LOGGING
+# ------------------------------------------------------------------------------
+# Requests to the API are logged in batches of this many records per worker.
+API_REQUEST_LOG_BATCH_SIZE = env.int("API_REQUEST_LOG_BATCH_SIZE", default=100)
+# Seconds between saves of a partial batch. 0 saves full batches in the request.
+API_REQUEST_LOG_FLUSH_INTERVAL = env.int("API_REQUEST_LOG_FLUSH_INTERVAL", default=5)
+# Records a worker queues at most, any more are dropped.
+API_REQUEST_LOG_MAX_SIZE = env.int("API_REQUEST_LOG_MAX_SIZE", default=10000)
 
 # S3 bucket name for Dataset maintenance
 # ------------------------------------------------------------------------------
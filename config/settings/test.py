@@ -56,3 +56,8 @@ EMAIL_PORT = 1025
 # Your stuff...
 # ------------------------------------------------------------------------------
 NOTIFIER = "django"
+# Threads use their own database connections, which cannot see the data of a test
+AVL_VALIDATION_WORKERS = 1
+# Save each API request as it is made, for the same reason
+API_REQUEST_LOG_BATCH_SIZE = 1
+API_REQUEST_LOG_FLUSH_INTERVAL = 0
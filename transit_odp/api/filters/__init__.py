@@ -3,7 +3,7 @@ from django_filters import rest_framework as filters
 
 from transit_odp.common.utils.date_validator import validate
 from transit_odp.data_quality.scoring import AMBER_THRESHOLD, GREEN_THRESHOLD
-from transit_odp.organisation.models import Dataset, Organisation
+from transit_odp.organisation.models import Dataset, DatasetRevision, Organisation
 
 STATUS_CHOICE = (
     ("inactive", "Inactive"),
@@ -47,9 +47,11 @@ class DatasetSearchFilterSet(filters.FilterSet):
     def admin_areas_filter(self, queryset, name, value):
         if value:
             admin_area_list = list(value.split(","))
-            queryset = queryset.filter(
-                Q(live_revision__admin_areas__atco_code__in=admin_area_list)
+            revisions = DatasetRevision.objects.filter(
+                admin_areas__atco_code__in=admin_area_list
             )
+            # Filtering on a subquery avoids duplicates from the admin_areas join
+            queryset = queryset.filter(live_revision__in=revisions)
         return queryset
 
     def feed_start_date_start_filter(self, queryset, name, value):
@@ -615,16 +615,63 @@ class FeedAPITests(APITestCase):
         )
         serializer = DatasetSerializer(objs, many=True)
         expected = serializer.data
+        Dataset.objects.update_search_vector()
 
-        # Test - Get response from API
+        # Test - Get response from API, searching the name as a phrase
         url = (
             reverse("api:feed-list", host=config.hosts.DATA_HOST)
-            + f"?search={dataset_to_test.live_revision.name}"
+            + f'?search="{dataset_to_test.live_revision.name}"'
         )
         response = self.client.get(url, HTTP_HOST=self.hostname)
         self.assertEqual(response.status_code, 200, "Check this hasnt blown up")
         self.assertEqual(response.data["results"], expected)
 
+    def test_search_ranks_name_matches_first(self):
+        self.assertTrue(
+            self.client.login(username=self.developer.username, password="password")
+        )
+        in_description = DatasetFactory.create(
+            organisation=self.org_user.organisation,
+            live_revision__status=FeedStatus.live.value,
+            live_revision__description="Buses serving the Wigglesworth villages",
+        )
+        in_name = DatasetFactory.create(
+            organisation=self.org_user.organisation,
+            live_revision__status=FeedStatus.live.value,
+            live_revision__name="Wigglesworth town services",
+        )
+        Dataset.objects.update_search_vector()
+
+        response = self.client.get(
+            self.feed_list_url + "?search=wigglesworth", HTTP_HOST=self.hostname
+        )
+        self.assertEqual(response.status_code, 200)
+        actual = [result["id"] for result in response.data["results"]]
+        self.assertEqual(actual, [in_name.id, in_description.id])
+
+    def test_search_uses_websearch_syntax(self):
+        self.assertTrue(
+            self.client.login(username=self.developer.username, password="password")
+        )
+        datasets = [
+            DatasetFactory.create(
+                organisation=self.org_user.organisation,
+                live_revision__status=FeedStatus.live.value,
+                live_revision__name=name,
+            )
+            for name in ("Wigglesworth town services", "Frobisher park and ride")
+        ]
+        Dataset.objects.update_search_vector()
+
+        # Matches either term, and "serviced" matches "services" by its stem
+        for search in ("wigglesworth or frobisher", "serviced or frobisher"):
+            response = self.client.get(
+                self.feed_list_url + f"?search={search}", HTTP_HOST=self.hostname
+            )
+            self.assertEqual(response.status_code, 200)
+            actual = {result["id"] for result in response.data["results"]}
+            self.assertEqual(actual, {dataset.id for dataset in datasets})
+
     def test_feed_from_active_org(self):
         """
         Ensure API returns all 'public' feeds live
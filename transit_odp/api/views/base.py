@@ -1,4 +1,3 @@
-from django.db.models import Q
 from rest_framework import status, viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -54,12 +53,6 @@ class DatasetViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = (IsAuthenticated,)
     serializer_class = DatasetSerializer
     filterset_class = DatasetSearchFilterSet
-    search_fields = [
-        "live_revision__name",
-        "live_revision__description",
-        "organisation__name",
-        "live_revision__admin_areas__name",
-    ]
 
     def list(self, request, *args, **kwargs):
         # Check for invalid query parameter keys and values
@@ -108,20 +101,8 @@ class DatasetViewSet(viewsets.ReadOnlyModelViewSet):
         keywords = self.request.GET.get("search", "").strip()
 
         if keywords:
-            # TODO - enable full-text search
-            # query = SearchQuery(keywords)
-            # vector = SearchVector('name', 'description')
-            # qs = qs.annotate(search=vector).filter(search=query)
-            # qs = qs.annotate(rank=SearchRank(vector, query)).order_by('-rank')
-            qs = qs.filter(
-                Q(live_revision__name__icontains=keywords)
-                | Q(live_revision__description__icontains=keywords)
-                | Q(organisation_name__icontains=keywords)
-                | Q(live_revision__admin_areas__name__icontains=keywords)
-            )
-
-        # Make the search results distinct since there will be duplicates from the
-        # join with admin_areas
-        qs = qs.order_by("id").distinct()
+            qs = qs.full_text_search(keywords).order_by("-search_rank", "id")
+        else:
+            qs = qs.order_by("id")
 
         return qs
@@ -1,5 +1,4 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
 from django.views.generic import TemplateView
 
 from transit_odp.api.views.base import DatasetViewSet
@@ -39,16 +38,8 @@ class TimetablesViewSet(DatasetViewSet):
             qs = qs.filter(live_revision__status__in=status_list)
         keywords = self.request.GET.get("search", "").strip()
         if keywords:
-            # TODO - enable full-text search
-            qs = qs.filter(
-                Q(live_revision__name__icontains=keywords)
-                | Q(live_revision__description__icontains=keywords)
-                | Q(organisation_name__icontains=keywords)
-                | Q(live_revision__admin_areas__name__icontains=keywords)
-            )
-
-        # Make the search results distinct since there will be duplicates from the
-        # join with admin_areas
-        qs = qs.order_by("id").distinct()
+            qs = qs.full_text_search(keywords).order_by("-search_rank", "id")
+        else:
+            qs = qs.order_by("id")
 
         return qs
@@ -1,6 +1,5 @@
-import io
-import time
 from logging import getLogger
+from tempfile import SpooledTemporaryFile
 from zipfile import ZIP_DEFLATED, ZipFile
 
 import requests
@@ -9,28 +8,46 @@ from django.utils import timezone
 from requests import RequestException
 
 from transit_odp.avl.models import CAVLDataArchive
+from transit_odp.common.utils.profiling import log_time_and_memory
 
 logger = getLogger(__name__)
 
+# Size of the chunks the response body is read and compressed in
+CHUNK_SIZE = 1024 * 1024
+# Archives larger than this are spooled to disk rather than held in memory
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
 
 class ArchivingError(Exception):
     pass
 
 
 class ConsumerAPIArchiver:
+    """Archives the data returned by a consumer API endpoint as a zip file.
+
+    The response body is streamed in chunks through the zip compressor into a
+    spooled temporary file, so the feed is never held in memory in full however
+    large it grows.
+    """
+
     data_format = CAVLDataArchive.SIRIVM
     extension = ".xml"
 
-    def __init__(self, url):
+    def __init__(self, url, params=None, timeout=None):
         self.url = url
+        self.params = params
+        self.timeout = timeout
         self._archive = self.get_object()
         self._access_time = None
-        self._content = None
 
     @property
     def filename(self):
         now = self.access_time.strftime("%Y-%m-%d_%H%M%S")
-        return self.data_format_value + "_" + now + ".zip"
+        return self.filename_prefix + "_" + now + ".zip"
+
+    @property
+    def filename_prefix(self):
+        return self.data_format_value
 
     @property
     def data_format_value(self):
@@ -38,78 +55,72 @@ class ConsumerAPIArchiver:
 
     @property
     def access_time(self):
-        if self._content is None:
-            raise ValueError("`content` has not been fetched yet.")
-
         if self._access_time is None:
-            raise ValueError("`access_time` has not been set.")
+            raise ValueError("The data has not been fetched yet.")
 
         return self._access_time
 
-    @property
-    def content(self):
-        if self._content is None:
-            self._content = self._get_content()
-        return self._content
-
     @property
     def content_filename(self):
         return self.data_format_value + self.extension
 
     def archive(self):
-        file_ = self.get_file(self.content)
-        self.save_to_database(file_)
+        with log_time_and_memory(logger, f"Archiving {self.url}"):
+            with self.stream_file() as file_:
+                self.save_to_database(file_)
+
+    def stream_file(self):
+        """Streams the response body into a zip in a spooled temporary file.
 
-    def _get_content(self):
+        Returns:
+            SpooledTemporaryFile: The zip, positioned at the start.
+
+        Raises:
+            ArchivingError: if the data cannot be retrieved.
+        """
+        file_ = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
         try:
-            response = requests.get(self.url)
+            with requests.get(
+                self.url, params=self.params, timeout=self.timeout, stream=True
+            ) as response:
+                self._access_time = timezone.now()
+                with ZipFile(file_, mode="w", compression=ZIP_DEFLATED) as zf:
+                    # The size is not known up front, zip64 allows more than 2GiB
+                    with zf.open(self.content_filename, "w", force_zip64=True) as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            f.write(chunk)
         except RequestException:
+            file_.close()
             msg = f"Unable to retrieve data from {self.url}"
             logger.error(msg)
             raise ArchivingError(msg)
-        else:
-            self._access_time = timezone.now()
-            logger.info(
-                f"Total time elapsed to get response from {self.url} is {response.elapsed.total_seconds()} for job-task_create_gtfsrt_zipfile"
-            )
-            return response.content
-
-    def get_file(self, content):
-        start_get_file_op = time.time()
-        bytesio = io.BytesIO()
-        with ZipFile(bytesio, mode="w", compression=ZIP_DEFLATED) as zf:
-            zf.writestr(self.content_filename, content)
-        end_file_op = time.time()
-        logger.info(
-            f"File operation took {end_file_op-start_get_file_op:.2f} seconds for job-task_create_gtfsrt_zipfile"
-        )
-        return bytesio
+
+        file_.seek(0)
+        return file_
 
     def get_object(self):
-        start_db_op = time.time()
         archive = CAVLDataArchive.objects.filter(data_format=self.data_format).last()
         if archive is None:
             archive = CAVLDataArchive(data_format=self.data_format)
-        end_db_op = time.time()
-        logger.info(
-            f"File operation took {end_db_op-start_db_op:.2f} seconds for job-task_create_gtfsrt_zipfile"
-        )
         return archive
 
-    def save_to_database(self, bytesio):
-        start_s3_op = time.time()
-        file_ = File(bytesio, name=self.filename)
-        self._archive.data = file_
+    def save_to_database(self, file_):
+        # Large files are sent to S3 as a multipart upload by the storage backend
+        self._archive.data = File(file_, name=self.filename)
         self._archive.save()
-        end_s3_op = time.time()
-        logger.info(
-            f"S3 archive operation took {end_s3_op-start_s3_op:.2f} seconds for job-task_create_gtfsrt_zipfile"
-        )
 
 
 class SiriVMArchiver(ConsumerAPIArchiver):
     data_format = CAVLDataArchive.SIRIVM
     extension = ".xml"
+    content_filename = "siri.xml"
+
+
+class SiriVMTfLArchiver(ConsumerAPIArchiver):
+    data_format = CAVLDataArchive.SIRIVM_TFL
+    extension = ".xml"
+    filename_prefix = "sirivm_tfl"
+    content_filename = "siri_tfl.xml"
 
 
 class GTFSRTArchiver(ConsumerAPIArchiver):
@@ -1,4 +1,5 @@
 import datetime
+import zipfile
 from pathlib import Path
 
 import pytest
@@ -10,8 +11,10 @@ from transit_odp.avl.post_publishing_checks.constants import (
 from transit_odp.avl.post_publishing_checks.daily.results import ValidationResult
 from transit_odp.avl.post_publishing_checks.daily.vehicle_journey_finder import (
     DayOfWeek,
+    TimetableDocumentCache,
     TxcVehicleJourney,
     VehicleJourneyFinder,
+    VehicleJourneyIndex,
 )
 from transit_odp.avl.post_publishing_checks.models.siri import MonitoredVehicleJourney
 from transit_odp.common.constants import FeatureFlags
@@ -22,7 +25,10 @@ from transit_odp.organisation.factories import (
     TXCFileAttributesFactory,
 )
 from transit_odp.organisation.models.data import TXCFileAttributes
-from transit_odp.timetables.transxchange import TransXChangeDocument
+from transit_odp.timetables.transxchange import (
+    TransXChangeDocument,
+    estimate_tree_size,
+)
 from waffle.testutils import override_flag
 
 pytestmark = pytest.mark.django_db
@@ -92,6 +98,49 @@ def test_append_txc_revision_number():
     assert revision_number == "234"
 
 
+def test_get_corresponding_timetable_xml_files_shares_parses(tmp_path):
+    zip_path = tmp_path / "timetables.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for xml in ("current_year.xml", "next_year.xml", "vehicle_journeys.xml"):
+            zf.write(DATA_DIR / xml, f"timetables/{xml}")
+    revision = DatasetRevisionFactory(upload_file__from_path=zip_path.as_posix())
+    txc_file_attrs = [
+        TXCFileAttributesFactory(revision=revision, filename=xml)
+        for xml in ("next_year.xml", "current_year.xml")
+    ]
+    vehicle_journey_finder = VehicleJourneyFinder()
+
+    first = vehicle_journey_finder.get_corresponding_timetable_xml_files(txc_file_attrs)
+    second = vehicle_journey_finder.get_corresponding_timetable_xml_files(
+        txc_file_attrs
+    )
+
+    assert [txc.get_file_name() for txc in first] == [
+        "current_year.xml",
+        "next_year.xml",
+    ]
+    assert first is not second
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_timetable_document_cache_evicts_least_recently_used():
+    documents = [
+        TransXChangeDocument(str(DATA_DIR / xml))
+        for xml in ("current_year.xml", "next_year.xml", "vehicle_journeys.xml")
+    ]
+    # Room for the two largest documents, but not all three
+    sizes = sorted(estimate_tree_size(document.size) for document in documents)
+    cache = TimetableDocumentCache(max_bytes=sizes[1] + sizes[2])
+    cache.add(1, "current_year.xml", documents[0])
+    cache.add(1, "next_year.xml", documents[1])
+    cache.get(1, "current_year.xml")
+    cache.add(2, "vehicle_journeys.xml", documents[2])
+
+    assert cache.get(1, "next_year.xml") is None
+    assert cache.get(1, "current_year.xml") is documents[0]
+    assert cache.get(2, "vehicle_journeys.xml") is documents[2]
+
+
 def test_filter_by_operating_period():
     txc_filenames = [
         str(DATA_DIR / xml)
@@ -130,6 +179,22 @@ def test_filter_by_journey_code():
     assert txc_vehicle_journey[0].txc_xml.get_file_name() == "vehicle_journeys.xml"
 
 
+def test_filter_by_journey_code_builds_each_index_once(mocker):
+    txc_xml = [TransXChangeDocument(str(DATA_DIR / "vehicle_journeys.xml"))]
+    from_txc_document = mocker.spy(VehicleJourneyIndex, "from_txc_document")
+    vehicle_journey_finder = VehicleJourneyFinder()
+
+    for vehicle_journey_ref in ("50", "50", "unknown"):
+        vehicle_journey_finder.filter_by_journey_code(
+            txc_xml, vehicle_journey_ref, ValidationResult()
+        )
+
+    assert from_txc_document.call_count == 1
+    index = vehicle_journey_finder.get_vehicle_journey_index(txc_xml[0])
+    assert index.has_vehicle_journeys
+    assert [vj["SequenceNumber"] for vj in index.journeys_by_code["50"]] == ["2"]
+
+
 @pytest.mark.parametrize(
     "sequence_number,expected_days",
     [
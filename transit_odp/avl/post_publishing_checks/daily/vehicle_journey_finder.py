@@ -1,9 +1,11 @@
 import datetime
 import logging
 import os
-from dataclasses import dataclass
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 from zipfile import ZipFile
 from waffle import flag_is_active
 from lxml import etree
@@ -33,10 +35,14 @@ from transit_odp.organisation.models import TXCFileAttributes
 from transit_odp.timetables.transxchange import (
     TransXChangeDocument,
     TransXChangeElement,
+    estimate_tree_size,
 )
 
 logger = logging.getLogger(__name__)
 
+# Upper bound, in bytes, of the estimated memory of the cached timetables
+TIMETABLE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
 
 class DayOfWeek(ChoiceEnum):
     monday = "Monday"
@@ -70,7 +76,142 @@ class TxcVehicleJourney:
     txc_xml: TransXChangeDocument
 
 
+@dataclass
+class VehicleJourneyIndex:
+    """The VehicleJourneys of a timetable keyed by TicketMachine/JourneyCode."""
+
+    has_vehicle_journeys: bool = False
+    journey_codes: List[str] = field(default_factory=list)
+    journeys_by_code: Dict[str, List[TransXChangeElement]] = field(default_factory=dict)
+
+    @classmethod
+    def from_txc_document(cls, timetable: TransXChangeDocument):
+        try:
+            vehicle_journeys = timetable.get_vehicle_journeys()
+        except NoElement:
+            return cls()
+
+        journey_codes = []
+        journeys_by_code = defaultdict(list)
+        for vehicle_journey in vehicle_journeys:
+            try:
+                operational = vehicle_journey.get_element("Operational")
+                ticket_machine = operational.get_element("TicketMachine")
+                journey_code = ticket_machine.get_element("JourneyCode").text
+            except (NoElement, TooManyElements):
+                continue
+            journey_codes.append(journey_code)
+            journeys_by_code[journey_code].append(vehicle_journey)
+        return cls(
+            has_vehicle_journeys=True,
+            journey_codes=journey_codes,
+            journeys_by_code=dict(journeys_by_code),
+        )
+
+
+class TimetableDocumentCache:
+    """An LRU cache of the parsed timetables of published revisions.
+
+    Documents are keyed by revision id and filename, so all the vehicle
+    activities of a feed that match the same timetables share a single
+    download and parse of each file. The cache is bounded by the estimated
+    memory of the parsed trees, see `estimate_tree_size`.
+    """
+
+    def __init__(self, max_bytes: int = TIMETABLE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._documents: Dict[Tuple[int, str], TransXChangeDocument] = OrderedDict()
+        # The xml filenames in each revision's upload, None for a single xml file
+        self._filenames: Dict[int, Optional[List[str]]] = {}
+
+    def get_documents(
+        self, txc_file_attrs: List[TXCFileAttributes]
+    ) -> List[TransXChangeDocument]:
+        """Returns the timetables of a revision named in `txc_file_attrs`, in the
+        order they appear in the revision's upload.
+        """
+        revision_id = txc_file_attrs[0].revision_id
+        if revision_id not in self._filenames:
+            upload_file = txc_file_attrs[0].revision.upload_file
+            if Path(upload_file.name).suffix == ".xml":
+                self._filenames[revision_id] = None
+            else:
+                with ZipFile(upload_file) as zin:
+                    self._filenames[revision_id] = zin.namelist()
+
+        filenames = self._filenames[revision_id]
+        if filenames is None:
+            return [self._get_xml_document(txc_file_attrs)]
+
+        txc_filenames = {txc.filename for txc in txc_file_attrs}
+        # filename can also contains directory name
+        wanted = [
+            filename
+            for filename in filenames
+            if os.path.basename(filename) in txc_filenames
+        ]
+        documents = {filename: self.get(revision_id, filename) for filename in wanted}
+        missing = [filename for filename, doc in documents.items() if doc is None]
+        if missing:
+            with ZipFile(txc_file_attrs[0].revision.upload_file) as zin:
+                for filename in missing:
+                    with zin.open(filename, "r") as fp:
+                        documents[filename] = TransXChangeDocument(fp)
+                    self.add(revision_id, filename, documents[filename])
+        return [documents[filename] for filename in wanted]
+
+    def _get_xml_document(
+        self, txc_file_attrs: List[TXCFileAttributes]
+    ) -> TransXChangeDocument:
+        revision_id = txc_file_attrs[0].revision_id
+        document = self.get(revision_id, "")
+        if document is None:
+            upload_file = txc_file_attrs[0].revision.upload_file
+            with upload_file.open("rb") as fp:
+                document = TransXChangeDocument(fp)
+            self.add(revision_id, "", document)
+        return document
+
+    def get(self, revision_id: int, filename: str) -> Optional[TransXChangeDocument]:
+        key = (revision_id, filename)
+        document = self._documents.get(key)
+        if document is not None:
+            self._documents.move_to_end(key)
+        return document
+
+    def add(
+        self, revision_id: int, filename: str, document: TransXChangeDocument
+    ) -> None:
+        key = (revision_id, filename)
+        previous = self._documents.pop(key, None)
+        if previous is not None:
+            self._size -= estimate_tree_size(previous.size)
+        self._documents[key] = document
+        self._size += estimate_tree_size(document.size)
+        # The document just added is kept even if it is larger than the bound
+        while self._size > self.max_bytes and len(self._documents) > 1:
+            _, evicted = self._documents.popitem(last=False)
+            self._size -= estimate_tree_size(evicted.size)
+
+
 class VehicleJourneyFinder:
+    def __init__(self, timetable_cache: Optional[TimetableDocumentCache] = None):
+        if timetable_cache is None:
+            timetable_cache = TimetableDocumentCache()
+        self.timetable_cache = timetable_cache
+        self._vehicle_journey_indexes = WeakKeyDictionary()
+
+    def get_vehicle_journey_index(
+        self, timetable: TransXChangeDocument
+    ) -> VehicleJourneyIndex:
+        """Returns the VehicleJourneyIndex of a timetable, built on first use."""
+        index = self._vehicle_journey_indexes.get(timetable)
+        if index is None:
+            index = VehicleJourneyIndex.from_txc_document(timetable)
+            self._vehicle_journey_indexes[timetable] = index
+        return index
+
     def get_vehicle_journey_ref(self, mvj: MonitoredVehicleJourney) -> Optional[str]:
         framed_vehicle_journey_ref = mvj.framed_vehicle_journey_ref
         if framed_vehicle_journey_ref is not None:
@@ -189,21 +330,12 @@ class VehicleJourneyFinder:
     def get_corresponding_timetable_xml_files(
         self, txc_file_attrs: List[TXCFileAttributes]
     ) -> List[TransXChangeDocument]:
-        """Get entire XML content for each TXC object."""
-        timetables: List[TransXChangeDocument] = []
-        upload_file = txc_file_attrs[0].revision.upload_file
-        if Path(upload_file.name).suffix == ".xml":
-            with upload_file.open("rb") as fp:
-                timetables.append(TransXChangeDocument(fp))
-        else:
-            with ZipFile(upload_file) as zin:
-                txc_filenames = [txc.filename for txc in txc_file_attrs]
-                for filename in zin.namelist():
-                    # filename can also contains directory name
-                    base_filename = os.path.basename(filename)
-                    if base_filename in txc_filenames:
-                        with zin.open(filename, "r") as fp:
-                            timetables.append(TransXChangeDocument(fp))
+        """Get entire XML content for each TXC object.
+
+        The documents are shared with every other activity matched by this finder,
+        but the list is new on each call as the filters below remove from it.
+        """
+        timetables = self.timetable_cache.get_documents(txc_file_attrs)
 
         logger.info(
             f"Found {len(timetables)} out of {len(txc_file_attrs)} TXC XML files"
@@ -300,35 +432,27 @@ class VehicleJourneyFinder:
         matching_journeys: List[TxcVehicleJourney] = []
         debug_journey_codes = []
         for timetable in txc_xml:
-            try:
-                vehicle_journeys = timetable.get_vehicle_journeys()
+            index = self.get_vehicle_journey_index(timetable)
+            if index.has_vehicle_journeys:
                 result.set_transxchange_attribute(
                     TransXChangeField.FILENAME, timetable.get_file_name()
                 )
-            except NoElement:
-                vehicle_journeys = []
             logger.info(
-                f"Timetable {timetable} has {len(vehicle_journeys)} vehicle journeys"
+                f"Timetable {timetable} has {len(index.journey_codes)} vehicle "
+                "journeys with a JourneyCode"
             )
+            debug_journey_codes.extend(index.journey_codes)
+            vehicle_journeys = index.journeys_by_code.get(vehicle_journey_ref, [])
+            if vehicle_journeys:
+                logger.info(
+                    f"Found TicketMachine/JourneyCode {vehicle_journey_ref} in "
+                    f"timetable {timetable.get_file_name()}"
+                )
             for vehicle_journey in vehicle_journeys:
-                try:
-                    operational = vehicle_journey.get_element("Operational")
-                    ticket_machine = operational.get_element("TicketMachine")
-                    journey_code = ticket_machine.get_element("JourneyCode").text
-                    debug_journey_codes.append(journey_code)
-                except (NoElement, TooManyElements):
-                    continue
-                if journey_code == vehicle_journey_ref:
-                    logger.info(
-                        f"Found TicketMachine/JourneyCode {journey_code} in timetable "
-                        f"{timetable.get_file_name()}"
-                    )
-                    matching_journeys.append(
-                        TxcVehicleJourney(vehicle_journey, timetable)
-                    )
+                matching_journeys.append(TxcVehicleJourney(vehicle_journey, timetable))
 
         logger.info(
-            f"Filtering by JourneyCode gave {len(vehicle_journeys)} matching journeys"
+            f"Filtering by JourneyCode gave {len(matching_journeys)} matching journeys"
         )
         logger.info(
             f"In {len(txc_xml)} timetables, found JourneyCode's: {debug_journey_codes}"
@@ -1,16 +1,24 @@
 import logging
 from datetime import datetime, timedelta
 from http import HTTPStatus
-from typing import List, Optional, Union
+from typing import FrozenSet, List, Optional, Union
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from pydantic.main import BaseModel
 from requests import HTTPError, RequestException, Timeout
 
 logger = logging.getLogger(__name__)
 
+CACHE_KEY = "abods_lines_synced_in_last_month"
+# The snapshot is refreshed every 30 minutes by task_refresh_abods_registry,
+# it outlives a couple of refreshes so a failed one does not empty it
+CACHE_TIMEOUT = 2 * 60 * 60
+# A failed fetch with no snapshot to fall back on is retried after this
+EMPTY_CACHE_TIMEOUT = 5 * 60
+
 
 class EmptyResponseException(Exception):
     pass
@@ -101,15 +109,50 @@ class AbodsClient:
 
 
 class AbodsRegistery:
+    """
+    The lines with vehicle activity recorded by ABODS in the last month, as a
+    set of "{line_name}__{operator_noc}" keys.
+
+    A snapshot of the set is shared through the cache, so page views and
+    reports only look lines up in it rather than each fetching the list.
+    """
+
     def __init__(self):
         self._client = AbodsClient()
         self.lines = []
         self.data = None
 
-    def records(self):
+    def records(self) -> FrozenSet[str]:
+        """
+        Get the lines from the cached snapshot, fetching them from ABODS only
+        when there is no snapshot
+        """
+        lines = cache.get(CACHE_KEY)
+        if lines is None:
+            logger.info("ABODSRegistery: No lines in cache, fetching new lines")
+            lines = self.refresh()
+        return lines
+
+    def refresh(self) -> FrozenSet[str]:
+        """
+        Fetch the lines from ABODS and replace the cached snapshot. An empty
+        response does not replace a snapshot, as ABODS returns one when it fails.
+        """
+        self.lines = []
         self.fetch_records()
         self.normalize()
         self.remove_duplicate()
+
+        if self.lines:
+            cache.set(CACHE_KEY, self.lines, timeout=CACHE_TIMEOUT)
+            return self.lines
+
+        lines = cache.get(CACHE_KEY)
+        if lines is not None:
+            logger.warning("ABODSRegistery: No lines fetched, keeping cached lines")
+            return lines
+
+        cache.set(CACHE_KEY, self.lines, timeout=EMPTY_CACHE_TIMEOUT)
         return self.lines
 
     def normalize(self):
@@ -123,7 +166,7 @@ class AbodsRegistery:
         logger.info(f"ABODSRegistery: Total {len(self.lines)} lines normalised")
 
     def remove_duplicate(self):
-        self.lines = list(set(self.lines))
+        self.lines = frozenset(self.lines)
         logger.info(f"ABODSRegistery: Total {len(self.lines)} unique lines left")
 
     def fetch_records(self) -> APIResponse:
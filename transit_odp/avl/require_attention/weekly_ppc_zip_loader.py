@@ -1,6 +1,9 @@
 import logging
 import pickle
+import threading
+import uuid
 from io import BytesIO
+from typing import FrozenSet, Optional, Tuple
 from zipfile import ZipFile
 
 import pandas as pd
@@ -18,6 +21,73 @@ OPERATOR_REF_FILENAME = "originref.csv"
 DIRECTION_REF_FILENAME = "directionref.csv"
 DESTINATION_REF_FILENAME = "destinationref.csv"
 CACHE_KEY = "weekly_vehicle_activity_error_operatorref_linenames"
+CACHE_VERSION_KEY = "weekly_vehicle_activity_error_operatorref_linenames_version"
+CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+
+class VehicleActivityErrors:
+    """The (OperatorRef, LineRef) pairs with errors in the weekly PPC reports."""
+
+    def __init__(self, lines: FrozenSet[Tuple[str, str]]):
+        self._lines = lines
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "VehicleActivityErrors":
+        if df.empty:
+            return cls(frozenset())
+        return cls(frozenset(zip(df["OperatorRef"], df["LineRef"])))
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def has_errors(self, operator_ref: str, line_name: str) -> bool:
+        """Return True if the line has errors, its spaces may be underscores"""
+        return (operator_ref, line_name) in self._lines or (
+            operator_ref,
+            line_name.replace(" ", "_"),
+        ) in self._lines
+
+
+class VehicleActivityCache:
+    """A process-level copy of the weekly PPC errors and their index.
+
+    The errors are held in the shared Django cache along with a version, which
+    changes whenever they are reloaded from the weekly reports. A worker only
+    unpickles the errors and rebuilds the index when the version changes.
+    """
+
+    def __init__(self):
+        self._df: Optional[pd.DataFrame] = None
+        self._errors: Optional[VehicleActivityErrors] = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Tuple[pd.DataFrame, VehicleActivityErrors]:
+        version = cache.get(CACHE_VERSION_KEY)
+        with self._lock:
+            if self._df is None or version is None or self._version != version:
+                value_in_cache = None
+                if version is not None:
+                    value_in_cache = cache.get(CACHE_KEY, None)
+                if value_in_cache is None:
+                    logger.info(
+                        "Vehicle activites not present in cache, setting new value"
+                    )
+                    version, value_in_cache = set_value_in_cache()
+
+                self._df = pickle.loads(value_in_cache)
+                self._errors = VehicleActivityErrors.from_dataframe(self._df)
+                self._version = version
+            return self._df, self._errors
+
+    def clear(self) -> None:
+        with self._lock:
+            self._df = None
+            self._errors = None
+            self._version = None
+
+
+vehicle_activity_cache = VehicleActivityCache()
 
 
 def get_vehicle_activity_operatorref_linename() -> pd.DataFrame:
@@ -26,25 +96,32 @@ def get_vehicle_activity_operatorref_linename() -> pd.DataFrame:
     Returns:
         pd.DataFrame: Dataframe either from cache or from zip
     """
-    value_in_cache = cache.get(CACHE_KEY, None)
-    if value_in_cache is None:
-        logger.info("Vehicle activites not present in cache, setting new value")
-        set_value_in_cache()
-        value_in_cache = cache.get(CACHE_KEY, None)
-
-    df = pickle.loads(value_in_cache)
+    df, _ = vehicle_activity_cache.get()
     return df
 
 
-def set_value_in_cache():
+def get_vehicle_activity_errors() -> VehicleActivityErrors:
+    """Get the index of the lines with errors in the weekly operator ref and
+    linename dataframe. Callers checking many lines should fetch it once and
+    pass it down.
+    """
+    _, errors = vehicle_activity_cache.get()
+    return errors
+
+
+def set_value_in_cache() -> Tuple[str, bytes]:
     errors_df = read_all_linenames_from_weekly_files()
     serialized_df = pickle.dumps(errors_df)
-    cache.set(CACHE_KEY, serialized_df, timeout=(7 * 24 * 60 * 60))
+    version = uuid.uuid4().hex
+    cache.set(CACHE_KEY, serialized_df, timeout=CACHE_TIMEOUT)
+    cache.set(CACHE_VERSION_KEY, version, timeout=CACHE_TIMEOUT)
+    return version, serialized_df
 
 
 def reset_vehicle_activity_in_cache() -> None:
     cache.delete(CACHE_KEY)
     set_value_in_cache()
+    vehicle_activity_cache.clear()
 
 
 def read_all_linenames_from_weekly_files() -> pd.DataFrame:
@@ -1,21 +1,23 @@
-import io
 import logging
 import time
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Optional
-from zipfile import ZIP_DEFLATED, ZipFile
+from typing import Callable, List, Optional
 
-import requests
 from celery import shared_task
 from django.conf import settings
-from django.core.files import File
+from django.db import connections
 from django.utils import timezone
-from requests import RequestException
 from urllib3.exceptions import ReadTimeoutError
 from waffle import flag_is_active
 
-from transit_odp.avl.archivers import GTFSRTArchiver
+from transit_odp.avl.archivers import (
+    ArchivingError,
+    GTFSRTArchiver,
+    SiriVMArchiver,
+    SiriVMTfLArchiver,
+)
 from transit_odp.avl.client import CAVLService
 from transit_odp.avl.constants import (
     AWAITING_REVIEW,
@@ -27,11 +29,7 @@ from transit_odp.avl.constants import (
     UNDERGOING,
 )
 from transit_odp.avl.enums import AVLFeedStatus
-from transit_odp.avl.models import (
-    AVLValidationReport,
-    CAVLDataArchive,
-    CAVLValidationTaskResult,
-)
+from transit_odp.avl.models import AVLValidationReport, CAVLValidationTaskResult
 from transit_odp.avl.notifications import (
     send_avl_compliance_status_changed,
     send_avl_flagged_with_compliance_issue,
@@ -40,6 +38,7 @@ from transit_odp.avl.notifications import (
 from transit_odp.avl.post_publishing_checks.daily.checker import PostPublishingChecker
 from transit_odp.avl.post_publishing_checks.weekly import WeeklyReport
 from transit_odp.avl.proxies import AVLDataset
+from transit_odp.avl.require_attention.abods.registery import AbodsRegistery
 from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
     reset_vehicle_activity_in_cache,
 )
@@ -55,11 +54,11 @@ from transit_odp.organisation.models import (
 
 logger = logging.getLogger(__name__)
 
-SIRI_ZIP = "sirivm_{}.zip"
-SIRI_TFL_ZIP = "sirivm_tfl_{}.zip"
 VALIDATION_SAMPLE_SIZE = 250
 CONFIG_API_WAIT_TIME = 25
 PPC_MAX_VEHICLE_ACTIVITIES_ANALYSED = 1000
+# Seconds between checks for finished and timed out feeds in a validation round
+FEED_POLL_INTERVAL = 1
 
 
 @dataclass
@@ -117,43 +116,11 @@ def task_validate_avl_feed(task_id: str):
 
 @shared_task(bind=True)
 def task_create_sirivm_zipfile(self):
-    URL = f"{settings.AVL_CONSUMER_API_BASE_URL}/siri-vm"
-    now = timezone.now().strftime("%Y-%m-%d_%H%M%S")
-    start = time.time()
+    url = f"{settings.AVL_CONSUMER_API_BASE_URL}/siri-vm"
     try:
-        response = requests.get(URL)
-        logger.info(
-            f"Request to {URL} took {response.elapsed.total_seconds()} seconds for job-task_create_sirivm_zipfile"
-        )
-    except RequestException:
+        SiriVMArchiver(url).archive()
+    except ArchivingError:
         logger.error("Unable to retrieve siri vm data.", exc_info=True)
-    else:
-        start_file_op = time.time()
-        bytesio = io.BytesIO()
-        with ZipFile(bytesio, mode="w", compression=ZIP_DEFLATED) as zf:
-            zf.writestr("siri.xml", response.content)
-
-        file_ = File(bytesio, name=SIRI_ZIP.format(now))
-
-        archive = CAVLDataArchive.objects.filter(
-            data_format=CAVLDataArchive.SIRIVM
-        ).last()
-
-        if archive is None:
-            archive = CAVLDataArchive(data_format=CAVLDataArchive.SIRIVM)
-        end_database_op = time.time()
-        logger.info(
-            f"Database operation took {end_database_op-start_file_op:.2f} seconds for job-task_create_sirivm_zipfile"
-        )
-        archive.data = file_
-        archive.save()
-        end = time.time()
-        logger.info(
-            f"S3 archive operation took {end-end_database_op:.2f} seconds for job-task_create_sirivm_zipfile"
-        )
-        logger.info(
-            f"Total execution took {end-start:.2f} seconds for job-task_create_sirivm_zipfile"
-        )
 
 
 @shared_task()
@@ -166,54 +133,19 @@ def task_create_gtfsrt_zipfile():
     )
     _prefix = f"[GTFSRTArchiving] URL {url} => "
     logger.info(_prefix + "Begin archiving GTFSRT data.")
-    start = time.time()
     archiver = GTFSRTArchiver(url)
     archiver.archive()
-    end = time.time()
-    logger.info(_prefix + f"Finished archiving in {end-start:.2f} seconds.")
+    logger.info(_prefix + "Finished archiving.")
 
 
 @shared_task(bind=True)
 def task_create_sirivm_tfl_zipfile(self):
-    start = time.time()
-    logger.info(f"Starting to create sirivm_tfl_zipfile with url")
     url = f"{settings.AVL_CONSUMER_API_BASE_URL}/siri-vm?downloadTfl=true"
     params = {"operatorRef": "TFLO"}
-    now = timezone.now().strftime("%Y-%m-%d_%H%M%S")
     try:
-        response = requests.get(url, params=params, timeout=30)
-        logger.info(
-            f"Request to cavl took {response.elapsed.total_seconds()} seconds for job-task_create_sirivm_tfl_zipfile"
-        )
-    except RequestException:
+        SiriVMTfLArchiver(url, params=params, timeout=30).archive()
+    except ArchivingError:
         logger.error("Unable to retrieve siri vm data for TfL.", exc_info=True)
-    else:
-        start_file_creation = time.time()
-        bytesio = io.BytesIO()
-        with ZipFile(bytesio, mode="w", compression=ZIP_DEFLATED) as zf:
-            zf.writestr("siri_tfl.xml", response.content)
-
-        file_ = File(bytesio, name=SIRI_TFL_ZIP.format(now))
-
-        archive = CAVLDataArchive.objects.filter(
-            data_format=CAVLDataArchive.SIRIVM_TFL
-        ).last()
-
-        if archive is None:
-            archive = CAVLDataArchive(data_format=CAVLDataArchive.SIRIVM_TFL)
-        end_database_op = time.time()
-        logger.info(
-            f"Database operation completed in {end_database_op-start_file_creation:.2f} seconds for job-task_create_sirivm_tfl_zipfile"
-        )
-        archive.data = file_
-        archive.save()
-        end = time.time()
-        logger.info(
-            f"AWS bucket operation took {end-end_database_op:.2f} seconds for job-task_create_sirivm_tfl_zipfile"
-        )
-        logger.info(
-            f"Total time elapsed to finish job-task_create_sirivm_tfl_zipfile {end-start:.2f} seconds"
-        )
 
 
 @shared_task(ignore_result=True)
@@ -260,12 +192,100 @@ def task_monitor_avl_feeds():
     )
 
 
+@dataclass
+class FeedRoundSummary:
+    """The outcome of running a function for every feed in a round."""
+
+    name: str
+    succeeded: List[int] = field(default_factory=list)
+    failed: List[int] = field(default_factory=list)
+    timed_out: List[int] = field(default_factory=list)
+
+    def log(self) -> None:
+        logger.info(
+            f"{self.name} - {len(self.succeeded)} feeds succeeded, "
+            f"{len(self.failed)} failed, {len(self.timed_out)} timed out"
+        )
+        if self.failed:
+            logger.warning(f"{self.name} - failed feeds {sorted(self.failed)}")
+        if self.timed_out:
+            logger.warning(f"{self.name} - timed out feeds {sorted(self.timed_out)}")
+
+
+def run_for_each_feed(
+    name: str, feed_ids: List[int], func: Callable[[int], None]
+) -> FeedRoundSummary:
+    """Calls `func` with every feed id across a bounded pool of threads.
+
+    The calls mostly wait on remote services, so threads let the round finish in
+    about the time of the slowest feed. A feed still running after
+    AVL_VALIDATION_FEED_TIMEOUT seconds is reported as timed out and no longer
+    waited for. Its thread cannot be stopped, but the request timeouts of the
+    services it calls bound how long it keeps running.
+    """
+    summary = FeedRoundSummary(name)
+    workers = settings.AVL_VALIDATION_WORKERS
+    timeout = settings.AVL_VALIDATION_FEED_TIMEOUT
+
+    if workers <= 1:
+        for feed_id in feed_ids:
+            try:
+                func(feed_id)
+            except Exception:
+                logger.exception(f"{name} - feed {feed_id} failed")
+                summary.failed.append(feed_id)
+            else:
+                summary.succeeded.append(feed_id)
+        summary.log()
+        return summary
+
+    started = {}
+
+    def run(feed_id: int) -> None:
+        started[feed_id] = time.monotonic()
+        try:
+            func(feed_id)
+        finally:
+            # Each thread has its own database connection
+            connections.close_all()
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="avl-feed")
+    futures = {executor.submit(run, feed_id): feed_id for feed_id in feed_ids}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(
+                pending, timeout=FEED_POLL_INTERVAL, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                feed_id = futures[future]
+                exc = future.exception()
+                if exc is None:
+                    summary.succeeded.append(feed_id)
+                else:
+                    logger.error(f"{name} - feed {feed_id} failed", exc_info=exc)
+                    summary.failed.append(feed_id)
+
+            now = time.monotonic()
+            for future in list(pending):
+                feed_id = futures[future]
+                if feed_id in started and now - started[feed_id] > timeout:
+                    pending.discard(future)
+                    summary.timed_out.append(feed_id)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    summary.log()
+    return summary
+
+
 @shared_task()
 def task_run_avl_validations():
-    feeds = AVLDataset.objects.get_datafeeds_to_validate()
-    logger.info(f"AVL Validation - {feeds.count()} feeds to validate")
-    for feed in feeds:
-        task_run_feed_validation(feed.id)
+    feed_ids = list(
+        AVLDataset.objects.get_datafeeds_to_validate().values_list("id", flat=True)
+    )
+    logger.info(f"AVL Validation - {len(feed_ids)} feeds to validate")
+    run_for_each_feed("AVL Validation", feed_ids, task_run_feed_validation)
 
 
 @shared_task()
@@ -277,11 +297,18 @@ def task_run_feed_validation(feed_id: int):
 
 @shared_task()
 def task_cache_avl_compliance_status():
-    feeds = AVLDataset.objects.get_datafeeds_to_validate()
-    logger.info(f"Cache AVL compliance status for {feeds.count()} feeds")
-    for feed in feeds:
-        adapter = get_datafeed_adapter(logger, feed.id)
-        cache_avl_compliance_status(adapter, feed.id)
+    feed_ids = list(
+        AVLDataset.objects.get_datafeeds_to_validate().values_list("id", flat=True)
+    )
+    logger.info(f"Cache AVL compliance status for {len(feed_ids)} feeds")
+
+    def cache_feed_compliance_status(feed_id: int) -> None:
+        adapter = get_datafeed_adapter(logger, feed_id)
+        cache_avl_compliance_status(adapter, feed_id)
+
+    run_for_each_feed(
+        "Cache AVL compliance status", feed_ids, cache_feed_compliance_status
+    )
 
 
 def perform_feed_validation(adapter: PipelineAdapter, feed_id: int):
@@ -292,7 +319,9 @@ def perform_feed_validation(adapter: PipelineAdapter, feed_id: int):
     feed = feeds.get(id=feed_id)
     old_status = feed.old_avl_compliance
 
-    response = client.validate(feed_id=feed_id)
+    response = client.validate(
+        feed_id=feed_id, timeout=settings.AVL_VALIDATION_FEED_TIMEOUT
+    )
     if response is None:
         adapter.error(
             "An error occurred when calling the I-AVL service to validate the datafeed."
@@ -414,3 +443,15 @@ def task_reset_avl_weekly_cache():
     logger.info("Reseting the cache for weekly PPC")
     reset_vehicle_activity_in_cache()
     logger.info("Cache reset successfully")
+
+
+@shared_task(ignore_result=True)
+def task_refresh_abods_registry():
+    is_avl_require_attention_active = flag_is_active(
+        "", "is_avl_require_attention_active"
+    )
+    if not is_avl_require_attention_active:
+        return
+
+    lines = AbodsRegistery().refresh()
+    logger.info(f"ABODS registry refreshed with {len(lines)} lines")
@@ -181,3 +181,42 @@ def test_request_unexpected_exception_error(mock_request):
     client = AbodsClient()
     line_records = client.fetch_line_details()
     assert len(line_records.data.avlLineLevelStatus) == 0
+
+
+@patch(CLIENT)
+@freeze_time("2024-11-30")
+def test_registry_records_are_cached(mock_client):
+    mock_client.return_value = get_abods_client_response()
+
+    lines = AbodsRegistery().records()
+    cached_lines = AbodsRegistery().records()
+
+    mock_client.assert_called_once()
+    assert cached_lines == lines == {"43__SDCU", "42__SDCU", "41__SDCU"}
+    assert isinstance(cached_lines, frozenset)
+
+
+@patch(CLIENT)
+@freeze_time("2024-11-30")
+def test_registry_refresh_replaces_cached_records(mock_client):
+    mock_client.return_value = get_abods_client_blank_response()
+    assert AbodsRegistery().records() == set()
+
+    mock_client.return_value = get_abods_client_response()
+    AbodsRegistery().refresh()
+
+    assert len(AbodsRegistery().records()) == 3
+    assert mock_client.call_count == 2
+
+
+@patch(CLIENT)
+@freeze_time("2024-11-30")
+def test_registry_refresh_keeps_records_on_blank_response(mock_client):
+    mock_client.return_value = get_abods_client_response()
+    lines = AbodsRegistery().records()
+
+    mock_client.return_value = get_abods_client_blank_response()
+    refreshed_lines = AbodsRegistery().refresh()
+
+    assert refreshed_lines == lines
+    assert AbodsRegistery().records() == lines
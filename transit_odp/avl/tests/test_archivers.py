@@ -1,11 +1,16 @@
-import io
 from datetime import datetime
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, patch
 from zipfile import ZIP_DEFLATED, ZipFile
 
 import pytest
-
-from transit_odp.avl.archivers import GTFSRTArchiver
+from requests import RequestException
+
+from transit_odp.avl.archivers import (
+    ArchivingError,
+    GTFSRTArchiver,
+    SiriVMArchiver,
+    SiriVMTfLArchiver,
+)
 from transit_odp.avl.factories import GTFSRTDataArchiveFactory
 from transit_odp.avl.models import CAVLDataArchive
 
@@ -18,7 +23,6 @@ def test_filename():
     url = "https://fakeurl.zz/datafeed"
     archiver = GTFSRTArchiver(url)
     archiver._access_time = datetime(2020, 1, 1, 1, 1, 1)
-    archiver._content = b"fakedata"
     expected_filename = "gtfsrt_2020-01-01_010101.zip"
     assert expected_filename == archiver.filename
 
@@ -34,15 +38,25 @@ def test_access_time_value_error():
     archiver = GTFSRTArchiver(url)
     with pytest.raises(ValueError) as exc:
         archiver.access_time
-        assert str(exc.value) == "`content` has not been fetched yet."
+        assert str(exc.value) == "The data has not been fetched yet."
+
+
+def mock_streamed_response(mrequests, content):
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_content.side_effect = lambda chunk_size: (
+        content[i : i + 4] for i in range(0, len(content), 4)
+    )
+    mrequests.get.return_value = response
+    return response
 
 
 @patch(ARCHIVE_MODULE + ".requests")
 def test_access_time(mrequests):
-    mrequests.get.return_value = Mock(content=b"response")
+    mock_streamed_response(mrequests, b"response")
     url = "https://fakeurl.zz/datafeed"
     archiver = GTFSRTArchiver(url)
-    archiver.content
+    archiver.stream_file().close()
     assert archiver.access_time is not None
 
 
@@ -52,39 +66,23 @@ def test_content_filename():
     assert archiver.content_filename == "gtfsrt.bin"
 
 
-def test_get_file():
-    url = "https://fakeurl.zz/datafeed"
-    archiver = GTFSRTArchiver(url)
-    archiver._content = b"content"
-    bytesio = archiver.get_file(archiver._content)
-
-    expected = io.BytesIO()
-    with ZipFile(expected, mode="w", compression=ZIP_DEFLATED) as zf:
-        zf.writestr("gtfsrt.bin", archiver._content)
-
-    expected.seek(0)
-    bytesio.seek(0)
-    assert expected.read() == bytesio.read()
-
-
-def test_archive():
+@patch(ARCHIVE_MODULE + ".timezone")
+@patch(ARCHIVE_MODULE + ".requests")
+def test_archive(mrequests, mtimezone):
     url = "https://fakeurl.zz/datafeed"
     archiver = GTFSRTArchiver(url)
 
     content = b"newcontent"
     access_time = datetime(2020, 1, 1, 12, 1, 1)
-
-    archiver._content = content
-    archiver._access_time = access_time
+    mock_streamed_response(mrequests, content)
+    mtimezone.now.return_value = access_time
 
     expected_name = f"gtfsrt_{access_time:%Y-%m-%d_%H%M%S}.zip"
     expected_content_name = "gtfsrt.bin"
 
-    archiver._content = content
-    archiver._access_time = access_time
-
     assert CAVLDataArchive.objects.count() == 0
     archiver.archive()
+    assert mrequests.get.call_args.kwargs["stream"]
     assert CAVLDataArchive.objects.count() == 1
     archive = CAVLDataArchive.objects.last()
     assert archive.data_format == CAVLDataArchive.GTFSRT
@@ -96,16 +94,17 @@ def test_archive():
                 assert gtfs.read() == content
 
 
-def test_archive_if_existing_file():
+@patch(ARCHIVE_MODULE + ".timezone")
+@patch(ARCHIVE_MODULE + ".requests")
+def test_archive_if_existing_file(mrequests, mtimezone):
     url = "https://fakeurl.zz/datafeed"
     GTFSRTDataArchiveFactory()
     archiver = GTFSRTArchiver(url)
 
     content = b"newcontent"
     access_time = datetime(2020, 1, 1, 12, 1, 1)
-
-    archiver._content = content
-    archiver._access_time = access_time
+    mock_streamed_response(mrequests, content)
+    mtimezone.now.return_value = access_time
 
     expected_name = f"gtfsrt_{access_time:%Y-%m-%d_%H%M%S}.zip"
     expected_content_name = "gtfsrt.bin"
@@ -121,3 +120,28 @@ def test_archive_if_existing_file():
             assert [expected_content_name] == zf.namelist()
             with zf.open(expected_content_name) as gtfs:
                 assert gtfs.read() == content
+
+
+@patch(ARCHIVE_MODULE + ".requests")
+def test_stream_file(mrequests):
+    content = b"<Siri>" + b"vehicle" * 1000 + b"</Siri>"
+    mock_streamed_response(mrequests, content)
+    archiver = SiriVMTfLArchiver("https://fakeurl.zz/siri-vm", params={"a": "b"})
+
+    with archiver.stream_file() as file_:
+        assert file_.tell() == 0
+        with ZipFile(file_, "r") as zf:
+            assert zf.namelist() == ["siri_tfl.xml"]
+            assert zf.getinfo("siri_tfl.xml").compress_type == ZIP_DEFLATED
+            assert zf.read("siri_tfl.xml") == content
+
+    assert archiver.filename.startswith("sirivm_tfl_")
+    assert mrequests.get.call_args.kwargs["params"] == {"a": "b"}
+
+
+@patch(ARCHIVE_MODULE + ".requests.get")
+def test_stream_file_request_exception(mget):
+    mget.side_effect = RequestException
+    archiver = SiriVMArchiver("https://fakeurl.zz/siri-vm")
+    with pytest.raises(ArchivingError):
+        archiver.stream_file()
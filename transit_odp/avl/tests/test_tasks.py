@@ -1,5 +1,6 @@
 import json
 import re
+import time
 import uuid
 from datetime import date, datetime, timedelta, timezone
 from http import HTTPStatus
@@ -7,7 +8,6 @@ from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 import requests_mock
-from django.conf import settings
 from freezegun import freeze_time
 from mocket import Mocketizer
 from mocket.mockhttp import Entry
@@ -20,10 +20,12 @@ from transit_odp.avl.factories import (
 )
 
 from transit_odp.avl.tasks import (
+    run_for_each_feed,
     task_create_sirivm_tfl_zipfile,
     task_create_sirivm_zipfile,
     task_monitor_avl_feeds,
     task_reset_avl_weekly_cache,
+    task_run_avl_validations,
     task_run_feed_validation,
     task_weekly_assimilate_post_publishing_check_reports,
 )
@@ -46,15 +48,18 @@ CAVL_PATH = "transit_odp.avl.tasks.CAVLService"
 VALIDATION_PATH = "transit_odp.avl.tasks.get_validation_client"
 
 
-@patch("transit_odp.avl.tasks.CAVLDataArchive")
-@patch("transit_odp.avl.tasks.requests")
+@patch("transit_odp.avl.archivers.CAVLDataArchive")
+@patch("transit_odp.avl.archivers.requests")
 def test_task_create_sirivm_zipfile(mrequests, marchive):
     filter_ = marchive.objects.filter.return_value = MagicMock()
     filter_.last.return_value = None
-    mresponse = MagicMock(content=b"hello")
+    mresponse = MagicMock()
+    mresponse.__enter__.return_value = mresponse
+    mresponse.iter_content.return_value = [b"hel", b"lo"]
     mrequests.get.return_value = mresponse
     task_create_sirivm_zipfile()
     marchive.assert_called_once()
+    assert mrequests.get.call_args.kwargs["stream"]
 
     marchive_obj = MagicMock()
     filter_.last.return_value = marchive_obj
@@ -62,20 +67,22 @@ def test_task_create_sirivm_zipfile(mrequests, marchive):
     marchive_obj.save.assert_called_once_with()
 
 
-@patch("transit_odp.avl.tasks.CAVLDataArchive")
-@patch("transit_odp.avl.tasks.requests")
-def test_task_create_sirivm_zipfile_exception(mrequests, marchive):
-    mrequests.get.side_effect = RequestException
+@patch("transit_odp.avl.archivers.CAVLDataArchive")
+@patch("transit_odp.avl.archivers.requests.get")
+def test_task_create_sirivm_zipfile_exception(mget, marchive):
+    mget.side_effect = RequestException
     task_create_sirivm_zipfile()
-    assert not marchive.objects.objects.last.called
+    assert not marchive.return_value.save.called
 
 
-@patch("transit_odp.avl.tasks.CAVLDataArchive")
-@patch("transit_odp.avl.tasks.requests")
+@patch("transit_odp.avl.archivers.CAVLDataArchive")
+@patch("transit_odp.avl.archivers.requests")
 def test_task_create_sirivm_tfl_zipfile(mrequests, marchive):
     filter_ = marchive.objects.filter.return_value = MagicMock()
     filter_.last.return_value = None
-    mresponse = MagicMock(content=b"hello")
+    mresponse = MagicMock()
+    mresponse.__enter__.return_value = mresponse
+    mresponse.iter_content.return_value = [b"hello"]
     mrequests.get.return_value = mresponse
     task_create_sirivm_tfl_zipfile()
     params = mrequests.get.call_args.kwargs["params"]
@@ -497,3 +504,38 @@ def test_reset_vehicle_activity_in_cache(
 ):
     task_reset_avl_weekly_cache()
     reset_vehicle_activity_in_cache.assert_called_once()
+
+
+def slow_or_failing_feed(feed_id: int):
+    if feed_id == 2:
+        raise ValueError("validation failed")
+    if feed_id == 3:
+        time.sleep(2)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_run_for_each_feed_summary(workers, settings, mocker):
+    settings.AVL_VALIDATION_WORKERS = workers
+    settings.AVL_VALIDATION_FEED_TIMEOUT = 0.5
+    mocker.patch("transit_odp.avl.tasks.FEED_POLL_INTERVAL", 0.05)
+
+    summary = run_for_each_feed("Test", [1, 2, 3, 4], slow_or_failing_feed)
+
+    assert summary.failed == [2]
+    if workers == 1:
+        # Feeds validated one by one cannot be timed out
+        assert sorted(summary.succeeded) == [1, 3, 4]
+        assert summary.timed_out == []
+    else:
+        assert sorted(summary.succeeded) == [1, 4]
+        assert summary.timed_out == [3]
+
+
+def test_task_run_avl_validations_validates_every_feed(mocker):
+    revisions = AVLDatasetRevisionFactory.create_batch(3)
+    run_feed_validation = mocker.patch("transit_odp.avl.tasks.task_run_feed_validation")
+
+    task_run_avl_validations()
+
+    validated = sorted(call.args[0] for call in run_feed_validation.call_args_list)
+    assert validated == sorted(revision.dataset_id for revision in revisions)
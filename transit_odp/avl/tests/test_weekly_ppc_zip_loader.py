@@ -10,11 +10,15 @@ from transit_odp.avl.models import PPCReportType
 from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
     ALL_SIRIVM_FILENAME,
     UNCOUNTED_VEHICLE_ACTIVITY_FILENAME,
+    VehicleActivityErrors,
     get_destinationref_df,
     get_directionref_df,
     get_latest_reports_from_db,
     get_originref_df,
+    get_vehicle_activity_errors,
+    get_vehicle_activity_operatorref_linename,
     read_all_linenames_from_weekly_files,
+    reset_vehicle_activity_in_cache,
 )
 from transit_odp.organisation.factories import DatasetFactory, OrganisationFactory
 from datetime import date, timedelta
@@ -450,3 +454,58 @@ def test_read_all_linenames_from_weekly_files_get_destinationref_df_exception(
     result_df = read_all_linenames_from_weekly_files()
     expected_df = pd.DataFrame(columns=["OperatorRef", "LineRef"])
     assert_frame_equal(expected_df, result_df, check_dtype=False)
+
+
+def test_vehicle_activity_errors_has_errors():
+    errors = VehicleActivityErrors.from_dataframe(
+        pd.DataFrame({"OperatorRef": ["ACYM", "ACYM"], "LineRef": ["5", "X_1"]})
+    )
+
+    assert len(errors) == 2
+    assert errors.has_errors("ACYM", "5")
+    assert errors.has_errors("ACYM", "X 1")
+    assert not errors.has_errors("ACYM", "12")
+    assert not errors.has_errors("ABCD", "5")
+
+
+def test_vehicle_activity_errors_empty():
+    errors = VehicleActivityErrors.from_dataframe(
+        pd.DataFrame(columns=["OperatorRef", "LineRef"])
+    )
+
+    assert len(errors) == 0
+    assert not errors.has_errors("ACYM", "5")
+
+
+@patch(f"{BASE_PATH}.read_all_linenames_from_weekly_files")
+def test_get_vehicle_activity_operatorref_linename_is_held_by_process(
+    mock_read_all_linenames,
+):
+    mock_read_all_linenames.return_value = pd.DataFrame(
+        {"OperatorRef": ["ACYM"], "LineRef": ["5"]}
+    )
+
+    df = get_vehicle_activity_operatorref_linename()
+    errors = get_vehicle_activity_errors()
+
+    assert get_vehicle_activity_operatorref_linename() is df
+    assert get_vehicle_activity_errors() is errors
+    assert errors.has_errors("ACYM", "5")
+    mock_read_all_linenames.assert_called_once_with()
+
+
+@patch(f"{BASE_PATH}.read_all_linenames_from_weekly_files")
+def test_reset_vehicle_activity_in_cache_reloads_errors(mock_read_all_linenames):
+    mock_read_all_linenames.return_value = pd.DataFrame(
+        {"OperatorRef": ["ACYM"], "LineRef": ["5"]}
+    )
+    assert get_vehicle_activity_errors().has_errors("ACYM", "5")
+
+    mock_read_all_linenames.return_value = pd.DataFrame(
+        {"OperatorRef": ["ACYM"], "LineRef": ["12"]}
+    )
+    reset_vehicle_activity_in_cache()
+
+    errors = get_vehicle_activity_errors()
+    assert not errors.has_errors("ACYM", "5")
+    assert errors.has_errors("ACYM", "12")
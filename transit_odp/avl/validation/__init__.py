@@ -38,13 +38,16 @@ class ValidationClient:
         else:
             return None
 
-    def validate(self, feed_id: int) -> Optional[ValidationResponse]:
+    def validate(
+        self, feed_id: int, timeout: int = DEFAULT_TIMEOUT
+    ) -> Optional[ValidationResponse]:
         """
         Calls the validate-profile endpoint for a given subscription. It will return the validation errors collated
         within the last 24 hours for a given data producer. Validation follows the rules defined in the SIRI 2.0 schema
 
         Args:
             feed_id: The data feed id to validate.
+            timeout: The seconds to wait for the validation service to respond.
 
         Returns:
             ValidationResponse or None
@@ -52,9 +55,7 @@ class ValidationClient:
         endpoint = self.url + f"/subscriptions/{feed_id}/validate-profile"
 
         headers = {"x-api-key": settings.AVL_PRODUCER_API_KEY}
-        data = self._make_request(
-            GET, endpoint, timeout=DEFAULT_TIMEOUT, headers=headers
-        )
+        data = self._make_request(GET, endpoint, timeout=timeout, headers=headers)
 
         if data is not None:
             return ValidationResponse(**data)
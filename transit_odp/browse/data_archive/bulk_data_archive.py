@@ -1,23 +1,31 @@
 import os
-import zipfile
-from collections import defaultdict
+import tempfile
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from shutil import copyfileobj
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+from zipfile import BadZipFile, ZipFile
 
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from django.core.files import File
+from django.db.models.fields.files import FieldFile
 from django.utils import timezone
 
-from transit_odp.organisation.constants import (
-    DatasetType,
-    TimetableType,
-    TravelineRegions,
-)
+from transit_odp.organisation.constants import DatasetType, TravelineRegions
 from transit_odp.organisation.models import Dataset
 from transit_odp.pipelines.models import BulkDataArchive
 
 logger = get_task_logger(__name__)
 
+# Size of the chunks the upload files are copied into the archives in
+CHUNK_SIZE = 1024 * 1024
+
 
 def get_datasets(dataset_type: DatasetType):
     """Returns all active datasets, i.e. status != expired."""
@@ -29,15 +37,17 @@ def get_datasets(dataset_type: DatasetType):
     )
 
 
-def get_datasets_by_region(region_code: str):
-    """Returns all published distinct datasets by region."""
-    return (
-        Dataset.objects.get_active_org()
-        .filter(live_revision__admin_areas__traveline_region_id=region_code)
-        .filter(dataset_type=TimetableType)
-        .get_active()
-        .distinct("id")
+def get_dataset_regions(datasets) -> Dict[int, Set[str]]:
+    """Returns the Traveline regions of the live revision of each of `datasets`."""
+    regions = defaultdict(set)
+    rows = (
+        datasets.filter(live_revision__admin_areas__isnull=False)
+        .values_list("id", "live_revision__admin_areas__traveline_region_id")
+        .distinct()
     )
+    for dataset_id, region_code in rows:
+        regions[dataset_id].add(region_code)
+    return regions
 
 
 def get_outpath(dataset_type: DatasetType):
@@ -48,8 +58,204 @@ def get_outpath(dataset_type: DatasetType):
         return f"/tmp/bodds_archive_{now}.zip"
 
 
-def zip_datasets(datasets, outpath):
-    """Zips the uploaded data in `datasets` into the archive `outpath`"""
+def get_region_outpath(region_code: str):
+    now = timezone.now().strftime("%Y%m%d")
+    return f"/tmp/bodds_archive_{region_code}_{now}.zip"
+
+
+def get_previous_archive(dataset_type: DatasetType) -> Optional[BulkDataArchive]:
+    """Returns the latest national archive of `dataset_type`."""
+    return (
+        BulkDataArchive.objects.filter(
+            dataset_type=dataset_type,
+            compliant_archive=False,
+            traveline_regions=TravelineRegions.ALL.value,
+        )
+        .order_by("-created")
+        .first()
+    )
+
+
+@contextmanager
+def open_previous_archive(dataset_type: DatasetType) -> Iterator[Optional[ZipFile]]:
+    """Downloads the latest national archive of `dataset_type` to a temporary file
+    and opens it, or yields None if there is no archive that can be read."""
+    archive = get_previous_archive(dataset_type)
+    if archive is None:
+        yield None
+        return
+
+    with tempfile.TemporaryFile() as tmp:
+        previous = None
+        try:
+            with archive.data.open("rb") as fin:
+                copyfileobj(fin, tmp, CHUNK_SIZE)
+            tmp.seek(0)
+            previous = ZipFile(tmp)
+        except (OSError, BadZipFile):
+            logger.warning(
+                f"[bulk_data_archive] unable to read previous archive {archive}",
+                exc_info=True,
+            )
+
+        if previous is None:
+            yield None
+            return
+
+        logger.info(f"[bulk_data_archive] reusing unchanged datasets from {archive}")
+        with previous:
+            yield previous
+
+
+@dataclass
+class ArchiveEntry:
+    """An upload file to zip into the archives `targets` as `name`."""
+
+    name: str
+    upload: FieldFile
+    targets: List[ZipFile]
+    reused: bool
+
+
+@dataclass
+class ArchiveMetrics:
+    """The time spent in each stage of zipping datasets into an archive.
+
+    `fetch_seconds` is summed across the threads that fetch upload files from
+    storage, `wait_seconds` is how long the writer waited on them. When the files
+    are fetched by the writer itself the fetch is part of `write_seconds`.
+    """
+
+    fetched: int = 0
+    reused: int = 0
+    fetched_bytes: int = 0
+    fetch_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    write_seconds: float = 0.0
+
+    def log(self, outpath) -> None:
+        logger.info(
+            f"[bulk_data_archive] {outpath}: fetched {self.fetched} datasets "
+            f"({self.fetched_bytes} bytes) in {self.fetch_seconds:.2f}s, reused "
+            f"{self.reused} unchanged datasets, waited {self.wait_seconds:.2f}s for "
+            f"fetches and wrote for {self.write_seconds:.2f}s"
+        )
+
+
+def fetch_upload_file(
+    upload: FieldFile,
+) -> Tuple[tempfile.SpooledTemporaryFile, int, float]:
+    """Copies `upload` from storage into a spooled temporary file.
+
+    Returns:
+        The file positioned at the start, its size and the seconds the fetch took.
+    """
+    start = time.perf_counter()
+    file_ = tempfile.SpooledTemporaryFile(max_size=settings.BULK_ARCHIVE_SPOOL_MAX_SIZE)
+    try:
+        with upload.open("rb") as fin:
+            copyfileobj(fin, file_, CHUNK_SIZE)
+    except BaseException:
+        file_.close()
+        raise
+    size = file_.tell()
+    file_.seek(0)
+    return file_, size, time.perf_counter() - start
+
+
+def write_entry(fin: BinaryIO, entry: ArchiveEntry) -> None:
+    with ExitStack() as outputs:
+        fouts = [
+            outputs.enter_context(target.open(entry.name, "w", force_zip64=True))
+            for target in entry.targets
+        ]
+        # efficiently copy data from fin into every fout
+        for chunk in iter(partial(fin.read, CHUNK_SIZE), b""):
+            for fout in fouts:
+                fout.write(chunk)
+
+
+def write_entries(
+    entries: List[ArchiveEntry],
+    previous_archive: Optional[ZipFile],
+    metrics: ArchiveMetrics,
+) -> None:
+    """Writes `entries` into their archives in order.
+
+    With more than one BULK_ARCHIVE_FETCH_WORKERS the upload files are fetched from
+    storage by a pool of threads, at most BULK_ARCHIVE_PREFETCH of them ahead of
+    the writer, since fetching is mostly waiting on the network.
+    """
+    workers = settings.BULK_ARCHIVE_FETCH_WORKERS
+    if workers <= 1:
+        for entry in entries:
+            start = time.perf_counter()
+            if entry.reused:
+                fin = previous_archive.open(entry.name)
+                metrics.reused += 1
+            else:
+                # Open dataset upload file
+                fin = entry.upload.open("rb")
+                metrics.fetched += 1
+            with fin:
+                write_entry(fin, entry)
+            metrics.write_seconds += time.perf_counter() - start
+        return
+
+    prefetch = max(settings.BULK_ARCHIVE_PREFETCH, 1)
+    to_fetch = (entry for entry in entries if not entry.reused)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="archive")
+
+    def fetch_ahead():
+        while len(pending) < prefetch:
+            entry = next(to_fetch, None)
+            if entry is None:
+                return
+            pending.append(executor.submit(fetch_upload_file, entry.upload))
+
+    try:
+        fetch_ahead()
+        for entry in entries:
+            if entry.reused:
+                fin = previous_archive.open(entry.name)
+                metrics.reused += 1
+            else:
+                start = time.perf_counter()
+                fin, size, seconds = pending.popleft().result()
+                metrics.wait_seconds += time.perf_counter() - start
+                metrics.fetch_seconds += seconds
+                metrics.fetched_bytes += size
+                metrics.fetched += 1
+                fetch_ahead()
+
+            start = time.perf_counter()
+            with fin:
+                write_entry(fin, entry)
+            metrics.write_seconds += time.perf_counter() - start
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        # Close the files fetched ahead of a writer that failed
+        for future in pending:
+            if not future.cancelled() and future.exception() is None:
+                future.result()[0].close()
+
+
+def zip_datasets(
+    datasets,
+    outpath,
+    previous_archive: Optional[ZipFile] = None,
+    region_outpaths: Optional[Dict[str, str]] = None,
+    dataset_regions: Optional[Dict[int, Set[str]]] = None,
+) -> ArchiveMetrics:
+    """Zips the uploaded data in `datasets` into the archive `outpath`.
+
+    The upload files of live revisions already in `previous_archive` are copied from
+    it rather than fetched from storage. Each dataset is also zipped into the
+    archives in `region_outpaths` of the regions `dataset_regions` gives for it.
+    """
+    region_outpaths = region_outpaths or {}
+    dataset_regions = dataset_regions or {}
     logger.info(
         f"[bulk_data_archive] creating zip of {len(datasets)} datasets at {outpath}"
     )
@@ -59,21 +265,41 @@ def zip_datasets(datasets, outpath):
         org = dataset.organisation
         orgs[f"{org.short_name}_{org.id}"].append(dataset)
 
-    with zipfile.ZipFile(outpath, "w") as zf:
+    previous_names = set(previous_archive.namelist()) if previous_archive else set()
+    metrics = ArchiveMetrics()
+
+    with ExitStack() as stack:
+        zf = stack.enter_context(ZipFile(outpath, "w"))
+        region_zfs = {
+            region_code: stack.enter_context(ZipFile(region_outpath, "w"))
+            for region_code, region_outpath in region_outpaths.items()
+        }
+
+        entries = []
         for directory_name, datasets in orgs.items():
             for dataset in datasets:
                 upload = dataset.live_revision.upload_file
-                # Open dataset upload file
-                with upload.open("rb") as fin:
-                    relative_path_upload_file = Path(directory_name, upload.name)
-                    # Write files into inner directory to keep all the files together
-                    # when the user unzips
-                    with zf.open(
-                        relative_path_upload_file.as_posix(),
-                        "w",
-                    ) as fout:
-                        # efficiently copy data from fin into fout
-                        copyfileobj(fin, fout)
+                # Write files into inner directory to keep all the files together
+                # when the user unzips
+                name = Path(directory_name, upload.name).as_posix()
+                targets = [zf] + [
+                    region_zfs[region_code]
+                    for region_code in dataset_regions.get(dataset.id, ())
+                    if region_code in region_zfs
+                ]
+                entries.append(
+                    ArchiveEntry(
+                        name=name,
+                        upload=upload,
+                        targets=targets,
+                        reused=name in previous_names,
+                    )
+                )
+
+        write_entries(entries, previous_archive, metrics)
+
+    metrics.log(outpath)
+    return metrics
 
 
 def upload_bulk_data_archive(
@@ -81,13 +307,14 @@ def upload_bulk_data_archive(
     dataset_type: DatasetType,
     is_compliant: bool = False,
     traveline_regions: str = "All",
+    name: Optional[str] = None,
 ):
     """Saves the zip file at `outpath` to the BulkDataArchive model and uploads the
     zip to the MEDIA_ROOT"""
     logger.info("[bulk_data_archive] creating BulkDataArchive record")
     with open(outpath, "rb") as fin:
         archive = BulkDataArchive.objects.create(
-            data=File(fin, name=os.path.basename(outpath)),
+            data=File(fin, name=name or os.path.basename(outpath)),
             dataset_type=dataset_type,
             compliant_archive=is_compliant,
             traveline_regions=traveline_regions,
@@ -96,7 +323,7 @@ def upload_bulk_data_archive(
 
 
 def create_timetable_archive():
-    # Timetable Bulk data archive
+    # Timetable Bulk data archive, along with the archive of each Traveline region
     logger.info("[bulk_data_archive] processing Timetable data")
 
     dataset_type = DatasetType.TIMETABLE.value
@@ -104,17 +331,42 @@ def create_timetable_archive():
     # Get active datasets
     timetable_datasets = get_datasets(dataset_type=dataset_type)
 
-    # Get local path to create zip file
+    # Get local paths to create zip files
     output = get_outpath(dataset_type=dataset_type)
-
-    # Write copy each dataset's upload_file into the zip
-    zip_datasets(timetable_datasets, output)
+    region_outputs = {
+        region.value: get_region_outpath(region.value)
+        for region in TravelineRegions
+        if region != TravelineRegions.ALL
+    }
+
+    # Write each dataset's upload_file into the zips, reusing the unchanged ones
+    # in the previous archive
+    with open_previous_archive(dataset_type) as previous_archive:
+        zip_datasets(
+            timetable_datasets,
+            output,
+            previous_archive=previous_archive,
+            region_outpaths=region_outputs,
+            dataset_regions=get_dataset_regions(timetable_datasets),
+        )
 
     # Create BulkDataArchive
     timetable_archive = upload_bulk_data_archive(output, dataset_type=dataset_type)
 
     logger.info(f"[bulk_data_archive] created for timetables: {timetable_archive}")
 
+    for region_code, region_output in region_outputs.items():
+        region_archive = upload_bulk_data_archive(
+            region_output,
+            dataset_type=dataset_type,
+            traveline_regions=region_code,
+            name=os.path.basename(output),
+        )
+        logger.info(
+            f"[bulk_data_archive] created {region_archive} for the region "
+            f"{region_code}"
+        )
+
 
 def create_fares_archive():
     # Fares Bulk data archive
@@ -128,8 +380,10 @@ def create_fares_archive():
     # Get local path to create zip file
     output = get_outpath(dataset_type=dataset_type)
 
-    # Write copy each dataset's upload_file into the zip
-    zip_datasets(fares_datasets, output)
+    # Write each dataset's upload_file into the zip, reusing the unchanged ones in
+    # the previous archive
+    with open_previous_archive(dataset_type) as previous_archive:
+        zip_datasets(fares_datasets, output, previous_archive=previous_archive)
 
     # Create BulkDataArchive
     fares_archive = upload_bulk_data_archive(output, dataset_type=dataset_type)
@@ -137,30 +391,6 @@ def create_fares_archive():
     logger.info(f"[bulk_data_archive] created for fares: {fares_archive}")
 
 
-def create_region_archive(region_code):
-    logger.info("[bulk_data_archive] processing Timetables data by region")
-
-    dataset_type = TimetableType
-
-    # Get active datasets
-    timetables_datasets = get_datasets_by_region(region_code)
-
-    # Get local path to create zip file
-    output = get_outpath(dataset_type=dataset_type)
-
-    # Write copy each dataset's upload_file into the zip
-    zip_datasets(timetables_datasets, output)
-
-    # Create BulkDataArchive
-    timetables_archive = upload_bulk_data_archive(
-        output, dataset_type=dataset_type, traveline_regions=region_code
-    )
-
-    logger.info(
-        f"[bulk_data_archive] created {timetables_archive} for the region {region_code}"
-    )
-
-
 def run():
     logger.info("[bulk_data_archive] called")
     # Note this task requires the set_expired_datasets task to run first to ensure the
@@ -171,7 +401,3 @@ def run():
     create_timetable_archive()
 
     create_fares_archive()
-
-    for t in TravelineRegions:
-        if t != TravelineRegions.ALL:
-            create_region_archive(t.value)
@@ -229,7 +229,7 @@ def create_data_catalogue_file() -> BinaryIO:
     with zipfile.ZipFile(buffer_, mode="w", compression=zipfile.ZIP_DEFLATED) as zin:
         for file_ in files:
             Builder = file_.builder
-            zin.writestr(file_.name, Builder().to_string())
+            Builder().to_zip(zin, file_.name)
 
         try:
             zin.writestr(ORGANISATION_FILENAME, get_organisation_catalogue_csv())
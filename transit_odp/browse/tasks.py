@@ -5,6 +5,10 @@ from django.core.files.base import File
 
 from transit_odp.browse.data_archive import bulk_data_archive, change_data_archive
 from transit_odp.browse.exports import create_data_catalogue_file
+from transit_odp.browse.timetable_visualiser import (
+    materialise_timetable_visualiser,
+    prune_timetable_visualiser,
+)
 from transit_odp.site_admin.constants import ARCHIVE_CATEGORY_FILENAME, DataCatalogue
 from transit_odp.site_admin.models import DocumentArchive
 
@@ -37,3 +41,21 @@ def task_create_bulk_data_archive():
 @shared_task(ignore_result=True)
 def task_create_change_data_archive():
     change_data_archive.run()
+
+
+@shared_task(ignore_result=True)
+def task_materialise_timetable_visualiser(revision_id: int) -> None:
+    created = materialise_timetable_visualiser(revision_id)
+    logger.info(
+        f"[TimetableVisualiser] Materialised {created} matrices "
+        f"for revision {revision_id}."
+    )
+
+
+@shared_task(ignore_result=True)
+def task_prune_timetable_visualiser() -> None:
+    deleted = prune_timetable_visualiser()
+    logger.info(
+        f"[TimetableVisualiser] Deleted {deleted} matrices of revisions "
+        f"that are no longer live."
+    )
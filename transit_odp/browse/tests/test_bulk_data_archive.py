@@ -7,6 +7,7 @@ from django.test import override_settings
 from django.utils import timezone
 
 from transit_odp.browse.data_archive import bulk_data_archive
+from transit_odp.naptan.factories import AdminAreaFactory
 from transit_odp.organisation.constants import DatasetType
 from transit_odp.organisation.factories import DatasetFactory, OrganisationFactory
 from transit_odp.pipelines.models import BulkDataArchive
@@ -95,6 +96,92 @@ def test_zip_fares_datasets(tmp_path):
                     assert zipped.read() == orig.read()
 
 
+@pytest.mark.parametrize("workers", [1, 4])
+def test_zip_datasets_fetch_workers(tmp_path, settings, workers):
+    """Tests zip_datasets zips the datasets in order however they are fetched"""
+    settings.BULK_ARCHIVE_FETCH_WORKERS = workers
+    settings.BULK_ARCHIVE_PREFETCH = 2
+    datasets = [
+        DatasetFactory(live_revision__upload_file__data=f"Test data {i}".encode())
+        for i in range(5)
+    ]
+
+    outpath = str(tmp_path / "bulk.zip")
+    metrics = bulk_data_archive.zip_datasets(datasets, outpath)
+
+    assert metrics.fetched == 5
+    with zipfile.ZipFile(outpath, "r") as zf:
+        contents = [zf.read(name) for name in zf.namelist()]
+    assert contents == [f"Test data {i}".encode() for i in range(5)]
+
+
+def test_zip_datasets_reuses_previous_archive(tmp_path):
+    """Tests zip_datasets copies the datasets in the previous archive from it"""
+    datasets = DatasetFactory.create_batch(
+        2, live_revision__upload_file__data=b"Test data"
+    )
+    names = []
+    for dataset in datasets:
+        org = dataset.organisation
+        upload = dataset.live_revision.upload_file
+        names.append(f"{org.short_name}_{org.id}/{upload.name}")
+
+    previous_outpath = str(tmp_path / "previous.zip")
+    with zipfile.ZipFile(previous_outpath, "w") as zf:
+        zf.writestr(names[0], b"Previous data")
+
+    outpath = str(tmp_path / "bulk.zip")
+    with zipfile.ZipFile(previous_outpath, "r") as previous_archive:
+        bulk_data_archive.zip_datasets(
+            datasets, outpath, previous_archive=previous_archive
+        )
+
+    with zipfile.ZipFile(outpath, "r") as zf:
+        assert zf.testzip() is None
+        assert zf.read(names[0]) == b"Previous data"
+        assert zf.read(names[1]) == b"Test data"
+
+
+def test_zip_datasets_into_region_archives(tmp_path):
+    """Tests zip_datasets zips each dataset into the archives of its regions"""
+    datasets = DatasetFactory.create_batch(
+        2, live_revision__upload_file__data=b"Test data"
+    )
+    region_outpaths = {"SE": str(tmp_path / "se.zip"), "L": str(tmp_path / "l.zip")}
+    dataset_regions = {datasets[0].id: {"SE", "L"}, datasets[1].id: {"SE", "NW"}}
+
+    bulk_data_archive.zip_datasets(
+        datasets,
+        str(tmp_path / "bulk.zip"),
+        region_outpaths=region_outpaths,
+        dataset_regions=dataset_regions,
+    )
+
+    with zipfile.ZipFile(region_outpaths["SE"], "r") as zf:
+        assert len(zf.namelist()) == 2
+    with zipfile.ZipFile(region_outpaths["L"], "r") as zf:
+        org = datasets[0].organisation
+        upload = datasets[0].live_revision.upload_file
+        assert zf.namelist() == [f"{org.short_name}_{org.id}/{upload.name}"]
+
+
+def test_get_dataset_regions():
+    """Tests get_dataset_regions returns the regions of each live revision"""
+    dataset = DatasetFactory()
+    dataset.live_revision.admin_areas.add(
+        AdminAreaFactory(traveline_region_id="SE"),
+        AdminAreaFactory(traveline_region_id="SE"),
+        AdminAreaFactory(traveline_region_id="L"),
+    )
+    DatasetFactory()
+
+    regions = bulk_data_archive.get_dataset_regions(
+        bulk_data_archive.get_datasets(dataset_type=DatasetType.TIMETABLE.value)
+    )
+
+    assert regions == {dataset.id: {"SE", "L"}}
+
+
 def test_bulk_archive_creates_more_then_3_files():
     """
     Tests upload_bulk_data_archive creates 3 archive files - Timetable, compliant
@@ -0,0 +1,197 @@
+import datetime
+import json
+
+import pandas as pd
+import pytest
+from waffle.testutils import override_flag
+
+from transit_odp.browse.timetable_visualiser import (
+    MATERIALISED_COLUMNS,
+    TimetableVisualiser,
+    decode_rows,
+    encode_rows,
+    materialise_timetable_visualiser,
+    prune_timetable_visualiser,
+)
+from transit_odp.naptan.models import StopPoint
+from transit_odp.organisation.factories import DatasetFactory, DatasetRevisionFactory
+from transit_odp.organisation.models import TXCFileAttributes
+from transit_odp.pipelines.tests.test_dataset_etl.test_etl_operating_dates_exceptions import (  # noqa: E501
+    setup_bank_holidays,
+)
+from transit_odp.pipelines.tests.test_dataset_etl.test_extract_metadata import (
+    ExtractBaseTestCase,
+)
+from transit_odp.transmodel.models import Service, TimetableVisualiserMatrix
+
+
+def test_decode_rows_matches_from_records():
+    rows = []
+    for index in range(6):
+        row = {column: f"{column}_{index % 2}" for column in MATERIALISED_COLUMNS}
+        row.update(
+            revision_id=1,
+            start_date=datetime.date(2024, 1, 1),
+            end_date=None if index % 2 else datetime.date(2025, 1, 1),
+            operating_period_start_date=datetime.date(2023, 1, index + 1),
+            departure_time=datetime.time(10, index),
+            start_time=None if index == 3 else datetime.time(9, 0),
+            stop_sequence=None if index == 2 else index,
+            revision_number=index,
+            is_timing_point=bool(index % 2),
+            departure_day_shift=False,
+            public_use=True,
+            vehicle_journey_id=100 + index,
+            service_pattern_stop_id=index,
+        )
+        rows.append(row)
+
+    # The matrices are stored as JSON
+    data = json.loads(json.dumps(encode_rows(rows, MATERIALISED_COLUMNS)))
+
+    pd.testing.assert_frame_equal(decode_rows(data), pd.DataFrame.from_records(rows))
+
+
+@override_flag("is_timetable_visualiser_active", active=True)
+class TimetableVisualiserMatrixTest(ExtractBaseTestCase):
+    test_file = "data/test_operating_dates_exception/test_op_dates_exceptions.xml"
+
+    def setUp(self):
+        super().setUp()
+        setup_bank_holidays()
+        extracted = self.trans_xchange_extractor.extract()
+        self.feed_parser.load(self.feed_parser.transform(extracted))
+        TXCFileAttributes.objects.filter(revision=self.revision).update(
+            operating_period_start_date=datetime.date(2023, 9, 1)
+        )
+
+    def get_timetables(self, target_date):
+        timetables = []
+        for service in Service.objects.filter(revision=self.revision):
+            for line_name in service.service_patterns.values_list(
+                "line_name", flat=True
+            ).distinct():
+                timetables.append(
+                    TimetableVisualiser(
+                        self.revision.id,
+                        service.service_code,
+                        line_name,
+                        target_date,
+                        True,
+                    ).get_timetable_visualiser()
+                )
+        return timetables
+
+    def test_materialised_timetable_matches_live_query(self):
+        target_dates = [
+            # Bank holiday operating by exception
+            datetime.date(2024, 12, 25),
+            # HolidaysOnly operating profile
+            datetime.date(2023, 9, 15),
+            datetime.date(2024, 2, 13),
+            # Before the operating period
+            datetime.date(2023, 8, 1),
+            # A Saturday, no journeys operate at the weekend
+            datetime.date(2024, 2, 17),
+        ]
+        live = [self.get_timetables(target_date) for target_date in target_dates]
+
+        created = materialise_timetable_visualiser(self.revision.id)
+
+        assert created == TimetableVisualiserMatrix.objects.count()
+        assert created > 0
+        materialised = [
+            self.get_timetables(target_date) for target_date in target_dates
+        ]
+        for expected_timetables, timetables in zip(live, materialised):
+            self.assert_timetables_equal(timetables, expected_timetables)
+
+    def test_materialised_timetable_reads_current_stop_details(self):
+        target_date = datetime.date(2024, 2, 13)
+        materialise_timetable_visualiser(self.revision.id)
+        # A NaPTAN import after the revision was published
+        StopPoint.objects.update(common_name="Renamed stop", street="New street")
+
+        materialised = self.get_timetables(target_date)
+        TimetableVisualiserMatrix.objects.all().delete()
+        live = self.get_timetables(target_date)
+
+        assert any(
+            "Renamed stop"
+            in timetable[direction]["df_timetable"].to_string()
+            + str(timetable[direction]["stops"])
+            for timetable in live
+            for direction in ("inbound", "outbound")
+        )
+        self.assert_timetables_equal(materialised, live)
+
+    def test_materialised_timetable_keeps_descriptions_without_journeys(self):
+        # A Saturday, no journeys operate at the weekend
+        target_date = datetime.date(2024, 2, 17)
+        materialise_timetable_visualiser(self.revision.id)
+
+        materialised = self.get_timetables(target_date)
+        TimetableVisualiserMatrix.objects.all().delete()
+        live = self.get_timetables(target_date)
+
+        assert any(
+            timetable[direction]["description"]
+            and timetable[direction]["df_timetable"].empty
+            for timetable in live
+            for direction in ("inbound", "outbound")
+        )
+        self.assert_timetables_equal(materialised, live)
+
+    def assert_timetables_equal(self, timetables, expected_timetables):
+        assert len(timetables) == len(expected_timetables)
+        for expected, actual in zip(expected_timetables, timetables):
+            assert actual.keys() == expected.keys()
+            for direction, expected_data in expected.items():
+                data = actual[direction]
+                assert data.keys() == expected_data.keys()
+                pd.testing.assert_frame_equal(
+                    data["df_timetable"], expected_data["df_timetable"]
+                )
+                for key in expected_data.keys() - {"df_timetable"}:
+                    assert data[key] == expected_data[key], (direction, key)
+
+    def test_materialise_replaces_matrices(self):
+        first = materialise_timetable_visualiser(self.revision.id)
+        second = materialise_timetable_visualiser(self.revision.id)
+
+        assert first == second == TimetableVisualiserMatrix.objects.count()
+
+
+@pytest.mark.django_db
+def test_timetable_visualiser_falls_back_to_live_query(mocker):
+    live = mocker.patch.object(
+        TimetableVisualiser,
+        "get_df_live_vehicle_journeys",
+        return_value=pd.DataFrame(),
+    )
+    visualiser = TimetableVisualiser(
+        -1, "PF0001633:2", "811", datetime.date(2024, 2, 13), True
+    )
+
+    data = visualiser.get_timetable_visualiser()
+
+    live.assert_called_once_with()
+    assert data["inbound"]["df_timetable"].empty
+    assert data["outbound"]["df_timetable"].empty
+
+
+@pytest.mark.django_db
+def test_prune_timetable_visualiser_keeps_live_revisions():
+    dataset = DatasetFactory()
+    previous = DatasetRevisionFactory(dataset=dataset, is_published=False)
+    for revision in (previous, dataset.live_revision):
+        TimetableVisualiserMatrix.objects.create(
+            revision=revision, service_code="PF0001633:2", data={}
+        )
+
+    deleted = prune_timetable_visualiser()
+
+    assert deleted == 1
+    assert list(
+        TimetableVisualiserMatrix.objects.values_list("revision_id", flat=True)
+    ) == [dataset.live_revision.id]
@@ -21,6 +21,9 @@ import transit_odp.publish.requires_attention as publish_attention
 from config.hosts import DATA_HOST
 from transit_odp.avl.factories import AVLValidationReportFactory
 from transit_odp.avl.proxies import AVLDataset
+from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
+    VehicleActivityErrors,
+)
 from transit_odp.avl.tasks import cache_avl_compliance_status
 from transit_odp.avl.tests.test_abods_registry import (
     REQUEST,
@@ -1233,7 +1236,7 @@ class TestOperatorDetailView:
     @override_flag(FeatureFlags.COMPLETE_SERVICE_PAGES.value, active=True)
     @override_flag(FeatureFlags.OPERATOR_PREFETCH_SRA.value, active=False)
     @patch.object(publish_attention, "AbodsRegistery")
-    @patch.object(publish_attention, "get_vehicle_activity_operatorref_linename")
+    @patch.object(publish_attention, "get_vehicle_activity_errors")
     def test_operator_detail_view_stats_not_compliant(
         self, mock_vehivle_activity, mock_abodsregistry, request_factory: RequestFactory
     ):
@@ -1256,8 +1259,8 @@ class TestOperatorDetailView:
         mock_registry_instance = MagicMock()
         mock_abodsregistry.return_value = mock_registry_instance
         mock_registry_instance.records.return_value = ["line1__SDCU", "line2__SDCU"]
-        mock_vehivle_activity.return_value = pd.DataFrame(
-            {"OperatorRef": ["SDCU"], "LineRef": ["line2"]}
+        mock_vehivle_activity.return_value = VehicleActivityErrors.from_dataframe(
+            pd.DataFrame({"OperatorRef": ["SDCU"], "LineRef": ["line2"]})
         )
 
         total_services = 9
@@ -1536,7 +1539,7 @@ class TestOperatorDetailView:
     @override_flag(FeatureFlags.FARES_REQUIRE_ATTENTION.value, active=True)
     @override_flag(FeatureFlags.COMPLETE_SERVICE_PAGES.value, active=True)
     @patch.object(publish_attention, "AbodsRegistery")
-    @patch.object(publish_attention, "get_vehicle_activity_operatorref_linename")
+    @patch.object(publish_attention, "get_vehicle_activity_errors")
     @freeze_time("2023-02-24")
     def test_operator_detail_view_stats_compliant(
         self, mock_vehivle_activity, mock_abodsregistry, request_factory: RequestFactory
@@ -1563,8 +1566,8 @@ class TestOperatorDetailView:
             "line1__BLAC",
             "line2__BLAC",
         ]
-        mock_vehivle_activity.return_value = pd.DataFrame(
-            {"OperatorRef": ["SDCU"], "LineRef": ["line0"]}
+        mock_vehivle_activity.return_value = VehicleActivityErrors.from_dataframe(
+            pd.DataFrame({"OperatorRef": ["SDCU"], "LineRef": ["line0"]})
         )
 
         total_services = 4
@@ -2190,12 +2193,12 @@ class TestLineMetadataDetailView:
     @override_flag("is_complete_service_pages_active", active=True)
     @override_flag("is_avl_require_attention_active", active=True)
     @patch(REQUEST, side_effect=mocked_requests_post_valid_response)
-    @patch.object(publish_attention, "get_vehicle_activity_operatorref_linename")
+    @patch.object(publish_attention, "get_vehicle_activity_errors")
     def test_avl_data(self, mock_vehicle_activity, request_factory):
         """Test AVL data"""
 
-        mock_vehicle_activity.return_value = pd.DataFrame(
-            {"OperatorRef": ["SDCU"], "LineRef": ["line2"]}
+        mock_vehicle_activity.return_value = VehicleActivityErrors.from_dataframe(
+            pd.DataFrame({"OperatorRef": ["SDCU"], "LineRef": ["line2"]})
         )
         org = OrganisationFactory()
         total_services = 4
@@ -2610,7 +2613,7 @@ class TestLTADetailView:
     @override_flag("is_avl_require_attention_active", active=True)
     @override_flag(FeatureFlags.FARES_REQUIRE_ATTENTION.value, active=True)
     @patch.object(publish_attention, "AbodsRegistery")
-    @patch.object(publish_attention, "get_vehicle_activity_operatorref_linename")
+    @patch.object(publish_attention, "get_vehicle_activity_errors")
     @freeze_time("2024-11-24T16:40:40.000Z")
     def test_complete_service_pages_lta_detail_view(
         self,
@@ -2627,8 +2630,8 @@ class TestLTADetailView:
         mock_registry_instance = MagicMock()
         mock_abodsregistry.return_value = mock_registry_instance
         mock_registry_instance.records.return_value = ["line1__SDCU", "line2__SDCU"]
-        mock_vehicle_activity.return_value = pd.DataFrame(
-            {"OperatorRef": ["SDCU"], "LineRef": ["line2"]}
+        mock_vehicle_activity.return_value = VehicleActivityErrors.from_dataframe(
+            pd.DataFrame({"OperatorRef": ["SDCU"], "LineRef": ["line2"]})
         )
         org = OrganisationFactory()
         total_services = 9
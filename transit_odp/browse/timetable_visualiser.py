@@ -1,14 +1,19 @@
+import base64
 import logging
 from collections import defaultdict
-from typing import List
+from datetime import date, time
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
-from django.db.models import CharField, F, Q
+from django.db import transaction
+from django.db.models import CharField, F, Q, QuerySet
 from django.db.models.functions import Coalesce
 
 from transit_odp.dqs.constants import Checks
 from transit_odp.dqs.constants import Level as Importance
 from transit_odp.dqs.models import ObservationResults
+from transit_odp.organisation.models import DatasetRevision
 from transit_odp.timetables.utils import (
     fill_missing_journey_codes,
     get_df_operating_vehicle_journey,
@@ -24,11 +29,276 @@ from transit_odp.transmodel.models import (
     OperatingDatesExceptions,
     Service,
     ServicedOrganisationVehicleJourney,
+    ServicePatternStop,
+    TimetableVisualiserMatrix,
 )
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+VEHICLE_JOURNEY_COLUMNS = [
+    "service_code",
+    "revision_id",
+    "name",
+    "start_date",
+    "end_date",
+    "origin",
+    "destination",
+    "journey_description",
+    "line_name",
+    "stop_sequence",
+    "departure_time",
+    "is_timing_point",
+    "common_name",
+    "direction",
+    "vehicle_journey_code",
+    "line_ref",
+    "departure_day_shift",
+    "day_of_week",
+    "vehicle_journey_id",
+    "atco_code",
+    "public_use",
+    "revision_number",
+    "start_time",
+    "street",
+    "indicator",
+    "service_pattern_stop_id",
+    "stop_type",
+]
+# The NaPTAN details of the stops change with every NaPTAN import, so they are
+# joined onto the materialised rows when requested rather than materialised
+STOP_DETAIL_COLUMNS = ["common_name", "street", "indicator", "stop_type"]
+# The target date filters are applied to the materialised rows when requested
+MATERIALISED_COLUMNS = [
+    column for column in VEHICLE_JOURNEY_COLUMNS if column not in STOP_DETAIL_COLUMNS
+] + ["operating_period_start_date"]
+DATE_COLUMNS = {"start_date", "end_date", "operating_period_start_date"}
+TIME_COLUMNS = {"departure_time", "start_time"}
+MATERIALISE_BATCH_SIZE = 100
+
+
+def get_qs_vehicle_journey_stops(
+    revision_id: int, service_code: str, columns: List[str] = VEHICLE_JOURNEY_COLUMNS
+) -> QuerySet:
+    """
+    Get the stops of every vehicle journey of the service in the revision, one row
+    for each operating day of the journey
+    """
+    return (
+        Service.objects.filter(
+            revision_id=revision_id,
+            service_code=service_code,
+            service_patterns__service_pattern_stops__vehicle_journey__id=F(
+                "service_patterns__service_pattern_vehicle_journey__id"
+            ),
+        )
+        .annotate(
+            service_code_s=F("service_code"),
+            revision_id_s=F("revision_id"),
+            service_name_s=F("name"),
+            start_date_s=F("start_date"),
+            end_date_s=F("end_date"),
+            origin=F("service_patterns__origin"),
+            destination=F("service_patterns__destination"),
+            journey_description=F("service_patterns__description"),
+            line_name=F("service_patterns__line_name"),
+            stop_sequence=F("service_patterns__service_pattern_stops__sequence_number"),
+            departure_time=F("service_patterns__service_pattern_stops__departure_time"),
+            is_timing_point=F(
+                "service_patterns__service_pattern_stops__is_timing_point"
+            ),
+            common_name=Coalesce(
+                "service_patterns__service_pattern_stops__naptan_stop__common_name",
+                "service_patterns__service_pattern_stops__txc_common_name",
+                output_field=CharField(),
+            ),
+            atco_code=F(
+                "service_patterns__service_pattern_stops__atco_code",
+            ),
+            direction=F("service_patterns__service_pattern_vehicle_journey__direction"),
+            vehicle_journey_code=F(
+                "service_patterns__service_pattern_vehicle_journey__journey_code"
+            ),
+            line_ref=F("service_patterns__service_pattern_vehicle_journey__line_ref"),
+            start_time=F(
+                "service_patterns__service_pattern_vehicle_journey__start_time"
+            ),
+            departure_day_shift=F(
+                "service_patterns__service_pattern_vehicle_journey__departure_day_shift"
+            ),
+            day_of_week=F(
+                "service_patterns__service_pattern_vehicle_journey__operating_profiles__day_of_week"
+            ),
+            vehicle_journey_id=F(
+                "service_patterns__service_pattern_vehicle_journey__id"
+            ),
+            public_use=F("txcfileattributes__public_use"),
+            revision_number=F("txcfileattributes__revision_number"),
+            operating_period_start_date=F(
+                "txcfileattributes__operating_period_start_date"
+            ),
+            street=F("service_patterns__service_pattern_stops__naptan_stop__street"),
+            indicator=F(
+                "service_patterns__service_pattern_stops__naptan_stop__indicator"
+            ),
+            stop_type=F(
+                "service_patterns__service_pattern_stops__naptan_stop__stop_type"
+            ),
+            service_pattern_stop_id=F("service_patterns__service_pattern_stops__id"),
+        )
+        .values(*columns)
+    )
+
+
+def get_df_stop_details(service_pattern_stop_ids) -> pd.DataFrame:
+    """
+    Get the current NaPTAN details of the service pattern stops
+    """
+    qs = (
+        ServicePatternStop.objects.filter(id__in=service_pattern_stop_ids)
+        .order_by()
+        .values(
+            service_pattern_stop_id=F("id"),
+            common_name=Coalesce(
+                "naptan_stop__common_name", "txc_common_name", output_field=CharField()
+            ),
+            street=F("naptan_stop__street"),
+            indicator=F("naptan_stop__indicator"),
+            stop_type=F("naptan_stop__stop_type"),
+        )
+    )
+    return pd.DataFrame.from_records(
+        qs, columns=["service_pattern_stop_id"] + STOP_DETAIL_COLUMNS
+    )
+
+
+def encode_value(value):
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return value
+
+
+def decode_values(column: str, values: List) -> List:
+    if column in DATE_COLUMNS:
+        return [
+            None if value is None else date.fromisoformat(value) for value in values
+        ]
+    if column in TIME_COLUMNS:
+        return [
+            None if value is None else time.fromisoformat(value) for value in values
+        ]
+    return values
+
+
+def encode_rows(rows: List[Dict], columns: List[str]) -> Dict:
+    """
+    Encode the rows column by column as the distinct values of the column and the
+    index of each row's value in them, packed as base64 encoded int32s
+    """
+    data = {}
+    for column in columns:
+        values = {}
+        codes = np.fromiter(
+            (values.setdefault(encode_value(row[column]), len(values)) for row in rows),
+            dtype="<i4",
+            count=len(rows),
+        )
+        data[column] = {
+            "values": list(values),
+            "codes": base64.b64encode(codes.tobytes()).decode("ascii"),
+        }
+    return data
+
+
+def decode_rows(data: Dict) -> pd.DataFrame:
+    """
+    Decode rows encoded by encode_rows, the columns get the dtypes
+    DataFrame.from_records would give the rows
+    """
+    columns = {}
+    for column, encoded in data.items():
+        values = pd.Series(decode_values(column, encoded["values"])).to_numpy()
+        codes = np.frombuffer(base64.b64decode(encoded["codes"]), dtype="<i4")
+        columns[column] = values[codes]
+    return pd.DataFrame(columns)
+
+
+def get_timetable_visualiser_matrices(
+    revision_id: int, service_code: str
+) -> List[TimetableVisualiserMatrix]:
+    """
+    Get the rows of the service split by line and day of the week
+    """
+    partitions = defaultdict(list)
+    qs = get_qs_vehicle_journey_stops(revision_id, service_code, MATERIALISED_COLUMNS)
+    for row in qs.iterator(chunk_size=10000):
+        partitions[(row["line_name"], row["day_of_week"])].append(row)
+
+    matrices = []
+    for (line_name, day_of_week), rows in partitions.items():
+        files = {
+            (
+                row["revision_number"],
+                encode_value(row["operating_period_start_date"]),
+                row["public_use"],
+            )
+            for row in rows
+        }
+        matrices.append(
+            TimetableVisualiserMatrix(
+                revision_id=revision_id,
+                service_code=service_code,
+                line_name=line_name,
+                day_of_week=day_of_week,
+                files=[list(file_) for file_ in files],
+                data=encode_rows(rows, MATERIALISED_COLUMNS),
+            )
+        )
+    return matrices
+
+
+def materialise_timetable_visualiser(revision_id: int) -> int:
+    """
+    Materialise the timetable visualiser rows of every service in the revision,
+    replacing any materialised before. Returns the number of matrices created.
+    """
+    service_codes = (
+        Service.objects.filter(revision_id=revision_id)
+        .order_by("service_code")
+        .values_list("service_code", flat=True)
+        .distinct()
+    )
+    created = 0
+    with transaction.atomic():
+        TimetableVisualiserMatrix.objects.filter(revision_id=revision_id).delete()
+        for service_code in service_codes:
+            matrices = get_timetable_visualiser_matrices(revision_id, service_code)
+            TimetableVisualiserMatrix.objects.bulk_create(
+                matrices, batch_size=MATERIALISE_BATCH_SIZE
+            )
+            created += len(matrices)
+    # The revisions of the dataset published before this one are no longer live
+    prune_timetable_visualiser(
+        TimetableVisualiserMatrix.objects.filter(
+            revision__dataset_id__in=DatasetRevision.objects.filter(
+                id=revision_id
+            ).values("dataset_id")
+        ).exclude(revision_id=revision_id)
+    )
+    return created
+
+
+def prune_timetable_visualiser(matrices: Optional[QuerySet] = None) -> int:
+    """
+    Delete the matrices, of every revision by default, of the revisions that are
+    no longer live. Returns the number of matrices deleted. Timetables of
+    revisions without matrices are queried live.
+    """
+    if matrices is None:
+        matrices = TimetableVisualiserMatrix.objects.all()
+    deleted, _ = matrices.filter(revision__live_revision_dataset__isnull=True).delete()
+    return deleted
+
 
 class TimetableVisualiser:
     """
@@ -55,121 +325,17 @@ class TimetableVisualiser:
         self._day_of_week = target_date.strftime("%A")
         self._check_public_use_flag = public_use_check_flag
 
-    def get_qs_service_vehicle_journeys(self) -> pd.DataFrame:
+    def get_qs_service_vehicle_journeys(self) -> QuerySet:
         """
         Get the dataframe of vehicle journey for the service with respect to service code, revision
         and line name
         """
-
-        columns = [
-            "service_code",
-            "revision_id",
-            "name",
-            "start_date",
-            "end_date",
-            "origin",
-            "destination",
-            "journey_description",
-            "line_name",
-            "stop_sequence",
-            "departure_time",
-            "is_timing_point",
-            "common_name",
-            "direction",
-            "vehicle_journey_code",
-            "line_ref",
-            "departure_day_shift",
-            "day_of_week",
-            "vehicle_journey_id",
-            "atco_code",
-            "public_use",
-            "revision_number",
-            "start_time",
-            "street",
-            "indicator",
-            "service_pattern_stop_id",
-            "stop_type",
-        ]
-
-        qs_vehicle_journeys = (
-            Service.objects.filter(
-                revision_id=self._revision_id,
-                service_code=self._service_code,
-                service_patterns__service_pattern_stops__vehicle_journey__id=F(
-                    "service_patterns__service_pattern_vehicle_journey__id"
-                ),
-            )
-            .filter(
-                Q(txcfileattributes__operating_period_start_date__lte=self._target_date)
-            )
-            .annotate(
-                service_code_s=F("service_code"),
-                revision_id_s=F("revision_id"),
-                service_name_s=F("name"),
-                start_date_s=F("start_date"),
-                end_date_s=F("end_date"),
-                origin=F("service_patterns__origin"),
-                destination=F("service_patterns__destination"),
-                journey_description=F("service_patterns__description"),
-                line_name=F("service_patterns__line_name"),
-                stop_sequence=F(
-                    "service_patterns__service_pattern_stops__sequence_number"
-                ),
-                departure_time=F(
-                    "service_patterns__service_pattern_stops__departure_time"
-                ),
-                is_timing_point=F(
-                    "service_patterns__service_pattern_stops__is_timing_point"
-                ),
-                common_name=Coalesce(
-                    "service_patterns__service_pattern_stops__naptan_stop__common_name",
-                    "service_patterns__service_pattern_stops__txc_common_name",
-                    output_field=CharField(),
-                ),
-                atco_code=F(
-                    "service_patterns__service_pattern_stops__atco_code",
-                ),
-                direction=F(
-                    "service_patterns__service_pattern_vehicle_journey__direction"
-                ),
-                vehicle_journey_code=F(
-                    "service_patterns__service_pattern_vehicle_journey__journey_code"
-                ),
-                line_ref=F(
-                    "service_patterns__service_pattern_vehicle_journey__line_ref"
-                ),
-                start_time=F(
-                    "service_patterns__service_pattern_vehicle_journey__start_time"
-                ),
-                departure_day_shift=F(
-                    "service_patterns__service_pattern_vehicle_journey__departure_day_shift"
-                ),
-                day_of_week=F(
-                    "service_patterns__service_pattern_vehicle_journey__operating_profiles__day_of_week"
-                ),
-                vehicle_journey_id=F(
-                    "service_patterns__service_pattern_vehicle_journey__id"
-                ),
-                public_use=F("txcfileattributes__public_use"),
-                revision_number=F("txcfileattributes__revision_number"),
-                street=F(
-                    "service_patterns__service_pattern_stops__naptan_stop__street"
-                ),
-                indicator=F(
-                    "service_patterns__service_pattern_stops__naptan_stop__indicator"
-                ),
-                stop_type=F(
-                    "service_patterns__service_pattern_stops__naptan_stop__stop_type"
-                ),
-                service_pattern_stop_id=F(
-                    "service_patterns__service_pattern_stops__id"
-                ),
-            )
-            .values(*columns)
+        return get_qs_vehicle_journey_stops(
+            self._revision_id, self._service_code
+        ).filter(
+            Q(txcfileattributes__operating_period_start_date__lte=self._target_date)
         )
 
-        return qs_vehicle_journeys
-
     def get_df_op_exceptions_vehicle_journey(
         self, vehicle_journey_ids: set
     ) -> pd.DataFrame:
@@ -286,14 +452,11 @@ class TimetableVisualiser:
         observation_contents = observation_contents_mapper(requested_observations)
         return observation_contents, df
 
-    def get_timetable_visualiser(self) -> pd.DataFrame:
+    def get_df_live_vehicle_journeys(self) -> pd.DataFrame:
         """
-        Get the timetable visualiser for the specific service code, revision id,
-        line name and the date
+        Get the dataframe of vehicle journey for the line from the latest file
+        operating on the target date by querying the service
         """
-
-        # Create the dataframes from the service, serviced organisation, operating/non-operating exceptions
-
         base_qs_vehicle_journeys = self.get_qs_service_vehicle_journeys()
         if self._check_public_use_flag:
             base_qs_vehicle_journeys = base_qs_vehicle_journeys.filter(
@@ -302,6 +465,100 @@ class TimetableVisualiser:
         df_initial_vehicle_journeys = pd.DataFrame.from_records(
             base_qs_vehicle_journeys
         )
+        if df_initial_vehicle_journeys.empty:
+            return df_initial_vehicle_journeys
+
+        df_initial_vehicle_journeys = fill_missing_journey_codes(
+            df_initial_vehicle_journeys
+        )
+
+        max_revision_number = df_initial_vehicle_journeys["revision_number"].max()
+        return get_initial_vehicle_journeys_df(
+            df_initial_vehicle_journeys,
+            self._line_name,
+            self._target_date,
+            max_revision_number,
+        )
+
+    def is_file_operating(self, file_: List) -> bool:
+        """
+        Check if a materialised file is running on the target date
+        """
+        _, operating_period_start_date, public_use = file_
+        if operating_period_start_date is None:
+            return False
+        if self._check_public_use_flag and not public_use:
+            return False
+        return date.fromisoformat(operating_period_start_date) <= self._target_date
+
+    def get_df_materialised_vehicle_journeys(self) -> Optional[pd.DataFrame]:
+        """
+        Get the dataframe of vehicle journey for the line from the latest file
+        operating on the target date from the matrices materialised on publishing.
+        The matrices of every day of the week are loaded, as the live query does,
+        so that the directions and their descriptions come from the same rows.
+        Returns None if the revision has not been materialised.
+        """
+        matrices = list(
+            TimetableVisualiserMatrix.objects.filter(
+                revision_id=self._revision_id, service_code=self._service_code
+            ).defer("data")
+        )
+        if not matrices:
+            return None
+
+        revision_numbers = [
+            file_[0]
+            for matrix in matrices
+            for file_ in matrix.files
+            if file_[0] is not None and self.is_file_operating(file_)
+        ]
+        matrix_ids = [
+            matrix.id for matrix in matrices if matrix.line_name == self._line_name
+        ]
+        if not revision_numbers or not matrix_ids:
+            return pd.DataFrame()
+
+        df = pd.concat(
+            [
+                decode_rows(data)
+                for data in TimetableVisualiserMatrix.objects.filter(id__in=matrix_ids)
+                .order_by("id")
+                .values_list("data", flat=True)
+            ],
+            ignore_index=True,
+        )
+        operating = df["operating_period_start_date"].notna() & (
+            df["operating_period_start_date"] <= self._target_date
+        )
+        if self._check_public_use_flag:
+            operating &= df["public_use"] == True  # noqa: E712
+        df = df[operating].drop(columns=["operating_period_start_date"])
+        if df.empty:
+            return df
+
+        df = df.merge(
+            get_df_stop_details(df["service_pattern_stop_id"].unique().tolist()),
+            how="left",
+            on="service_pattern_stop_id",
+        )[VEHICLE_JOURNEY_COLUMNS]
+
+        df = fill_missing_journey_codes(df)
+        return get_initial_vehicle_journeys_df(
+            df, self._line_name, self._target_date, max(revision_numbers)
+        )
+
+    def get_timetable_visualiser(self) -> pd.DataFrame:
+        """
+        Get the timetable visualiser for the specific service code, revision id,
+        line name and the date
+        """
+
+        # Create the dataframes from the service, serviced organisation, operating/non-operating exceptions
+
+        df_initial_vehicle_journeys = self.get_df_materialised_vehicle_journeys()
+        if df_initial_vehicle_journeys is None:
+            df_initial_vehicle_journeys = self.get_df_live_vehicle_journeys()
 
         if df_initial_vehicle_journeys.empty:
             return {
@@ -317,17 +574,6 @@ class TimetableVisualiser:
                 },
             }
 
-        df_initial_vehicle_journeys = fill_missing_journey_codes(
-            df_initial_vehicle_journeys
-        )
-
-        max_revision_number = df_initial_vehicle_journeys["revision_number"].max()
-        df_initial_vehicle_journeys = get_initial_vehicle_journeys_df(
-            df_initial_vehicle_journeys,
-            self._line_name,
-            self._target_date,
-            max_revision_number,
-        )
         base_vehicle_journey_ids = (
             df_initial_vehicle_journeys["vehicle_journey_id"].unique().tolist()
         )
@@ -357,9 +603,11 @@ class TimetableVisualiser:
                     "stops": {},
                 }
                 continue
-            journey_description = (
-                df_base_vehicle_journeys["journey_description"].unique().tolist()[0]
-            )
+            # The rows are not ordered, the description of the first journey is
+            # taken so that it does not depend on the order they were read in
+            journey_description = df_base_vehicle_journeys.sort_values(
+                ["vehicle_journey_id", "stop_sequence"], kind="stable"
+            )["journey_description"].iloc[0]
             # Get the list of operating and non-operating vehicle journey in the exception table
             (
                 op_exception_vj_ids,
@@ -4,14 +4,15 @@ from typing import Dict, List, Optional, Tuple
 import pandas as pd
 from django.db.models import Subquery
 from django.db.models.functions import Trim
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.views import View
 from django.shortcuts import get_object_or_404
 from waffle import flag_is_active
 
 from transit_odp.avl.require_attention.abods.registery import AbodsRegistery
 from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
-    get_vehicle_activity_operatorref_linename,
+    VehicleActivityErrors,
+    get_vehicle_activity_errors,
 )
 from transit_odp.browse.common import (
     LTACSVHelper,
@@ -446,8 +447,9 @@ class LocalAuthorityComplianceReportView(View):
             csv_export = LTAComplianceReportDBCSV(lta_objs)
         else:
             csv_export = LTAComplianceReportCSV(lta_objs)
-        file_ = csv_export.to_string()
-        response = HttpResponse(file_, content_type="text/csv")
+        response = StreamingHttpResponse(
+            csv_export.to_chunks(), content_type="text/csv"
+        )
         response["Content-Disposition"] = f"attachment; filename={csv_filename}"
         return response
 
@@ -476,8 +478,9 @@ class LocalAuthorityExportView(View):
         )
 
         csv_export = LTACSV(lta_objs)
-        file_ = csv_export.to_string()
-        response = HttpResponse(file_, content_type="text/csv")
+        response = StreamingHttpResponse(
+            csv_export.to_chunks(), content_type="text/csv"
+        )
         response["Content-Disposition"] = f"attachment; filename={csv_filename}"
         return response
 
@@ -504,8 +507,9 @@ class LocalAuthorityLineLevelExportView(View):
         csv_filename = f"{updated_ui_lta_name}_detailed line level service code export detailed export.csv"
 
         csv_export = LTALineLevelCSV(lta_objs)
-        file_ = csv_export.to_string()
-        response = HttpResponse(file_, content_type="text/csv")
+        response = StreamingHttpResponse(
+            csv_export.to_chunks(), content_type="text/csv"
+        )
         response["Content-Disposition"] = f"attachment; filename={csv_filename}"
         return response
 
@@ -702,7 +706,7 @@ class LTAComplianceReportCSV(CSVBuilder, LTACSVHelper):
         self,
         operator_ref: Optional[str],
         line_name: str,
-        uncounted_activity_df: pd.DataFrame,
+        vehicle_activity_errors: VehicleActivityErrors,
     ) -> str:
         """
         Returns value for 'Error in AVL to Timetable Matching' column.
@@ -715,14 +719,7 @@ class LTAComplianceReportCSV(CSVBuilder, LTACSVHelper):
             str: Yes or No for 'Error in AVL to Timetable Matching' column
         """
 
-        if not uncounted_activity_df.loc[
-            (uncounted_activity_df["OperatorRef"] == operator_ref)
-            & (
-                uncounted_activity_df["LineRef"].isin(
-                    [line_name, line_name.replace(" ", "_")]
-                )
-            )
-        ].empty:
+        if vehicle_activity_errors.has_errors(operator_ref, line_name):
             return "Yes"
         return "No"
 
@@ -856,7 +853,7 @@ class LTAComplianceReportCSV(CSVBuilder, LTACSVHelper):
         otc_map = get_line_level_otc_map_lta(lta_list)
 
         txcfa_map = get_line_level_txc_map_lta(lta_list)
-        uncounted_activity_df = get_vehicle_activity_operatorref_linename()
+        vehicle_activity_errors = get_vehicle_activity_errors()
         dq_require_attention_active = flag_is_active(
             "", FeatureFlags.DQS_REQUIRE_ATTENTION.value
         )
@@ -969,7 +966,7 @@ class LTAComplianceReportCSV(CSVBuilder, LTACSVHelper):
                     self.get_error_in_avl_to_timetable_matching(
                         file_attribute.national_operator_code,
                         service_number,
-                        uncounted_activity_df,
+                        vehicle_activity_errors,
                     )
                 )
                 if fares_require_attention_active:
@@ -1016,7 +1013,7 @@ class LTAComplianceReportCSV(CSVBuilder, LTACSVHelper):
                 )
                 error_in_avl_to_timetable_matching = (
                     self.get_error_in_avl_to_timetable_matching(
-                        "", service_number, uncounted_activity_df
+                        "", service_number, vehicle_activity_errors
                     )
                 )
 
@@ -18,7 +18,8 @@ from transit_odp.avl.post_publishing_checks.constants import NO_PPC_DATA
 from transit_odp.avl.proxies import AVLDataset
 from transit_odp.avl.require_attention.abods.registery import AbodsRegistery
 from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
-    get_vehicle_activity_operatorref_linename,
+    VehicleActivityErrors,
+    get_vehicle_activity_errors,
 )
 from transit_odp.browse.common import (
     get_franchise_licences,
@@ -523,11 +524,11 @@ class LicenceDetailView(BaseDetailView):
             self.fares_require_attention_df = get_fares_dataset_map(self.txc_map)
 
         self.synced_in_last_month = []
-        self.uncounted_activity_df = pd.DataFrame(columns=["OperatorRef", "LineRef"])
+        self.vehicle_activity_errors = VehicleActivityErrors(frozenset())
         if self.is_avl_ra_active:
             abods_registry = AbodsRegistery()
             self.synced_in_last_month = abods_registry.records()
-            self.uncounted_activity_df = get_vehicle_activity_operatorref_linename()
+            self.vehicle_activity_errors = get_vehicle_activity_errors()
 
         for service in self.otc_map:
             service["registration_number"] = service["registration_number"].replace(
@@ -673,14 +674,7 @@ class LicenceDetailView(BaseDetailView):
 
         line_name = self.service.get("service_number")
         if (
-            not self.uncounted_activity_df.loc[
-                (self.uncounted_activity_df["OperatorRef"] == self.operator_ref)
-                & (
-                    self.uncounted_activity_df["LineRef"].isin(
-                        [line_name, line_name.replace(" ", "_")]
-                    )
-                )
-            ].empty
+            self.vehicle_activity_errors.has_errors(self.operator_ref, line_name)
             or f"{line_name}__{self.operator_ref}" not in self.synced_in_last_month
         ):
             return False
@@ -1382,7 +1376,7 @@ class LicenceLineMetadataDetailView(DetailView):
         Get the AVL data for the Dataset
         """
 
-        uncounted_activity_df = get_vehicle_activity_operatorref_linename()
+        vehicle_activity_errors = get_vehicle_activity_errors()
         abods_registry = AbodsRegistery()
         synced_in_last_month = abods_registry.records()
 
@@ -1391,7 +1385,7 @@ class LicenceLineMetadataDetailView(DetailView):
             noc = file.national_operator_code
             if is_avl_compliant:
                 is_avl_compliant = not is_avl_requires_attention(
-                    noc, line_name, synced_in_last_month, uncounted_activity_df
+                    noc, line_name, synced_in_last_month, vehicle_activity_errors
                 )
             else:
                 break
@@ -26,7 +26,7 @@ from waffle import flag_is_active
 import config.hosts
 from transit_odp.avl.require_attention.abods.registery import AbodsRegistery
 from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
-    get_vehicle_activity_operatorref_linename,
+    get_vehicle_activity_errors,
 )
 from transit_odp.browse.cfn import generate_signed_url
 from transit_odp.browse.constants import LICENCE_NUMBER_NOT_SUPPLIED_MESSAGE
@@ -552,7 +552,7 @@ class LineMetadataDetailView(DetailView):
         Get the AVL data for the Dataset
         """
 
-        uncounted_activity_df = get_vehicle_activity_operatorref_linename()
+        vehicle_activity_errors = get_vehicle_activity_errors()
         abods_registry = AbodsRegistery()
         synced_in_last_month = abods_registry.records()
 
@@ -561,7 +561,7 @@ class LineMetadataDetailView(DetailView):
             noc = file.national_operator_code
             if is_avl_compliant:
                 is_avl_compliant = not is_avl_requires_attention(
-                    noc, line_name, synced_in_last_month, uncounted_activity_df
+                    noc, line_name, synced_in_last_month, vehicle_activity_errors
                 )
             else:
                 break
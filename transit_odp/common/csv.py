@@ -5,7 +5,10 @@ import os
 import tempfile
 from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Union
+from typing import Iterator, Union
+from zipfile import ZipFile
+
+from django.db.models import QuerySet
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,8 @@ class CSVColumn:
 class CSVBuilder:
     columns = None
     queryset = None
+    # Number of rows fetched from the database and written per chunk when streaming
+    chunk_size = 2000
 
     def count(self):
         if self.queryset is None:
@@ -100,3 +105,53 @@ class CSVBuilder:
         logger.info(prefix + f"Final file size of {size} bytes.")
         csvfile.seek(0)
         return csvfile
+
+    def to_chunks(self) -> Iterator[bytes]:
+        """
+        Creates the csv as an iterator of utf-8 encoded chunks of `chunk_size` rows.
+
+        Querysets are fetched `chunk_size` rows at a time, so neither the rows nor
+        the csv are held in memory in full. The queryset is created before the
+        iterator is returned, e.g. for a StreamingHttpResponse.
+        """
+        if self.queryset is None:
+            self.queryset = self.get_queryset()
+        return self._iter_chunks()
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        classname = self.__class__.__name__
+        prefix = f"CSVExporter - to_chunks - {classname} - "
+
+        if isinstance(self.queryset, QuerySet):
+            objects = self.queryset.iterator(chunk_size=self.chunk_size)
+        else:
+            objects = iter(self.queryset)
+
+        csvfile = io.StringIO()
+        writer = csv.writer(csvfile, quoting=csv.QUOTE_ALL)
+        writer.writerow([column.header for column in self.columns])
+
+        row_count = 0
+        size = 0
+        for row_count, obj in enumerate(objects, start=1):
+            writer.writerow(self._create_row(obj))
+            if row_count % self.chunk_size == 0:
+                chunk = csvfile.getvalue().encode("utf-8")
+                size += len(chunk)
+                yield chunk
+                csvfile.seek(0)
+                csvfile.truncate()
+
+        chunk = csvfile.getvalue().encode("utf-8")
+        size += len(chunk)
+        yield chunk
+        logger.info(prefix + f"Streamed {row_count} rows, {size} bytes.")
+
+    def to_zip(self, zf: ZipFile, name: str) -> None:
+        """
+        Writes the csv to the member `name` of `zf` a chunk at a time.
+        """
+        # The size is not known up front, zip64 allows more than 2GiB
+        with zf.open(name, "w", force_zip64=True) as f:
+            for chunk in self.to_chunks():
+                f.write(chunk)
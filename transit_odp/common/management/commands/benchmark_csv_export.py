@@ -0,0 +1,87 @@
+import datetime
+import tempfile
+import time
+from types import SimpleNamespace
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from django.core.management.base import BaseCommand
+
+from transit_odp.common.csv import CSVBuilder, CSVColumn
+from transit_odp.common.utils.profiling import get_peak_memory_mb
+
+
+class ExampleRequestCSV(CSVBuilder):
+    """A CSV shaped like the raw API metrics export, over generated rows."""
+
+    columns = [
+        CSVColumn(header="id", accessor="id"),
+        CSVColumn(header="requestor", accessor="requestor_id"),
+        CSVColumn(header="Consumer Name", accessor="requestor_full_name"),
+        CSVColumn(header="Consumer Email", accessor="email"),
+        CSVColumn(header="path_info", accessor="path_info"),
+        CSVColumn(header="query_string", accessor="query_string"),
+        CSVColumn(header="created", accessor="created"),
+    ]
+
+    def __init__(self, rows: int):
+        self.rows = rows
+
+    def get_queryset(self):
+        created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        # A generator, so the rows are only held in memory if the export keeps them
+        return (
+            SimpleNamespace(
+                id=index,
+                requestor_id=index % 1000,
+                requestor_full_name=f"Consumer {index % 1000}",
+                email=f"consumer{index % 1000}@example.com",
+                path_info="/api/v1/dataset/",
+                query_string=f"noc=NOC{index % 500}&status=published",
+                created=created + datetime.timedelta(seconds=index),
+            )
+            for index in range(self.rows)
+        )
+
+
+def export_string(builder: CSVBuilder, zf: ZipFile):
+    zf.writestr("export.csv", builder.to_string())
+
+
+def export_stream(builder: CSVBuilder, zf: ZipFile):
+    builder.to_zip(zf, "export.csv")
+
+
+MODES = {"string": export_string, "stream": export_stream}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the peak memory of zipping a CSV export built as a string "
+        "and streamed in chunks. Run each mode in its own process, the peak "
+        "memory is that of the whole process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("mode", choices=MODES.keys())
+        parser.add_argument(
+            "--rows", type=int, default=1_000_000, help="The number of rows"
+        )
+
+    def handle(self, *args, **options):
+        export = MODES[options["mode"]]
+        builder = ExampleRequestCSV(options["rows"])
+
+        peak_before = get_peak_memory_mb()
+        start = time.perf_counter()
+        with tempfile.TemporaryFile() as file_:
+            with ZipFile(file_, mode="w", compression=ZIP_DEFLATED) as zf:
+                export(builder, zf)
+            size = file_.tell()
+        elapsed = time.perf_counter() - start
+        peak_after = get_peak_memory_mb()
+
+        self.stdout.write(
+            f"{options['mode']}: {options['rows']} rows, {size} byte zip in "
+            f"{elapsed:.2f}s, peak memory {peak_after:.1f} MiB "
+            f"(+{peak_after - peak_before:.1f} MiB)"
+        )
@@ -1,8 +1,18 @@
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
 from django.utils.deprecation import MiddlewareMixin
 
 from transit_odp.common.utils import remove_query_string_param
 from transit_odp.site_admin.models import CHAR_LEN, APIRequest
 
+logger = logging.getLogger(__name__)
+
 
 class DefaultHostMiddleware:
     """Updates settings.DEFAULT_HOST to that of incoming request.
@@ -29,8 +39,109 @@ class DefaultHostMiddleware:
             settings.DEFAULT_HOST = current_default
 
 
+class APIRequestBuffer:
+    """Buffers APIRequest records in the worker and saves them in batches.
+
+    Records are saved with `bulk_create` once `batch_size` of them are queued or,
+    if `flush_interval` is set, by a background thread every `flush_interval`
+    seconds. Without a `flush_interval` a full batch is saved by the request that
+    fills it. Whatever is queued when the worker exits is saved at exit.
+
+    At most `max_size` records are queued; any more are dropped, as are the
+    records of a batch that fails to save. `flushed` and `dropped` count them.
+    """
+
+    def __init__(self, batch_size: int, flush_interval=None, max_size: int = 10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.flushed = 0
+        self.dropped = 0
+        self._records = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: APIRequest) -> None:
+        self._start()
+        with self._lock:
+            if len(self._records) >= self.max_size:
+                self.dropped += 1
+                return
+            self._records.append(record)
+            is_full = len(self._records) >= self.batch_size
+
+        if is_full:
+            if self.flush_interval:
+                self._wakeup.set()
+            else:
+                self.flush()
+
+    def flush(self) -> int:
+        """Saves the queued records and returns how many were saved."""
+        flushed = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [
+                        self._records.popleft()
+                        for _ in range(min(self.batch_size, len(self._records)))
+                    ]
+                if not batch:
+                    return flushed
+
+                try:
+                    APIRequest.objects.bulk_create(batch)
+                except Exception:
+                    logger.exception(f"Unable to save {len(batch)} API requests")
+                    with self._lock:
+                        self.dropped += len(batch)
+                else:
+                    flushed += len(batch)
+                    with self._lock:
+                        self.flushed += len(batch)
+
+    def _start(self) -> None:
+        # Workers may be forked from a parent that has already started the buffer
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self._records.clear()
+            atexit.register(self.flush)
+            if self.flush_interval:
+                threading.Thread(
+                    target=self._run, name="api-request-buffer", daemon=True
+                ).start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+
+api_request_buffer = APIRequestBuffer(
+    batch_size=settings.API_REQUEST_LOG_BATCH_SIZE,
+    flush_interval=settings.API_REQUEST_LOG_FLUSH_INTERVAL,
+    max_size=settings.API_REQUEST_LOG_MAX_SIZE,
+)
+
+
 class APILoggerMiddleware:
-    """Logs any incoming requests to the BODS API in the APIRequest model."""
+    """Logs any incoming requests to the BODS API in the APIRequest model.
+
+    The requests are buffered by `api_request_buffer` rather than saved while
+    the response is returned.
+    """
 
     def __init__(self, get_response):
         self.get_response = get_response
@@ -52,8 +163,12 @@ class APILoggerMiddleware:
             path_info = path_info[:CHAR_LEN]
             query_string = query_string[:CHAR_LEN]
 
-            APIRequest.objects.create(
-                requestor=user, path_info=path_info, query_string=query_string
+            api_request_buffer.add(
+                APIRequest(
+                    requestor_id=user.id,
+                    path_info=path_info,
+                    query_string=query_string,
+                )
             )
 
         return response
@@ -0,0 +1,51 @@
+import datetime
+import io
+from types import SimpleNamespace
+from zipfile import ZipFile
+
+from transit_odp.common.csv import CSVBuilder, CSVColumn
+
+
+class ExampleCSV(CSVBuilder):
+    chunk_size = 2
+    columns = [
+        CSVColumn(header="id", accessor="id"),
+        CSVColumn(header="name", accessor=lambda obj: obj.name.upper()),
+        CSVColumn(header="created", accessor="created"),
+    ]
+
+    def __init__(self, count):
+        self._count = count
+
+    def get_queryset(self):
+        return [
+            SimpleNamespace(
+                id=index, name=f"name, {index}", created=datetime.date(2024, 1, 1)
+            )
+            for index in range(self._count)
+        ]
+
+
+def test_to_chunks_matches_to_string():
+    chunks = list(ExampleCSV(5).to_chunks())
+
+    assert len(chunks) == 3
+    assert b"".join(chunks).decode("utf-8") == ExampleCSV(5).to_string()
+
+
+def test_to_chunks_without_rows():
+    chunks = list(ExampleCSV(0).to_chunks())
+
+    assert chunks == [b'"id","name","created"\r\n']
+
+
+def test_to_zip():
+    buffer_ = io.BytesIO()
+    with ZipFile(buffer_, mode="w") as zf:
+        ExampleCSV(3).to_zip(zf, "example.csv")
+
+    with ZipFile(buffer_) as zf:
+        content = zf.read("example.csv").decode("utf-8")
+
+    assert content == ExampleCSV(3).to_string()
+    assert '"1","NAME, 1","2024-01-01"' in content
@@ -1,10 +1,12 @@
 from random import choices
 from string import ascii_letters
+from unittest.mock import patch
 
 import pytest
 from django_hosts.resolvers import reverse
 
 import config
+from transit_odp.common.middleware import APIRequestBuffer
 from transit_odp.site_admin.models import CHAR_LEN, APIRequest
 from transit_odp.users.factories import UserFactory
 
@@ -99,6 +101,46 @@ def test_api_request_middleware_remove_api_key(client_factory):
     assert request.query_string == "noc=BLAH&status=active"
 
 
+def test_api_request_buffer_saves_full_batches():
+    user = UserFactory()
+    buffer = APIRequestBuffer(batch_size=2)
+
+    buffer.add(APIRequest(requestor=user, path_info="/api/v1/1/", query_string=""))
+    assert APIRequest.objects.count() == 0
+    assert len(buffer) == 1
+
+    buffer.add(APIRequest(requestor=user, path_info="/api/v1/2/", query_string=""))
+    assert APIRequest.objects.count() == 2
+    assert len(buffer) == 0
+    assert buffer.flushed == 2
+
+
+def test_api_request_buffer_drops_records_when_full():
+    user = UserFactory()
+    buffer = APIRequestBuffer(batch_size=10, max_size=2)
+
+    for _ in range(3):
+        buffer.add(APIRequest(requestor=user, path_info="/api/v1/", query_string=""))
+    assert buffer.dropped == 1
+
+    assert buffer.flush() == 2
+    assert APIRequest.objects.count() == 2
+    assert buffer.flushed == 2
+
+
+def test_api_request_buffer_counts_failed_batches_as_dropped():
+    user = UserFactory()
+    buffer = APIRequestBuffer(batch_size=10)
+    buffer.add(APIRequest(requestor=user, path_info="/api/v1/", query_string=""))
+
+    with patch.object(APIRequest.objects, "bulk_create", side_effect=Exception):
+        assert buffer.flush() == 0
+
+    assert buffer.dropped == 1
+    assert buffer.flushed == 0
+    assert len(buffer) == 0
+
+
 def test_security_headers(client_factory):
     host = config.hosts.DATA_HOST
     url = reverse("home", host=host)
@@ -0,0 +1,38 @@
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from logging import Logger
+
+
+def get_peak_memory_mb() -> float:
+    """Returns the peak resident memory of the current process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes everywhere else
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+@contextmanager
+def log_time_and_memory(logger: Logger, operation: str):
+    """Logs how long `operation` took and the peak memory of the process after it.
+
+    The peak is that of the whole process, so the increase it reports is how much
+    `operation` raised the high-water mark, not how much memory it allocated.
+
+    Example:
+        with log_time_and_memory(logger, "Archiving SIRI-VM"):
+            archiver.archive()
+    """
+    peak_before = get_peak_memory_mb()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        peak_after = get_peak_memory_mb()
+        logger.info(
+            f"{operation} took {elapsed:.2f} seconds, peak memory "
+            f"{peak_after:.1f} MiB (+{peak_after - peak_before:.1f} MiB)."
+        )
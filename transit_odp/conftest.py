@@ -2,6 +2,7 @@ from datetime import timedelta
 
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from django.test import RequestFactory
 from django.test.client import Client
 from django.utils.timezone import localtime
@@ -10,6 +11,9 @@ from pytest_django.lazy_django import skip_if_no_django
 from pytest_factoryboy import register
 
 from config import hosts
+from transit_odp.avl.require_attention import weekly_ppc_zip_loader
+from transit_odp.avl.require_attention.abods import registery
+from transit_odp.naptan.cache import stop_area_map_cache
 from transit_odp.organisation.factories import OrganisationFactory
 from transit_odp.transmodel.factories import StopActivityFactory
 from transit_odp.transmodel.models import StopActivity
@@ -26,6 +30,25 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def clear_stop_area_map_cache():
+    # The map outlives the database of each test, so start every test without it
+    stop_area_map_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_abods_registry_cache():
+    # The ABODS lines are cached across requests, so start every test without them
+    cache.delete(registery.CACHE_KEY)
+
+
+@pytest.fixture(autouse=True)
+def clear_vehicle_activity_cache():
+    # The weekly PPC errors are held by the process, so start every test without them
+    cache.delete(weekly_ppc_zip_loader.CACHE_VERSION_KEY)
+    weekly_ppc_zip_loader.vehicle_activity_cache.clear()
+
+
 @pytest.fixture
 def request_factory() -> RequestFactory:
     return RequestFactory()
@@ -0,0 +1,76 @@
+import statistics
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from lxml import etree
+
+from transit_odp.data_quality.pti.validators import PTIValidator
+from transit_odp.timetables.pti import PTI_PATH
+
+
+def evaluate_strings(validator: PTIValidator, tree) -> int:
+    namespaces = validator.namespaces
+    evaluations = 0
+    for observation in validator.schema.observations:
+        for element in tree.xpath(observation.context, namespaces=namespaces):
+            for rule in observation.rules:
+                evaluations += 1
+                if not element.xpath(rule.test, namespaces=namespaces):
+                    break
+    return evaluations
+
+
+def evaluate_compiled(validator: PTIValidator, tree) -> int:
+    evaluations = 0
+    for observation in validator.schema.observations:
+        for element in validator.xpath(observation.context)(tree):
+            for rule in observation.rules:
+                evaluations += 1
+                if not validator.xpath(rule.test)(element):
+                    break
+    return evaluations
+
+
+MODES = {"string": evaluate_strings, "compiled": evaluate_compiled}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks evaluating the PTI schema against a TransXChange file with "
+        "XPath strings and with compiled XPath expressions"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path, help="The TransXChange file")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="The number of times to evaluate the schema in each mode",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        tree = etree.parse(str(path))
+        with PTI_PATH.open("r") as f:
+            validator = PTIValidator(f)
+
+        for mode, evaluate in MODES.items():
+            timings = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                evaluations = evaluate(validator, tree)
+                timings.append(time.perf_counter() - start)
+            self.stdout.write(
+                f"{mode}: {evaluations} rule evaluations, "
+                f"min {min(timings):.3f}s, mean {statistics.mean(timings):.3f}s"
+            )
+
+        start = time.perf_counter()
+        with path.open("rb") as f:
+            validator.is_valid(f, document=tree)
+        self.stdout.write(
+            f"is_valid: {len(validator.violations)} violations in "
+            f"{time.perf_counter() - start:.3f}s"
+        )
@@ -0,0 +1,62 @@
+import pytest
+from lxml import etree
+
+from transit_odp.data_quality.pti.factories import (
+    ObservationFactory,
+    RuleFactory,
+    SchemaFactory,
+)
+from transit_odp.data_quality.pti.tests.conftest import JSONFile, TXCFile
+from transit_odp.data_quality.pti.validators import PTIValidator, compile_xpath
+
+pytestmark = pytest.mark.django_db
+
+
+def test_observations_sharing_a_context_find_it_once(mocker):
+    txc = TXCFile(
+        """
+        <Notes>
+            <Note><NoteCode>N1</NoteCode></Note>
+            <Note><NoteCode>N2</NoteCode></Note>
+        </Notes>
+        """
+    )
+    notes = "//x:Notes/x:Note"
+    codes = "//x:Notes/x:Note/x:NoteCode"
+    schema = SchemaFactory(
+        observations=[
+            ObservationFactory(
+                number=1, context=notes, rules=[RuleFactory(test="false()")]
+            ),
+            ObservationFactory(
+                number=2, context=codes, rules=[RuleFactory(test="false()")]
+            ),
+            ObservationFactory(
+                number=3, context=notes, rules=[RuleFactory(test="false()")]
+            ),
+        ]
+    )
+    pti = PTIValidator(JSONFile(schema.json()))
+    xpath = mocker.spy(pti, "xpath")
+
+    is_valid = pti.is_valid(txc)
+
+    expressions = [call.args[0] for call in xpath.call_args_list]
+    assert not is_valid
+    assert expressions.count(notes) == 1
+    assert expressions.count(codes) == 1
+    assert [v.observation.number for v in pti.violations] == [1, 1, 2, 2, 3, 3]
+    assert [v.line for v in pti.violations[:2]] == [v.line for v in pti.violations[4:]]
+
+
+def test_compile_xpath_reuses_expressions_and_late_registered_functions():
+    namespaces = (("x", "http://www.transxchange.org.uk/"),)
+    compiled = compile_xpath("late_registered(.)", namespaces)
+    assert compile_xpath("late_registered(.)", namespaces) is compiled
+
+    functions = etree.FunctionNamespace(None)
+    functions["late_registered"] = lambda context, element: "resolved"
+    try:
+        assert compiled(etree.fromstring("<Note/>")) == "resolved"
+    finally:
+        del functions["late_registered"]
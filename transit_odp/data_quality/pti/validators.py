@@ -1,9 +1,10 @@
 import itertools
 import json
 from collections import defaultdict
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Tuple
 from urllib.parse import unquote
 
 from dateutil import parser
@@ -49,7 +50,7 @@ from transit_odp.data_quality.pti.functions import (
 )
 from transit_odp.data_quality.pti.models import Observation, Schema, Violation
 from transit_odp.data_quality.pti.models.txcmodels import Line, VehicleJourney
-from transit_odp.naptan.models import StopPoint
+from transit_odp.naptan.cache import get_stop_area_map
 from transit_odp.otc.models import Service
 from transit_odp.timetables.transxchange import TransXChangeElement
 
@@ -73,9 +74,7 @@ def has_destination_display(context, patterns):
 
 def get_lines_validator(context, lines: List[etree._Element]) -> bool:
     lines = lines[0]
-    stops = StopPoint.objects.exclude(stop_areas=[]).values("atco_code", "stop_areas")
-    stop_area_map = {stop["atco_code"]: stop["stop_areas"] for stop in stops}
-    validator = LinesValidator(lines, stop_area_map=stop_area_map)
+    validator = LinesValidator(lines, stop_area_map=get_stop_area_map())
     return validator.validate()
 
 
@@ -532,13 +531,27 @@ def get_service_code_validator() -> Callable:
     return validator.validate
 
 
+@lru_cache(maxsize=None)
+def compile_xpath(
+    expression: str, namespaces: Tuple[Tuple[str, str], ...]
+) -> etree.XPath:
+    """Returns `expression` compiled once per process.
+
+    Custom functions are looked up in lxml's default function namespace when the
+    expression is evaluated, so they need not be registered before compiling.
+    """
+    return etree.XPath(expression, namespaces=dict(namespaces))
+
+
 class PTIValidator:
     def __init__(self, source: JSONFile):
         json_ = json.load(source)
         self.schema = Schema(**json_)
 
         self.namespaces = self.schema.header.namespaces
+        self._namespaces_key = tuple(sorted(self.namespaces.items()))
         self.violations = []
+        self.compile_schema()
 
         self.fns = etree.FunctionNamespace(None)
         self.register_function("bool", cast_to_bool)
@@ -608,6 +621,16 @@ class PTIValidator:
     def register_function(self, key: str, function: Callable) -> None:
         self.fns[key] = function
 
+    def xpath(self, expression: str) -> etree.XPath:
+        return compile_xpath(expression, self._namespaces_key)
+
+    def compile_schema(self) -> None:
+        """Compiles the context and rules of every observation in the schema."""
+        for observation in self.schema.observations:
+            self.xpath(observation.context)
+            for rule in observation.rules:
+                self.xpath(rule.test)
+
     def add_violation(self, violation: Violation) -> None:
         self.violations.append(violation)
 
@@ -615,9 +638,9 @@ class PTIValidator:
         self, observation: Observation, element: etree._Element
     ) -> None:
         for rule in observation.rules:
-            result = element.xpath(rule.test, namespaces=self.namespaces)
+            result = self.xpath(rule.test)(element)
             if not result:
-                name = element.xpath("local-name(.)", namespaces=self.namespaces)
+                name = self.xpath("local-name(.)")(element)
                 violation = Violation(
                     line=element.sourceline,
                     name=name,
@@ -632,21 +655,18 @@ class PTIValidator:
         servie_classification_xpath = (
             "//x:Services/x:Service/x:ServiceClassification/x:Flexible"
         )
-        service_classification = document.xpath(
-            servie_classification_xpath, namespaces=self.namespaces
-        )
+        service_classification = self.xpath(servie_classification_xpath)(document)
 
         flexible_service_xpath = "//x:Services/x:Service/x:FlexibleService"
-        flexible_service = document.xpath(
-            flexible_service_xpath, namespaces=self.namespaces
-        )
+        flexible_service = self.xpath(flexible_service_xpath)(document)
 
         if service_classification or flexible_service:
             return FLEXIBLE_SERVICE
         return STANDARD_SERVICE
 
-    def is_valid(self, source: XMLFile) -> bool:
-        document = etree.parse(source)
+    def is_valid(self, source: XMLFile, document=None) -> bool:
+        if document is None:
+            document = etree.parse(source)
         txc_service_type = self.check_service_type(document)
 
         service_observations = []
@@ -656,8 +676,14 @@ class PTIValidator:
             if x.service_type == txc_service_type or x.service_type == "All"
         ]
         logger.info(f"Checking observations for the XML file {source.name}")
+        # Many observations share a context, so each node set is only found once.
+        # Observations are still checked in schema order to keep violations stable.
+        context_elements = {}
         for observation in service_observations:
-            elements = document.xpath(observation.context, namespaces=self.namespaces)
+            elements = context_elements.get(observation.context)
+            if elements is None:
+                elements = self.xpath(observation.context)(document)
+                context_elements[observation.context] = elements
             for element in elements:
                 self.check_observation(observation, element)
         logger.info(f"Completed observations for the XML file {source.name}")
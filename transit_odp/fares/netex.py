@@ -9,7 +9,7 @@ from transit_odp.common.xmlelements import XMLElement
 from transit_odp.data_quality.models import SchemaViolation
 from transit_odp.pipelines.constants import SchemaCategory
 from transit_odp.pipelines.models import SchemaDefinition
-from transit_odp.pipelines.pipelines.xml_schema import SchemaLoader
+from transit_odp.pipelines.pipelines.xml_schema import schema_cache
 from transit_odp.validate import XMLValidator
 
 _NETEX_NAMESPACE_PREFIX = "netex"
@@ -265,5 +265,4 @@ def get_netex_schema() -> etree.XMLSchema:
     Helper method to return netex scheme object
     """
     definition = SchemaDefinition.objects.get(category=SchemaCategory.NETEX)
-    schema_loader = SchemaLoader(definition, NETEX_XSD_PATH)
-    return schema_loader.schema
+    return schema_cache.get(definition, NETEX_XSD_PATH)
@@ -169,7 +169,10 @@ def task_run_fares_validation(task_id, adapter):
 
         adapter.info("Validating fares NeTEx file.")
         violations, total_files = validate_xml_files_in_zip(
-            file_, schema=schema, dataset=revision.dataset.id
+            file_,
+            schema=schema,
+            dataset=revision.dataset.id,
+            schema_loader="transit_odp.fares.netex.get_netex_schema",
         )
         adapter.info("Completed validating fares NeTEx file.")
     else:
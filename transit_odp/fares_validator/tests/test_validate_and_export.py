@@ -4,8 +4,14 @@ import pytest
 from django.core.files import File
 from django.test import RequestFactory
 
+from transit_odp.data_quality.models import SchemaViolation
+from transit_odp.fares_validator.models import FaresValidation
+from transit_odp.fares_validator.types import Violation
 from transit_odp.fares_validator.views.export_excel import FaresXmlExporter
-from transit_odp.fares_validator.views.validate import FaresXmlValidator
+from transit_odp.fares_validator.views.validate import (
+    FaresXmlValidator,
+    get_unique_violations,
+)
 from transit_odp.organisation import models
 from transit_odp.organisation.factories import (
     DatasetRevisionFactory,
@@ -78,6 +84,37 @@ def test_fares_validation_zip():
                 assert result.status_code == expected
 
 
+def test_set_errors_skips_files_with_schema_violations():
+    organisation: models.Organisation = create_organisation()
+    revision: models.DatasetRevision = create_revision()
+    filepath = DATA_DIR / "fares_test_zip_fail.zip"
+    SchemaViolation.objects.create(
+        revision=revision, filename="FYOR_1 TypeOf failure.xml", line=1, details=""
+    )
+    with open(filepath, "rb") as zout:
+        fares_xml_validator = FaresXmlValidator(
+            File(zout, name="fares_test_xml.xml"), organisation.id, revision.id
+        )
+        fares_xml_validator.set_errors()
+
+    file_names = set(
+        FaresValidation.objects.filter(revision=revision).values_list(
+            "file_name", flat=True
+        )
+    )
+    assert "FYOR_1 TypeOf failure.xml" not in file_names
+    assert revision.fares_validation_result.count == len(
+        FaresValidation.objects.filter(revision=revision)
+    )
+
+
+def test_get_unique_violations():
+    first = Violation(line=1, filename="a.xml", observation="x", category="c")
+    second = Violation(line=2, filename="a.xml", observation="x", category="c")
+    violations = [first, second, first.model_copy(), second, first]
+    assert get_unique_violations(violations) == [first, second]
+
+
 def test_export_excel():
     obj_exporter = FaresXmlExporter()
     test_report = obj_exporter.get(RequestFactory, 1, 1)
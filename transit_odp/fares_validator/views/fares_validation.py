@@ -26,14 +26,17 @@ class DatasetFaresValidator:
         )
         adapter = PipelineAdapter(logger, {"context": context})
         if zipfile.is_zipfile(file):
+            schema_failed_filenames = set(
+                SchemaViolation.objects.filter(revision_id=revision).values_list(
+                    "filename", flat=True
+                )
+            )
             with zipfile.ZipFile(file) as zf:
                 names = [
                     n
                     for n in zf.namelist()
                     if n.endswith(".xml")
-                    and not SchemaViolation.objects.filter(
-                        filename=n.split("/")[-1], revision_id=revision
-                    ).exists()
+                    and n.split("/")[-1] not in schema_failed_filenames
                 ]
                 file_count = len(names)
                 for index, name in enumerate(names, start=1):
@@ -1,4 +1,5 @@
 import logging
+from typing import List
 
 from django.db import transaction
 from django.http import JsonResponse
@@ -7,10 +8,30 @@ from rest_framework.parsers import FileUploadParser
 
 from ..models import FaresValidation, FaresValidationResult
 from ..serializers import FaresSerializer
+from ..types import Violation
 from . import fares_validation
 
 logger = logging.getLogger(__name__)
 
+BATCH_SIZE = 2000
+
+
+def get_unique_violations(violations: List[Violation]) -> List[Violation]:
+    """Returns `violations` without duplicates, in the order they were found."""
+    seen = set()
+    unique = []
+    for violation in violations:
+        key = (
+            violation.line,
+            violation.filename,
+            violation.observation,
+            violation.category,
+        )
+        if key not in seen:
+            seen.add(key)
+            unique.append(violation)
+    return unique
+
 
 class FaresXmlValidator:
     parser_classes = [FileUploadParser]
@@ -32,23 +53,23 @@ class FaresXmlValidator:
         file_obj = self.file
         fares_validator = fares_validation.get_fares_validator()
         raw_violations = fares_validator.get_violations(file_obj, self.pk2)
-        violations = []
-        [
-            violations.append(violation)
-            for violation in raw_violations
-            if violation not in violations
-        ]
+        violations = get_unique_violations(raw_violations)
         logger.info(f"Revision {self.pk2} contains {len(violations)} fares violations.")
         with transaction.atomic():
             FaresValidation.objects.filter(
                 revision_id=self.pk2, organisation_id=self.pk1
             ).delete()
             if violations:
-                for violation in violations:
-                    # For 'Update data' flow
-                    fares_violations = FaresValidation.create_observations(
-                        revision_id=self.pk2, org_id=self.pk1, violation=violation
-                    ).save()
+                # For 'Update data' flow
+                fares_violations = FaresValidation.objects.bulk_create(
+                    [
+                        FaresValidation.create_observations(
+                            revision_id=self.pk2, org_id=self.pk1, violation=violation
+                        )
+                        for violation in violations
+                    ],
+                    batch_size=BATCH_SIZE,
+                )
 
                 serializer = FaresSerializer(fares_violations, many=True)
                 response = JsonResponse(
@@ -0,0 +1,61 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+
+from transit_odp.naptan.models import StopPoint
+
+logger = logging.getLogger(__name__)
+
+STOP_AREA_MAP_VERSION_KEY = "naptan_stop_area_map_version"
+
+
+class StopAreaMapCache:
+    """A process-level cache of the StopAreas of every NaPTAN StopPoint.
+
+    The map is shared by every PTI validation run in a worker. Its version is
+    held in the shared Django cache and is bumped when the NaPTAN ETL completes,
+    at which point each worker reloads the map the next time it is asked for it.
+    """
+
+    def __init__(self):
+        self._stop_area_map: Optional[Dict[str, List[str]]] = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Dict[str, List[str]]:
+        version = cache.get(STOP_AREA_MAP_VERSION_KEY)
+        with self._lock:
+            if self._stop_area_map is None or self._version != version:
+                logger.info(f"Loading NaPTAN stop area map version {version}")
+                stops = StopPoint.objects.exclude(stop_areas=[]).values(
+                    "atco_code", "stop_areas"
+                )
+                self._stop_area_map = {
+                    stop["atco_code"]: stop["stop_areas"] for stop in stops
+                }
+                self._version = version
+            return self._stop_area_map
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stop_area_map = None
+            self._version = None
+
+
+stop_area_map_cache = StopAreaMapCache()
+
+
+def get_stop_area_map() -> Dict[str, List[str]]:
+    """Returns a map of AtcoCode to StopAreas of every StopPoint with StopAreas."""
+    return stop_area_map_cache.get()
+
+
+def invalidate_stop_area_map() -> None:
+    """Invalidates the stop area map held by every worker."""
+    try:
+        cache.incr(STOP_AREA_MAP_VERSION_KEY)
+    except ValueError:
+        cache.set(STOP_AREA_MAP_VERSION_KEY, 1, timeout=None)
+    stop_area_map_cache.clear()
@@ -0,0 +1,24 @@
+import pytest
+
+from transit_odp.naptan.cache import get_stop_area_map, invalidate_stop_area_map
+from transit_odp.naptan.factories import StopPointFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_stop_area_map_is_reused_until_invalidated(django_assert_num_queries):
+    StopPointFactory(atco_code="0100BRP90310", stop_areas=["010G0005"])
+    StopPointFactory(atco_code="0100BRP90311", stop_areas=[])
+
+    with django_assert_num_queries(1):
+        assert get_stop_area_map() == {"0100BRP90310": ["010G0005"]}
+        assert get_stop_area_map() == {"0100BRP90310": ["010G0005"]}
+
+    StopPointFactory(atco_code="0100BRP90312", stop_areas=["010G0006"])
+    assert "0100BRP90312" not in get_stop_area_map()
+
+    invalidate_stop_area_map()
+    assert get_stop_area_map() == {
+        "0100BRP90310": ["010G0005"],
+        "0100BRP90312": ["010G0006"],
+    }
@@ -86,6 +86,9 @@ DisruptionsType = DatasetType.DISRUPTIONS.value
 
 NO_ACTIVITY = "No vehicle activity"
 
+# The text search configuration of the full-text search of datasets
+DATASET_SEARCH_CONFIG = "english"
+
 DATASET_TYPE_NAMESPACE_MAP = {
     DatasetType.TIMETABLE: "",
     DatasetType.AVL: "avl",
@@ -1,12 +1,12 @@
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 
-import pandas as pd
 from waffle import flag_is_active
 
 from transit_odp.avl.require_attention.abods.registery import AbodsRegistery
 from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
-    get_vehicle_activity_operatorref_linename,
+    VehicleActivityErrors,
+    get_vehicle_activity_errors,
 )
 from transit_odp.browse.common import (
     LTACSVHelper,
@@ -1030,7 +1030,10 @@ class ComplianceReportCSV(CSVBuilder, LTACSVHelper):
         return "No"
 
     def get_error_in_avl_to_timetable_matching(
-        self, operator_ref: str, line_name: str, uncounted_activity_df: pd.DataFrame
+        self,
+        operator_ref: str,
+        line_name: str,
+        vehicle_activity_errors: VehicleActivityErrors,
     ) -> str:
         """
         Returns value for 'Error in AVL to Timetable Matching' column.
@@ -1043,14 +1046,7 @@ class ComplianceReportCSV(CSVBuilder, LTACSVHelper):
             str: Yes or No for 'Error in AVL to Timetable Matching' column
         """
 
-        if not uncounted_activity_df.loc[
-            (uncounted_activity_df["OperatorRef"] == operator_ref)
-            & (
-                uncounted_activity_df["LineRef"].isin(
-                    [line_name, line_name.replace(" ", "_")]
-                )
-            )
-        ].empty:
+        if vehicle_activity_errors.has_errors(operator_ref, line_name):
             return "Yes"
         return "No"
 
@@ -1091,7 +1087,7 @@ class ComplianceReportCSV(CSVBuilder, LTACSVHelper):
         otc_map = get_all_line_level_otc_map(organisation_id)
         service_codes = [service_code for (service_code, line_name) in otc_map]
         txcfa_map = get_line_level_txc_map_service_base(service_codes)
-        uncounted_activity_df = get_vehicle_activity_operatorref_linename()
+        vehicle_activity_errors = get_vehicle_activity_errors()
 
         dq_require_attention_active = flag_is_active(
             "", FeatureFlags.DQS_REQUIRE_ATTENTION.value
@@ -1194,7 +1190,7 @@ class ComplianceReportCSV(CSVBuilder, LTACSVHelper):
                     self.get_error_in_avl_to_timetable_matching(
                         file_attribute.national_operator_code,
                         line_name,
-                        uncounted_activity_df,
+                        vehicle_activity_errors,
                     )
                 )
             else:
@@ -1203,7 +1199,7 @@ class ComplianceReportCSV(CSVBuilder, LTACSVHelper):
                 )
                 error_in_avl_to_timetable_matching = (
                     self.get_error_in_avl_to_timetable_matching(
-                        "", line_name, uncounted_activity_df
+                        "", line_name, vehicle_activity_errors
                     )
                 )
 
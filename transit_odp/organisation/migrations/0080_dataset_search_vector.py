@@ -0,0 +1,58 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+# Mirrors DatasetQuerySet.update_search_vector for the published datasets
+BACKFILL_SEARCH_VECTOR = """
+UPDATE organisation_dataset d
+SET search_vector =
+    setweight(to_tsvector('english', coalesce(r.name, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(o.name, '')), 'B')
+    || setweight(
+        to_tsvector(
+            'english',
+            coalesce(
+                (
+                    SELECT string_agg(a.name, ' ')
+                    FROM naptan_adminarea a
+                    JOIN organisation_datasetrevision_admin_areas ra
+                        ON ra.adminarea_id = a.id
+                    WHERE ra.datasetrevision_id = r.id
+                ),
+                ''
+            )
+        ),
+        'C'
+    )
+    || setweight(to_tsvector('english', coalesce(r.description, '')), 'D')
+FROM organisation_datasetrevision r, organisation_organisation o
+WHERE r.id = d.live_revision_id AND o.id = d.organisation_id;
+"""
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("organisation", "0079_add_dataset_org_type_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dataset",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                help_text="The full-text search vector of the live revision",
+                null=True,
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_VECTOR, reverse_sql=migrations.RunSQL.noop),
+        AddIndexConcurrently(
+            model_name="dataset",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="org_dataset_search_idx"
+            ),
+        ),
+    ]
@@ -5,6 +5,8 @@ from typing import Optional, cast
 
 from django.conf import settings
 from django.contrib.postgres.fields.array import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.files.base import ContentFile
 from django.core.validators import RegexValidator
 from django.db import models
@@ -104,8 +106,23 @@ class Dataset(TimeStampedModel):
 
     is_dummy = models.BooleanField(default=False, null=False, blank=False)
 
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="The full-text search vector of the live revision",
+    )
+
     objects = DatasetManager()
 
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            Index(
+                fields=["organisation", "dataset_type"],
+                name="org_dataset_org_type_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="org_dataset_search_idx"),
+        ]
+
     def __str__(self):
         return f"id={self.id!r}, dataset_type={DatasetType(self.dataset_type).name!r}"
 
@@ -5,6 +5,7 @@ import pytz
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.aggregates.general import ArrayAgg, StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
 from django.db import models
 from django.db.models import (
     Avg,
@@ -53,6 +54,7 @@ from transit_odp.browse.constants import (
 )
 from transit_odp.common.utils import reverse_path
 from transit_odp.organisation.constants import (
+    DATASET_SEARCH_CONFIG,
     EXPIRED,
     INACTIVE,
     INDEXING,
@@ -701,6 +703,57 @@ class DatasetQuerySet(models.QuerySet):
 
         return qs
 
+    def full_text_search(self, keywords):
+        """Filters the datasets to those whose search vector matches keywords,
+        annotated with the search_rank of the match"""
+        query = SearchQuery(
+            keywords, search_type="websearch", config=DATASET_SEARCH_CONFIG
+        )
+        return self.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F("search_vector"), query)
+        )
+
+    def update_search_vector(self):
+        """Updates the search vector of the published datasets from the name,
+        description and admin areas of the live revision and the organisation name"""
+        from transit_odp.naptan.models import AdminArea
+        from transit_odp.organisation.models import DatasetRevision, Organisation
+
+        live_revision = DatasetRevision.objects.filter(
+            id=OuterRef("live_revision_id")
+        ).order_by()
+        organisation = Organisation.objects.filter(
+            id=OuterRef("organisation_id")
+        ).order_by()
+        admin_areas = (
+            AdminArea.objects.filter(revisions=OuterRef("live_revision_id"))
+            .order_by()
+            .values("revisions")
+            .annotate(names=StringAgg("name", delimiter=" "))
+            .values("names")
+        )
+        vector = (
+            SearchVector(
+                Subquery(live_revision.values("name")[:1]),
+                weight="A",
+                config=DATASET_SEARCH_CONFIG,
+            )
+            + SearchVector(
+                Subquery(organisation.values("name")[:1]),
+                weight="B",
+                config=DATASET_SEARCH_CONFIG,
+            )
+            + SearchVector(
+                Subquery(admin_areas), weight="C", config=DATASET_SEARCH_CONFIG
+            )
+            + SearchVector(
+                Subquery(live_revision.values("description")[:1]),
+                weight="D",
+                config=DATASET_SEARCH_CONFIG,
+            )
+        )
+        return self.get_published().update(search_vector=vector)
+
     def get_remote(self):
         # Note we only want to consider the live_revision's data when determining if
         # its remote. Therefore, exclude any draft revisions
@@ -1,5 +1,6 @@
 import logging
 
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -73,6 +74,15 @@ def revision_publish_handler(sender, dataset: Dataset, **kwargs):
     send_revision_published_notification(dataset)
 
 
+@receiver(revision_publish)
+def update_search_vector_handler(sender, dataset: Dataset, **kwargs):
+    """Updates the search vector of the dataset from its newly published revision"""
+    dataset_id = dataset.id
+    transaction.on_commit(
+        lambda: Dataset.objects.filter(id=dataset_id).update_search_vector()
+    )
+
+
 @receiver(post_save, sender=Organisation)
 def create_consumer_stats(sender, instance=None, created=False, **kwargs):
     if created:
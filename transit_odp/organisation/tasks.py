@@ -3,6 +3,7 @@ from logging import getLogger
 from celery import shared_task
 from waffle import flag_is_active
 from transit_odp.common.constants import FeatureFlags
+from transit_odp.organisation.models.data import Dataset
 from transit_odp.organisation.models.organisations import Organisation
 from transit_odp.organisation.models.report import ComplianceReport
 
@@ -34,6 +35,16 @@ def task_precalculate_operator_sra():
     logger.info("Finished updating operator/organisation service require attention")
 
 
+@shared_task()
+def task_update_dataset_search_vectors():
+    """
+    Task to refresh the search vectors of all the published datasets, picking up
+    changes made outside of publishing a revision such as organisation renames
+    """
+    updated = Dataset.objects.update_search_vector()
+    logger.info(f"Updated the search vector of {updated} datasets")
+
+
 def organisation_calcualte_sra(
     organisation: Organisation,
 ):
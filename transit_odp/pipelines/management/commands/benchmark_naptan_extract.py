@@ -0,0 +1,140 @@
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from lxml import etree
+
+from transit_odp.naptan.dataclasses import StopPoint
+from transit_odp.pipelines.pipelines.naptan_etl.extract import extract_stops, namespace
+
+HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<NaPTAN xmlns="http://www.naptan.org.uk/" SchemaVersion="2.1">\n'
+    "<StopPoints>\n"
+)
+FOOTER = "</StopPoints>\n</NaPTAN>\n"
+STOP_POINT = """<StopPoint Modification="new" RevisionNumber="1" Status="active">
+<AtcoCode>{atco_code}</AtcoCode>
+<NaptanCode>bst{index:05d}</NaptanCode>
+<Descriptor>
+<CommonName>Synthetic Stop {index}</CommonName>
+<Street>Synthetic Street</Street>
+<Indicator>Stop {index}</Indicator>
+</Descriptor>
+<Place>
+<NptgLocalityRef>E0035604</NptgLocalityRef>
+<LocalityCentre>0</LocalityCentre>
+<Location>
+<Translation>
+<GridType>UKOS</GridType>
+<Easting>{easting}</Easting>
+<Northing>{northing}</Northing>
+</Translation>
+</Location>
+</Place>
+<StopAreas>
+<StopAreaRef>010G{index:07d}</StopAreaRef>
+</StopAreas>
+<StopClassification>
+<StopType>BCT</StopType>
+<OnStreet>
+<Bus>
+<BusStopType>MKD</BusStopType>
+<TimingStatus>OTH</TimingStatus>
+<MarkedPoint>
+<Bearing>
+<CompassPoint>SW</CompassPoint>
+</Bearing>
+</MarkedPoint>
+</Bus>
+</OnStreet>
+</StopClassification>
+<AdministrativeAreaRef>009</AdministrativeAreaRef>
+</StopPoint>
+"""
+
+
+def write_synthetic_naptan(path: Path, stops: int):
+    with path.open("w") as f:
+        f.write(HEADER)
+        for index in range(stops):
+            f.write(
+                STOP_POINT.format(
+                    atco_code=f"0100{index:08d}",
+                    index=index,
+                    easting=300000 + index % 100000,
+                    northing=170000 + index % 100000,
+                )
+            )
+        f.write(FOOTER)
+
+
+def extract_with_full_dom(path):
+    tree = etree.parse(str(path), parser=etree.XMLParser(huge_tree=True))
+    stop_point_path = ".//naptan:StopPoints/naptan:StopPoint"
+    return [
+        StopPoint.from_xml(stop)
+        for stop in tree.iterfind(stop_point_path, namespaces=namespace)
+    ]
+
+
+def extract_with_iterparse(path):
+    return extract_stops(str(path))
+
+
+MODES = {"dom": extract_with_full_dom, "iterparse": extract_with_iterparse}
+
+
+def run_mode(mode, path, queue):
+    start = time.perf_counter()
+    result = MODES[mode](path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((len(result), elapsed, peak_kb))
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks peak memory and throughput of NaPTAN stop extraction "
+        "against a synthetic national-size file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stops",
+            type=int,
+            default=450000,
+            help="The number of StopPoints to write to the synthetic file",
+        )
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=list(MODES),
+            default=list(MODES),
+            help="The extraction modes to benchmark",
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Naptan.xml"
+            self.stdout.write(f"Writing {options['stops']} StopPoints to {path}")
+            write_synthetic_naptan(path, options["stops"])
+            size_mb = path.stat().st_size / 1024**2
+            self.stdout.write(f"Synthetic file is {size_mb:.1f} MB")
+
+            context = multiprocessing.get_context("fork")
+            for mode in options["modes"]:
+                # Each mode runs in a fresh process so ru_maxrss is its own peak
+                queue = context.Queue()
+                process = context.Process(target=run_mode, args=(mode, path, queue))
+                process.start()
+                count, elapsed, peak_kb = queue.get()
+                process.join()
+                self.stdout.write(
+                    f"{mode}: {count} stops in {elapsed:.1f}s "
+                    f"({count / elapsed:.0f} stops/s), "
+                    f"peak RSS {peak_kb / 1024:.0f} MB"
+                )
@@ -452,7 +452,10 @@ class SchemaDefinition(TimeStampedModel):
             content: zip file in bytes to be saved
             name: filename of new zip file
         """
+        from transit_odp.pipelines.pipelines.xml_schema import schema_cache
+
         self.schema.delete()
         self.schema = ContentFile(content, name)
         self.checksum = sha1sum(content)
         self.save()
+        schema_cache.invalidate(self.category)
@@ -103,7 +103,7 @@ class XmlFileParser(ETLUtility):
         logger.debug("Extracting data")
 
         filename = file_obj.name
-        self.trans = TransXChangeDocument(file_obj.file)
+        self.trans = TransXChangeDocument(file_obj.file, tree=doc)
         schema_version = self.trans.get_transxchange_version()
 
         # Extract Services
@@ -11,7 +11,7 @@ from requests import RequestException
 
 from transit_odp.common.loggers import LoaderAdapter
 from transit_odp.naptan.dataclasses import StopPoint
-from transit_odp.naptan.dataclasses.nptg import NationalPublicTransportGazetteer
+from transit_odp.naptan.dataclasses.nptg import NptgLocality, Region
 
 ns = "http://www.naptan.org.uk/"
 namespace = {"naptan": ns}
@@ -83,13 +83,43 @@ def get_latest_nptg():
     return xml_file_path
 
 
+def iterparse_elements(xml_file_path, tag, parent_tag=None, discard=()):
+    """
+    Stream the `tag` elements in the NaPTAN namespace out of `xml_file_path`.
+
+    Each element is fully built when it is yielded and is cleared, along with
+    any preceding siblings, as soon as the consumer asks for the next one. Peak
+    memory is therefore bounded by the size of a single element rather than
+    the size of the document. If `parent_tag` is given only elements whose
+    parent has that tag are yielded. Elements named in `discard` are cleared
+    without being yielded so that unrelated sections of the document do not
+    accumulate in memory either.
+    """
+    qualified_tag = f"{{{ns}}}{tag}"
+    qualified_parent = f"{{{ns}}}{parent_tag}" if parent_tag else None
+    tags = [qualified_tag] + [f"{{{ns}}}{name}" for name in discard]
+    context = ET.iterparse(xml_file_path, events=("end",), tag=tags, huge_tree=True)
+    for _, element in context:
+        parent = element.getparent()
+        if element.tag == qualified_tag and (
+            qualified_parent is None
+            or (parent is not None and parent.tag == qualified_parent)
+        ):
+            yield element
+
+        element.clear(keep_tail=True)
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+    del context
+
+
 def extract_stops(xml_file_path):
     def inner():
         logger.info(f"Extracting NaPTAN stops from file {xml_file_path}.")
-        tree = ET.parse(xml_file_path)
-
-        stop_point_path = "//naptan:StopPoints/naptan:StopPoint"
-        for stop in tree.iterfind(stop_point_path, namespaces=namespace):
+        for stop in iterparse_elements(
+            xml_file_path, "StopPoint", parent_tag="StopPoints", discard=("StopArea",)
+        ):
             point = StopPoint.from_xml(stop)
             bus_stop_type, flexible_zones = None, None
             if (
@@ -151,11 +181,13 @@ def extract_stops(xml_file_path):
 def extract_admin_areas(xml_file_path):
     def inner():
         logger.info(f"Extracting NPTG AdminAreas from {xml_file_path}.")
-        tree = ET.parse(xml_file_path)
-        root = tree.getroot()
-        nptg = NationalPublicTransportGazetteer.from_xml(root)
-
-        for region in nptg.regions:
+        for element in iterparse_elements(
+            xml_file_path,
+            "Region",
+            parent_tag="Regions",
+            discard=("NptgDistrict", "NptgLocality"),
+        ):
+            region = Region.from_xml(element)
             region_code = region.region_code
             for area in region.administrative_areas:
                 yield {
@@ -178,11 +210,13 @@ def extract_localities(xml_file_path):
     logger.info(f"Extracting NPTG Localities from {xml_file_path}.")
 
     def inner():
-        tree = ET.parse(xml_file_path)
-        root = tree.getroot()
-        nptg = NationalPublicTransportGazetteer.from_xml(root)
-
-        for locality in nptg.nptg_localities:
+        for element in iterparse_elements(
+            xml_file_path,
+            "NptgLocality",
+            parent_tag="NptgLocalities",
+            discard=("Region", "NptgDistrict"),
+        ):
+            locality = NptgLocality.from_xml(element)
             yield {
                 "gazetteer_id": locality.nptg_locality_code,
                 "name": locality.descriptor.locality_name,
@@ -1,6 +1,8 @@
+import math
+
 from celery.utils.log import get_task_logger
 from django.contrib.gis.geos import Point
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
 
 from transit_odp.common.loggers import LoaderAdapter
 from transit_odp.naptan.models import AdminArea, FlexibleZone, Locality, StopPoint
@@ -15,11 +17,14 @@ from transit_odp.pipelines.pipelines.naptan_etl.transform import (
 logger = get_task_logger(__name__)
 logger = LoaderAdapter("NaPTANLoader", logger)
 
+CHUNK_SIZE = 5000
+
 
 def load_new_stops(new_stops):
     logger.info(f"[load_new_stops]: Loading {len(new_stops)} new NaPTAN StopPoints.")
     chunk_size = 5000
     total_rows = len(new_stops)
+    inserted = 0
     for start in range(0, total_rows, chunk_size):
         end = min(start + chunk_size, total_rows)
         chunk = new_stops.iloc[start:end]
@@ -45,49 +50,174 @@ def load_new_stops(new_stops):
         try:
             with transaction.atomic():
                 StopPoint.objects.bulk_create(stops_list)
+            inserted += len(stops_list)
         except IntegrityError as e:
             logger.error(
                 f"[load_new_stops]: Error processing rows {start} to {end} - {e}"
             )
         logger.info(f"[load_new_stops]: Processed rows {start} to {end}")
     logger.info("[load_new_stops]: Finished loading new StopPoints.")
+    return inserted
 
 
-def load_existing_stops(existing_stops):
-    logger.info(
-        f"[load_existing_stops]: Loading {len(existing_stops)} existing NaPTAN stops."
+def bulk_update_from_staging(model, key_field, fields, rows, placeholders=None):
+    """
+    Apply `rows` to the table of `model` with a single set-based UPDATE.
+
+    The rows are staged into a temporary copy of the table in chunks and then
+    joined back onto the table with one `UPDATE ... FROM` statement, rather
+    than issuing an UPDATE per row. Each row is a tuple of the `key_field`
+    value followed by one value per entry in `fields`. `placeholders` maps a
+    field to the SQL used to build it from its parameters, e.g. a geometry.
+    Returns the number of rows updated.
+    """
+    if not rows:
+        return 0
+
+    placeholders = placeholders or {}
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    staging = quote_name(f"{model._meta.db_table}_staging")
+    columns = [model._meta.get_field(name).column for name in [key_field, *fields]]
+    key_column, field_columns = quote_name(columns[0]), columns[1:]
+    row_placeholder = "({})".format(
+        ", ".join(placeholders.get(name, "%s") for name in [key_field, *fields])
     )
-    chunk_size = 5000
-    total_rows = len(existing_stops)
-    for start in range(0, total_rows, chunk_size):
-        end = min(start + chunk_size, total_rows)
-        chunk = existing_stops.iloc[start:end]
-        for row in chunk.itertuples():
+    insert_columns = ", ".join(quote_name(column) for column in columns)
+    assignments = ", ".join(
+        f"{quote_name(column)} = staging.{quote_name(column)}"
+        for column in field_columns
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging} (LIKE {table} INCLUDING DEFAULTS)"
+        )
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[start : start + CHUNK_SIZE]
+            values = ", ".join([row_placeholder] * len(chunk))
+            params = [param for row in chunk for param in row]
+            cursor.execute(
+                f"INSERT INTO {staging} ({insert_columns}) VALUES {values}", params
+            )
+        cursor.execute(
+            f"UPDATE {table} SET {assignments} FROM {staging} AS staging "
+            f"WHERE {table}.{key_column} = staging.{key_column}"
+        )
+        updated = cursor.rowcount
+        cursor.execute(f"DROP TABLE {staging}")
+        # Foreign keys are checked at commit, check them now so a bad row fails
+        # this block rather than the caller's transaction
+        connection.check_constraints()
+    return updated
+
+
+def apply_updates(name, model, key_field, fields, rows, placeholders=None):
+    """
+    Apply `rows` with `bulk_update_from_staging`, isolating failures.
+
+    A single bad row, e.g. a foreign key to a missing row, fails the whole
+    set-based UPDATE. When that happens the rows are retried a chunk at a time
+    and the rows of a failing chunk one at a time, so only the bad rows are
+    lost and each of them is logged. Returns the number of rows updated and the
+    number of rows that failed.
+    """
+    try:
+        updated = bulk_update_from_staging(model, key_field, fields, rows, placeholders)
+        return updated, 0
+    except Exception as exp:
+        logger.warning(f"[{name}]: Error updating rows, retrying in chunks - {exp}")
+
+    updated = 0
+    failed = 0
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start : start + CHUNK_SIZE]
+        try:
+            updated += bulk_update_from_staging(
+                model, key_field, fields, chunk, placeholders
+            )
+            continue
+        except Exception as exp:
+            logger.warning(
+                f"[{name}]: Error updating rows {start} to {start + len(chunk)}, "
+                f"retrying row by row - {exp}"
+            )
+        for row in chunk:
             try:
-                StopPoint.objects.filter(id=row.obj.id).update(
-                    atco_code=row.Index,
-                    naptan_code=row.naptan_code,
-                    common_name=row.common_name,
-                    indicator=row.indicator,
-                    street=row.street,
-                    locality_id=row.locality_id,
-                    admin_area_id=row.admin_area_id,
-                    location=Point(
-                        x=float(row.longitude), y=float(row.latitude), srid=4326
-                    ),
-                    stop_areas=row.stop_areas,
-                    stop_type=row.stop_type,
-                    bus_stop_type=row.bus_stop_type,
+                updated += bulk_update_from_staging(
+                    model, key_field, fields, [row], placeholders
                 )
             except Exception as exp:
-                logger.error(
-                    f"[load_existing_stops]: Error processing row {row} - {exp}"
+                failed += 1
+                logger.error(f"[{name}]: Error processing row {row} - {exp}")
+    return updated, failed
+
+
+def to_nullable(value, cast=None):
+    """Returns None for a missing value, such as NaN, otherwise `value` cast
+    with `cast` if given"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return cast(value) if cast else value
+
+
+def load_existing_stops(existing_stops):
+    logger.info(
+        f"[load_existing_stops]: Loading {len(existing_stops)} existing NaPTAN stops."
+    )
+    fields = [
+        "atco_code",
+        "naptan_code",
+        "common_name",
+        "indicator",
+        "street",
+        "locality",
+        "admin_area",
+        "location",
+        "stop_areas",
+        "stop_type",
+        "bus_stop_type",
+    ]
+    rows = []
+    failed = 0
+    for row in existing_stops.itertuples():
+        try:
+            longitude, latitude = float(row.longitude), float(row.latitude)
+            if not (math.isfinite(longitude) and math.isfinite(latitude)):
+                raise ValueError(f"invalid location ({longitude}, {latitude})")
+            rows.append(
+                (
+                    row.obj.id,
+                    row.Index,
+                    row.naptan_code,
+                    row.common_name,
+                    row.indicator,
+                    row.street,
+                    to_nullable(row.locality_id),
+                    to_nullable(row.admin_area_id, int),
+                    longitude,
+                    latitude,
+                    row.stop_areas,
+                    row.stop_type,
+                    row.bus_stop_type,
                 )
-        logger.info(f"[load_existing_stops]: Processed rows {start} to {end}")
+            )
+        except Exception as exp:
+            failed += 1
+            logger.error(f"[load_existing_stops]: Error processing row {row} - {exp}")
+    updated, failed_updates = apply_updates(
+        "load_existing_stops",
+        StopPoint,
+        "id",
+        fields,
+        rows,
+        placeholders={"location": "ST_SetSRID(ST_MakePoint(%s, %s), 4326)"},
+    )
 
     logger.info(
-        f"[load_existing_stops]: Finished loading {total_rows} existing NaPTAN stops."
+        f"[load_existing_stops]: Finished loading {updated} existing NaPTAN stops."
     )
+    return updated, failed + failed_updates
 
 
 def load_new_admin_areas(new_admin_areas):
@@ -96,6 +226,7 @@ def load_new_admin_areas(new_admin_areas):
     )
     chunk_size = 5000
     total_rows = len(new_admin_areas)
+    inserted = 0
     for start in range(0, total_rows, chunk_size):
         end = min(start + chunk_size, total_rows)
         chunk = new_admin_areas.iloc[start:end]
@@ -113,42 +244,48 @@ def load_new_admin_areas(new_admin_areas):
         try:
             with transaction.atomic():
                 AdminArea.objects.bulk_create(admin_areas_list)
+            inserted += len(admin_areas_list)
         except Exception as exp:
             logger.error(
                 f"[load_new_admin_areas]: Error processing rows {start} to {end} - {exp}"
             )
         logger.info(f"[load_new_admin_areas]: Processed rows {start} to {end}")
     logger.info("[load_new_admin_areas]: Finished")
+    return inserted
 
 
 def load_existing_admin_areas(existing_admin_areas):
     logger.info(
         f"[load_existing_admin_areas]: Loading {len(existing_admin_areas)} existing admin areas"
     )
-    chunk_size = 5000
-    total_rows = len(existing_admin_areas)
-    for start in range(0, total_rows, chunk_size):
-        end = min(start + chunk_size, total_rows)
-        chunk = existing_admin_areas.iloc[start:end]
-        for row in chunk.itertuples():
-            try:
-                AdminArea.objects.filter(id=int(row.Index)).update(
-                    name=row.name,
-                    traveline_region_id=row.traveline_region_id,
-                    atco_code=row.atco_code,
-                )
-            except Exception as exp:
-                logger.error(
-                    f"[load_existing_admin_areas]: Error processing row {row} - {exp}"
-                )
-        logger.info(f"[load_existing_admin_areas]: Processed rows {start} to {end}")
-    logger.info("[load_existing_admin_areas]: Finished")
+    rows = []
+    failed = 0
+    for row in existing_admin_areas.itertuples():
+        try:
+            rows.append(
+                (int(row.Index), row.name, row.traveline_region_id, row.atco_code)
+            )
+        except Exception as exp:
+            failed += 1
+            logger.error(
+                f"[load_existing_admin_areas]: Error processing row {row} - {exp}"
+            )
+    updated, failed_updates = apply_updates(
+        "load_existing_admin_areas",
+        AdminArea,
+        "id",
+        ["name", "traveline_region_id", "atco_code"],
+        rows,
+    )
+    logger.info(f"[load_existing_admin_areas]: Finished updating {updated} admin areas")
+    return updated, failed + failed_updates
 
 
 def load_new_localities(new_localities):
     logger.info(f"[load_new_localities]: Loading {len(new_localities)} new localities")
     chunk_size = 5000
     total_rows = len(new_localities)
+    inserted = 0
     for start in range(0, total_rows, chunk_size):
         end = min(start + chunk_size, total_rows)
         chunk = new_localities.iloc[start:end]
@@ -167,36 +304,47 @@ def load_new_localities(new_localities):
         try:
             with transaction.atomic():
                 Locality.objects.bulk_create(localities_list)
+            inserted += len(localities_list)
         except Exception as e:
             logger.error(
                 f"[load_new_localities]: Error processing rows {start} to {end} - {e}"
             )
         logger.info(f"[load_new_localities]: Processed rows {start} to {end}")
     logger.info("[load_new_localities]: Finished")
+    return inserted
 
 
 def load_existing_localities(existing_localities):
     logger.info(
         f"[load_existing_localities]: Loading {len(existing_localities)} existing localities"
     )
-    chunk_size = 5000
-    total_rows = len(existing_localities)
-    for start in range(0, total_rows, chunk_size):
-        end = min(start + chunk_size, total_rows)
-        chunk = existing_localities.iloc[start:end]
-        for row in chunk.itertuples():
-            try:
-                Locality.objects.filter(gazetteer_id=row.Index).update(
-                    name=row.name,
-                    easting=row.easting,
-                    northing=row.northing,
-                    admin_area_id=int(row.admin_area_id),
-                )
-            except Exception as exp:
-                logger.error(
-                    f"[load_existing_localities]: Error processing row {row} - {exp}"
+    rows = []
+    failed = 0
+    for row in existing_localities.itertuples():
+        try:
+            rows.append(
+                (
+                    row.Index,
+                    row.name,
+                    int(row.easting),
+                    int(row.northing),
+                    to_nullable(row.admin_area_id, int),
                 )
-    logger.info("[load_existing_localities]: Finished")
+            )
+        except Exception as exp:
+            failed += 1
+            logger.error(
+                f"[load_existing_localities]: Error processing row {row} - {exp}"
+            )
+    updated, failed_updates = apply_updates(
+        "load_existing_localities",
+        Locality,
+        "gazetteer_id",
+        ["name", "easting", "northing", "admin_area"],
+        rows,
+    )
+    logger.info(f"[load_existing_localities]: Finished updating {updated} localities")
+    return updated, failed + failed_updates
 
 
 def create_flexible_zones(flexible_zones):
@@ -2,6 +2,7 @@ import pandas as pd
 from celery.utils.log import get_task_logger
 
 from transit_odp.common.loggers import LoaderAdapter
+from transit_odp.naptan.cache import invalidate_stop_area_map
 from transit_odp.pipelines.pipelines.naptan_etl.extract import (
     cleanup,
     extract_admin_areas,
@@ -37,6 +38,14 @@ logger = get_task_logger(__name__)
 logger = LoaderAdapter("NaPTANLoader", logger)
 
 
+def log_load_summary(name, inserted, updated, failed, existing):
+    unchanged = len(existing) - updated - failed
+    logger.info(
+        f"[naptan_etl: run]: {name} inserted {inserted}, "
+        f"updated {updated}, failed {failed}, unchanged {unchanged}"
+    )
+
+
 def run():
     logger.info("Running NaPTAN loading pipeline.")
 
@@ -73,16 +82,19 @@ def run():
     existing_localities_to_update = get_localities_to_update(existing_localities)
 
     logger.info(f"[naptan_etl: run]: New admin_areas {len(new_admin_areas)} found")
-    load_new_admin_areas(new_admin_areas)
-    load_existing_admin_areas(existing_admin_areas_to_update)
+    inserted = load_new_admin_areas(new_admin_areas)
+    updated, failed = load_existing_admin_areas(existing_admin_areas_to_update)
+    log_load_summary("admin_areas", inserted, updated, failed, existing_admin_areas)
 
     logger.info(f"[naptan_etl: run]: New localities {len(new_localities)} found")
-    load_new_localities(new_localities)
-    load_existing_localities(existing_localities_to_update)
+    inserted = load_new_localities(new_localities)
+    updated, failed = load_existing_localities(existing_localities_to_update)
+    log_load_summary("localities", inserted, updated, failed, existing_localities)
 
     logger.info(f"[naptan_etl: run]: New stops {len(new_stops)} found")
-    load_new_stops(new_stops)
-    load_existing_stops(existing_stops_to_update)
+    inserted = load_new_stops(new_stops)
+    updated, failed = load_existing_stops(existing_stops_to_update)
+    log_load_summary("stops", inserted, updated, failed, existing_stops)
 
     stops_from_db = extract_stops_from_db()
     new_flexible_stop_points = new_stops[~new_stops["flexible_zones"].isna()]
@@ -92,6 +104,7 @@ def run():
     existing_flexible_stops = existing_stops[~existing_stops["flexible_zones"].isna()]
     all_flexible_stops = pd.concat([new_flexible_stops, existing_flexible_stops])
     load_flexible_zones(all_flexible_stops)
+    invalidate_stop_area_map()
 
     cleanup()
     logger.info("[run] finished")
@@ -1,7 +1,8 @@
 import logging
+import threading
 from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from zipfile import ZipFile
 
 import requests
@@ -13,6 +14,7 @@ from transit_odp.pipelines.constants import SCHEMA_DIR
 from transit_odp.pipelines.models import SchemaDefinition
 
 TIMEOUT = 30
+CHECKSUM_FILENAME = ".checksum"
 logger = logging.getLogger(__name__)
 
 
@@ -92,8 +94,12 @@ class SchemaLoader:
             logger.info(f"Directory {directory} created")
 
         path = directory / self._path
+        checksum_path = directory / CHECKSUM_FILENAME
+        extracted_checksum = None
+        if checksum_path.exists():
+            extracted_checksum = checksum_path.read_text()
 
-        if not path.exists():
+        if not path.exists() or extracted_checksum != self.definition.checksum:
             with ZipFile(self.definition.schema) as zin:
                 for filepath in zin.namelist():
                     # Not sure why this is necessary but the netex zip triggers
@@ -106,6 +112,7 @@ class SchemaLoader:
                         logger.warning(f"Could not extract {filepath} - {e}")
                         # We probably want to fail the pipeline if there are any other
                         # exceptions
+            checksum_path.write_text(self.definition.checksum)
 
         return path
 
@@ -117,3 +124,45 @@ class SchemaLoader:
         with self.path.open("r") as f:
             doc = etree.parse(f)
             return etree.XMLSchema(doc)
+
+
+class SchemaCache:
+    """
+    A per-process cache of compiled XSD schemas.
+
+    Schemas are keyed by the category and checksum of their SchemaDefinition, so
+    each version of a schema is compiled once per worker and a new version is
+    picked up as soon as SchemaDefinition.update_definition changes the checksum.
+    """
+
+    def __init__(self):
+        self._schemas: Dict[Tuple[str, str, str], etree.XMLSchema] = {}
+        self._lock = threading.Lock()
+
+    def get(self, definition: SchemaDefinition, xsd_path: str) -> etree.XMLSchema:
+        key = (definition.category, definition.checksum, xsd_path)
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is None:
+                logger.info(
+                    f"Compiling {definition.category} schema {definition.checksum}"
+                )
+                schema = SchemaLoader(definition, xsd_path).schema
+                self._evict(definition.category)
+                self._schemas[key] = schema
+            return schema
+
+    def invalidate(self, category: str) -> None:
+        with self._lock:
+            self._evict(category)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schemas.clear()
+
+    def _evict(self, category: str) -> None:
+        for key in [key for key in self._schemas if key[0] == category]:
+            del self._schemas[key]
+
+
+schema_cache = SchemaCache()
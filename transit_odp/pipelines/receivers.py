@@ -2,10 +2,12 @@ import celery
 from django.db import transaction
 from django.dispatch import receiver
 
+from transit_odp.browse.tasks import task_materialise_timetable_visualiser
 from transit_odp.data_quality.tasks import task_dqs_download, task_dqs_report_etl
-from transit_odp.organisation.constants import FeedStatus
-from transit_odp.organisation.models import DatasetRevision
+from transit_odp.organisation.constants import DatasetType, FeedStatus
+from transit_odp.organisation.models import Dataset, DatasetRevision
 from transit_odp.organisation.receivers import logger
+from transit_odp.organisation.signals import revision_publish
 from transit_odp.pipelines.models import DataQualityTask
 from transit_odp.pipelines.signals import dataset_changed, dataset_etl, dqs_report_etl
 from transit_odp.timetables.tasks import task_dataset_pipeline
@@ -49,3 +51,22 @@ def dataset_changed_handler(sender, revision: DatasetRevision, **kwargs):
     """
     logger.debug(f"dataset_changed called for DatasetRevision {revision.id}")
     task_dataset_pipeline.apply_async(args=(revision.id,), kwargs={"do_publish": True})
+
+
+@receiver(revision_publish)
+def timetable_revision_publish_handler(
+    sender: DatasetRevision, dataset: Dataset, **kwargs
+):
+    """
+    Listens on the revision_publish and dispatches a Celery job to materialise
+    the timetable visualiser of the published revision
+    """
+    if dataset.dataset_type != DatasetType.TIMETABLE:
+        return
+
+    logger.debug(
+        f"timetable_revision_publish_handler called for DatasetRevision {sender.id}"
+    )
+    transaction.on_commit(
+        lambda: task_materialise_timetable_visualiser.delay(sender.id)
+    )
@@ -8,6 +8,8 @@ from transit_odp.pipelines.pipelines.naptan_etl.extract import (
     extract_admin_areas,
     extract_localities,
     extract_stops,
+    iterparse_elements,
+    namespace,
 )
 from transit_odp.pipelines.tests.utils import check_frame_equal
 
@@ -115,3 +117,23 @@ class TestNaptanNptgExtract(TestCase):
         ).set_index("gazetteer_id")
 
         self.assertTrue(check_frame_equal(actual_localities, expected_localities))
+
+    def test_iterparse_elements_streams_stop_points(self):
+        # Test
+        atco_codes = [
+            element.findtext("./naptan:AtcoCode", namespaces=namespace)
+            for element in iterparse_elements(
+                self.naptan_path, "StopPoint", parent_tag="StopPoints"
+            )
+        ]
+
+        # Assert
+        self.assertEqual(atco_codes, ["010000001", "010000002"])
+
+    def test_iterparse_elements_clears_yielded_elements(self):
+        # Test
+        previous = list(iterparse_elements(self.nptg_path, "NptgLocality"))
+
+        # Assert
+        self.assertEqual(len(previous), 2)
+        self.assertTrue(all(len(element) == 0 for element in previous))
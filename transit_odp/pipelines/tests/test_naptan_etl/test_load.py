@@ -51,9 +51,10 @@ class TestNaptanLoad(TestCase):
         ).set_index("atco_code")
 
         # Test
-        load_new_stops(new_stops)
+        inserted = load_new_stops(new_stops)
 
         # Assert
+        self.assertEqual(inserted, 1)
         created_stop = StopPoint.objects.all()[0]
 
         self.assertEqual(len(StopPoint.objects.all()), 1)
@@ -104,9 +105,11 @@ class TestNaptanLoad(TestCase):
         ).set_index("atco_code")
 
         # Test
-        load_existing_stops(existing_stops)
+        updated, failed = load_existing_stops(existing_stops)
 
         # Assert
+        self.assertEqual(updated, 1)
+        self.assertEqual(failed, 0)
         updated_stop = StopPoint.objects.all()[0]
 
         self.assertEqual(len(StopPoint.objects.all()), 1)
@@ -168,9 +171,11 @@ class TestNaptanLoad(TestCase):
         ).set_index("id")
 
         # Test
-        load_existing_admin_areas(existing_admin_areas)
+        updated, failed = load_existing_admin_areas(existing_admin_areas)
 
         # Assert
+        self.assertEqual(updated, 1)
+        self.assertEqual(failed, 0)
         updated_admin_area = AdminArea.objects.all()[0]
 
         self.assertEqual(len(AdminArea.objects.all()), 1)
@@ -239,9 +244,11 @@ class TestNaptanLoad(TestCase):
         ).set_index("gazetteer_id")
 
         # Test
-        load_existing_localities(existing_localities)
+        updated, failed = load_existing_localities(existing_localities)
 
         # Assert
+        self.assertEqual(updated, 1)
+        self.assertEqual(failed, 0)
         updated_locality = Locality.objects.all()[0]
 
         self.assertEqual(len(Locality.objects.all()), 1)
@@ -252,6 +259,85 @@ class TestNaptanLoad(TestCase):
         self.assertEqual(updated_locality.admin_area_id, 9)
         # self.assertEqual(updated_locality.district_id, 10)
 
+    def test_update_existing_localities_skips_invalid_rows(self):
+        # Setup
+        admin_area = AdminAreaFactory(id=9)
+        localities = [
+            LocalityFactory(gazetteer_id=gazetteer_id, admin_area=admin_area)
+            for gazetteer_id in ("N1", "N2")
+        ]
+        existing_localities = pd.DataFrame(
+            [
+                {
+                    "gazetteer_id": "N1",
+                    "name": "Locality1",
+                    "easting": float("nan"),
+                    "northing": 34567,
+                    "admin_area_id": 9,
+                    "obj": localities[0],
+                },
+                {
+                    "gazetteer_id": "N2",
+                    "name": "Locality2",
+                    "easting": 12345,
+                    "northing": 34567,
+                    "admin_area_id": 9,
+                    "obj": localities[1],
+                },
+            ]
+        ).set_index("gazetteer_id")
+
+        # Test
+        updated, failed = load_existing_localities(existing_localities)
+
+        # Assert
+        self.assertEqual(updated, 1)
+        self.assertEqual(failed, 1)
+        self.assertEqual(
+            list(Locality.objects.order_by("gazetteer_id").values_list("name")),
+            [(localities[0].name,), ("Locality2",)],
+        )
+
+    def test_update_existing_stops_isolates_failing_rows(self):
+        # Setup
+        admin_area = AdminAreaFactory(id=9)
+        stops = [
+            StopPointFactory(atco_code=atco_code, admin_area=admin_area)
+            for atco_code in ("010000001", "010000002")
+        ]
+        existing_stops = pd.DataFrame(
+            [
+                {
+                    "atco_code": stop.atco_code,
+                    "naptan_code": "bstpgit",
+                    "common_name": "Cassell Road",
+                    "indicator": "SW-bound",
+                    "street": "Downend Road",
+                    "locality_id": None,
+                    # The first stop references an admin area that does not exist
+                    "admin_area_id": admin_area_id,
+                    "latitude": "51.4843326109",
+                    "longitude": "-2.51701423067",
+                    "stop_areas": [],
+                    "obj": stop,
+                    "stop_type": "BCT",
+                    "bus_stop_type": "CUS",
+                }
+                for stop, admin_area_id in zip(stops, (999, 9))
+            ]
+        ).set_index("atco_code")
+
+        # Test
+        updated, failed = load_existing_stops(existing_stops)
+
+        # Assert
+        self.assertEqual(updated, 1)
+        self.assertEqual(failed, 1)
+        self.assertEqual(
+            list(StopPoint.objects.order_by("atco_code").values_list("common_name")),
+            [(stops[0].common_name,), ("Cassell Road",)],
+        )
+
     def test_load_flexible_zone(self):
         # Setup
         flexible_stops = StopPointDataClass.from_xml(self._flexible_zones)
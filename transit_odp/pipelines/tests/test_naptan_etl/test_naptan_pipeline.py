@@ -9,7 +9,7 @@ from transit_odp.naptan.factories import (
     StopPointFactory,
 )
 from transit_odp.naptan.models import StopPoint
-from transit_odp.pipelines.pipelines.naptan_etl.main import run
+from transit_odp.pipelines.pipelines.naptan_etl.main import log_load_summary, run
 
 pytestmark = pytest.mark.django_db
 mut = "transit_odp.pipelines.pipelines.naptan_etl.main"
@@ -65,3 +65,11 @@ def test_naptan_pipeline_updates_data(get_latest_nptg, get_latest_naptan_xml):
     for stop in StopPoint.objects.all():
         assert stop.admin_area.name == "National - National Rail"
         assert stop.locality.name == "Ashgrove"
+
+
+@patch(f"{mut}.logger")
+def test_log_load_summary_counts_failed_rows_separately(logger):
+    log_load_summary("stops", 2, 5, 1, range(10))
+    logger.info.assert_called_once_with(
+        "[naptan_etl: run]: stops inserted 2, updated 5, failed 1, unchanged 4"
+    )
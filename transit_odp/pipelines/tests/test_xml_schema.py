@@ -5,7 +5,11 @@ import requests_mock
 from requests.exceptions import ConnectionError
 
 from transit_odp.pipelines.factories import SchemaDefinitionFactory
-from transit_odp.pipelines.pipelines.xml_schema import SchemaLoader, SchemaUpdater
+from transit_odp.pipelines.pipelines.xml_schema import (
+    SchemaCache,
+    SchemaLoader,
+    SchemaUpdater,
+)
 from transit_odp.timetables.constants import TXC_XSD_PATH
 
 pytestmark = pytest.mark.django_db
@@ -77,3 +81,22 @@ def test_schema_loader_can_unzip(tmp_path):
     loader._schema_dir = tmp_path
     assert loader.path == tmp_path / "TxC" / Path(TXC_XSD_PATH)
     assert loader.path.exists()
+
+
+def test_schema_cache_compiles_each_checksum_once(mocker):
+    compile_schema = mocker.patch.object(
+        SchemaLoader,
+        "schema",
+        new_callable=mocker.PropertyMock,
+        side_effect=lambda: object(),
+    )
+    definition = SchemaDefinitionFactory()
+    cache = SchemaCache()
+
+    schema = cache.get(definition, TXC_XSD_PATH)
+    assert cache.get(definition, TXC_XSD_PATH) is schema
+    assert compile_schema.call_count == 1
+
+    definition.update_definition(b"new data", "schema.zip")
+    assert cache.get(definition, TXC_XSD_PATH) is not schema
+    assert compile_schema.call_count == 2
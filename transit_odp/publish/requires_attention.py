@@ -9,7 +9,8 @@ from waffle import flag_is_active
 
 from transit_odp.avl.require_attention.abods.registery import AbodsRegistery
 from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
-    get_vehicle_activity_operatorref_linename,
+    VehicleActivityErrors,
+    get_vehicle_activity_errors,
 )
 from transit_odp.common.constants import FeatureFlags
 from transit_odp.dqs.constants import Level
@@ -680,19 +681,12 @@ def is_avl_requires_attention(
     noc: str,
     line_name: str,
     synced_in_last_month: bool,
-    uncounted_activity_df: pd.DataFrame,
+    vehicle_activity_errors: VehicleActivityErrors,
 ):
     """Return True if the avl service requires the attention, otherwise False"""
 
     if not noc or (
-        not uncounted_activity_df.loc[
-            (uncounted_activity_df["OperatorRef"] == noc)
-            & (
-                uncounted_activity_df["LineRef"].isin(
-                    [line_name, line_name.replace(" ", "_")]
-                )
-            )
-        ].empty
+        vehicle_activity_errors.has_errors(noc, line_name)
         or f"{line_name}__{noc}" not in synced_in_last_month
     ):
         return True
@@ -702,7 +696,7 @@ def is_avl_requires_attention(
 
 def get_avl_requires_attention_line_level_data(
     org_id: int,
-    uncounted_activity_df: pd.DataFrame = None,
+    vehicle_activity_errors: VehicleActivityErrors = None,
     synced_in_last_month: List = None,
 ) -> List[Dict[str, str]]:
     """
@@ -721,8 +715,8 @@ def get_avl_requires_attention_line_level_data(
     service_codes = [service_code for (service_code, line_name) in otc_map]
     txcfa_map = get_line_level_txc_map_service_base(service_codes)
 
-    if uncounted_activity_df is None or synced_in_last_month is None:
-        uncounted_activity_df = get_vehicle_activity_operatorref_linename()
+    if vehicle_activity_errors is None or synced_in_last_month is None:
+        vehicle_activity_errors = get_vehicle_activity_errors()
         abods_registry = AbodsRegistery()
         synced_in_last_month = abods_registry.records()
 
@@ -733,7 +727,7 @@ def get_avl_requires_attention_line_level_data(
         line_name = service_key[1]
 
         if is_avl_requires_attention(
-            noc, line_name, synced_in_last_month, uncounted_activity_df
+            noc, line_name, synced_in_last_month, vehicle_activity_errors
         ):
             _update_data(object_list, service, line_name)
 
@@ -802,7 +796,7 @@ def get_timetable_records_require_attention_lta_line_level_length(
 
 def get_avl_records_require_attention_lta_line_level_objects(
     lta_list: List,
-    uncounted_activity_df: pd.DataFrame = None,
+    vehicle_activity_errors: VehicleActivityErrors = None,
     synced_in_last_month: List = None,
 ) -> int:
     """
@@ -815,8 +809,8 @@ def get_avl_records_require_attention_lta_line_level_objects(
     object_list = []
     otc_map = get_line_level_otc_map_lta(lta_list)
     txcfa_map = get_line_level_txc_map_lta(lta_list)
-    if uncounted_activity_df is None or synced_in_last_month is None:
-        uncounted_activity_df = get_vehicle_activity_operatorref_linename()
+    if vehicle_activity_errors is None or synced_in_last_month is None:
+        vehicle_activity_errors = get_vehicle_activity_errors()
         abods_registry = AbodsRegistery()
         synced_in_last_month = abods_registry.records()
 
@@ -826,14 +820,7 @@ def get_avl_records_require_attention_lta_line_level_objects(
             operator_ref = file_attribute.national_operator_code
             line_name = service_key[0]
             if (
-                not uncounted_activity_df.loc[
-                    (uncounted_activity_df["OperatorRef"] == operator_ref)
-                    & (
-                        uncounted_activity_df["LineRef"].isin(
-                            [line_name, line_name.replace(" ", "_")]
-                        )
-                    )
-                ].empty
+                vehicle_activity_errors.has_errors(operator_ref, line_name)
                 or f"{line_name}__{operator_ref}" not in synced_in_last_month
             ):
                 _update_data(object_list, service, line_name)
@@ -844,7 +831,7 @@ def get_avl_records_require_attention_lta_line_level_objects(
 
 def get_avl_records_require_attention_lta_line_level_length(
     lta_list: List,
-    uncounted_activity_df: pd.DataFrame = None,
+    vehicle_activity_errors: VehicleActivityErrors = None,
     synced_in_last_month: List = None,
 ) -> int:
     """
@@ -856,7 +843,7 @@ def get_avl_records_require_attention_lta_line_level_length(
     """
     return len(
         get_avl_records_require_attention_lta_line_level_objects(
-            lta_list, uncounted_activity_df, synced_in_last_month
+            lta_list, vehicle_activity_errors, synced_in_last_month
         )
     )
 
@@ -16,6 +16,9 @@ from transit_odp.organisation.factories import (
 )
 from django.utils import timezone
 import transit_odp.publish.requires_attention as publish_attention
+from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
+    VehicleActivityErrors,
+)
 from transit_odp.publish.requires_attention import (
     get_avl_records_require_attention_lta_line_level_length,
     get_timetable_records_require_attention_lta_line_level_length,
@@ -817,7 +820,7 @@ def test_dq_require_attention_without_services():
 
 @override_flag("dqs_require_attention", active=True)
 @patch.object(publish_attention, "AbodsRegistery")
-@patch.object(publish_attention, "get_vehicle_activity_operatorref_linename")
+@patch.object(publish_attention, "get_vehicle_activity_errors")
 @freeze_time("2024-11-24T16:40:40.000Z")
 def test_get_avl_records_require_attention_lta_line_level_length(
     mock_vehicle_activity, mock_abodsregistry
@@ -825,8 +828,8 @@ def test_get_avl_records_require_attention_lta_line_level_length(
     mock_registry_instance = MagicMock()
     mock_abodsregistry.return_value = mock_registry_instance
     mock_registry_instance.records.return_value = ["line1__SDCU", "line2__SDCU"]
-    mock_vehicle_activity.return_value = pd.DataFrame(
-        {"OperatorRef": ["SDCU"], "LineRef": ["line2"]}
+    mock_vehicle_activity.return_value = VehicleActivityErrors.from_dataframe(
+        pd.DataFrame({"OperatorRef": ["SDCU"], "LineRef": ["line2"]})
     )
     org = OrganisationFactory()
     total_services = 9
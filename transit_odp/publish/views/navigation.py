@@ -1,5 +1,4 @@
 from typing import Dict, List, TypedDict
-import pandas as pd
 
 from django.http import HttpResponseRedirect
 from django.views.generic import FormView
@@ -10,7 +9,8 @@ from waffle import flag_is_active
 from config.hosts import PUBLISH_HOST
 from transit_odp.avl.require_attention.abods.registery import AbodsRegistery
 from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
-    get_vehicle_activity_operatorref_linename,
+    VehicleActivityErrors,
+    get_vehicle_activity_errors,
 )
 from transit_odp.common.constants import FeatureFlags
 from transit_odp.common.views import BaseTemplateView
@@ -117,11 +117,11 @@ class AgentDashboardView(OrgUserViewMixin, SingleTableView):
         is_operator_prefetch_sra_active = flag_is_active(
             "", FeatureFlags.OPERATOR_PREFETCH_SRA.value
         )
-        uncounted_activity_df = pd.DataFrame()
+        vehicle_activity_errors = VehicleActivityErrors(frozenset())
         synced_in_last_month = []
 
         if is_avl_require_attention_active and not is_operator_prefetch_sra_active:
-            uncounted_activity_df = get_vehicle_activity_operatorref_linename()
+            vehicle_activity_errors = get_vehicle_activity_errors()
             abods_registry = AbodsRegistery()
             synced_in_last_month = abods_registry.records()
 
@@ -138,7 +138,7 @@ class AgentDashboardView(OrgUserViewMixin, SingleTableView):
                     avl_sra = len(
                         get_avl_requires_attention_line_level_data(
                             record.organisation_id,
-                            uncounted_activity_df,
+                            vehicle_activity_errors,
                             synced_in_last_month,
                         )
                     )
@@ -1,4 +1,4 @@
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.utils.timezone import now
 from django.views import View
 from django_tables2 import SingleTableView
@@ -112,8 +112,9 @@ class ServiceCodeView(View):
             f"{self.org.name}.csv"
         )
         csv_export = ServiceCodesCSV(self.org.id)
-        file_ = csv_export.to_string()
-        response = HttpResponse(file_, content_type="text/csv")
+        response = StreamingHttpResponse(
+            csv_export.to_chunks(), content_type="text/csv"
+        )
         response["Content-Disposition"] = f"attachment; filename={csv_filename}"
         return response
 
@@ -132,7 +133,8 @@ class ComplianceReportView(View):
             csv_export = ComplianceReportDBCSV(self.org.id)
         else:
             csv_export = ComplianceReportCSV(self.org.id)
-        file_ = csv_export.to_string()
-        response = HttpResponse(file_, content_type="text/csv")
+        response = StreamingHttpResponse(
+            csv_export.to_chunks(), content_type="text/csv"
+        )
         response["Content-Disposition"] = f"attachment; filename={csv_filename}"
         return response
@@ -446,7 +446,7 @@ def create_operational_exports_file() -> BinaryIO:
     with zipfile.ZipFile(buffer_, mode="w", compression=ZIP_DEFLATED) as zin:
         for file_ in files:
             Builder = file_.builder
-            zin.writestr(file_.name, Builder().to_string())
+            Builder().to_zip(zin, file_.name)
 
         prefix = "Pandas - to_csv - "
         logger.info(prefix + f"Generating {ORGANISATION_FILENAME}")
@@ -535,10 +535,7 @@ class APIRequestArchive:
             builder.queryset = builder.get_queryset().filter(
                 created__range=(self.start, self.end)
             )
-
-            csvfile = builder.to_temporary_file()
-            zin.write(csvfile.name, "rawapimetrics.csv")
-            csvfile.close()
+            builder.to_zip(zin, "rawapimetrics.csv")
 
             csvfile = get_consumer_breakdown_csv(self.start, self.end)
             zin.write(csvfile.name, DAILY_CONSUMER_FILENAME)
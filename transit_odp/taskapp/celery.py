@@ -1,9 +1,11 @@
+import logging
 import os
 from typing import Final
 
 import environ
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init
 from ddtrace import patch_all
 from django.apps import AppConfig, apps
 from django.conf import settings
@@ -21,6 +23,7 @@ if not settings.configured:
     )  # pragma: no cover
 
 app = Celery("transit_odp")
+logger = logging.getLogger(__name__)
 
 OTC_TASKS: Final = "transit_odp.otc.tasks."
 PIPELINE_TASKS: Final = "transit_odp.pipelines.tasks."
@@ -34,6 +37,23 @@ DISRUPTIONS_TASKS: Final = "transit_odp.disruptions.tasks."
 ORGANISATION_TASKS: Final = "transit_odp.organisation.tasks."
 
 
+@worker_init.connect
+def warm_xsd_schema_cache(**kwargs):
+    if not settings.WARM_XSD_SCHEMA_CACHE:
+        return
+
+    from transit_odp.fares.netex import get_netex_schema
+    from transit_odp.timetables.utils import get_transxchange_schema
+
+    for get_schema in (get_transxchange_schema, get_netex_schema):
+        try:
+            get_schema()
+        except Exception:
+            logger.warning(
+                f"Unable to warm schema with {get_schema.__name__}", exc_info=True
+            )
+
+
 class CeleryAppConfig(AppConfig):
     name = "transit_odp.taskapp"
     verbose_name = "Celery Config"
@@ -84,6 +104,10 @@ class CeleryAppConfig(AppConfig):
                 "task": BROWSE_TASKS + "task_create_change_data_archive",
                 "schedule": crontab(minute=30, hour=0),
             },
+            "prune_timetable_visualiser": {
+                "task": BROWSE_TASKS + "task_prune_timetable_visualiser",
+                "schedule": crontab(minute=0, hour=3),
+            },
             # scheduled at 1am and this task should be the first that runs
             # before other tasks
             "run_naptan_etl": {
@@ -116,6 +140,10 @@ class CeleryAppConfig(AppConfig):
                 "task": AVL_TASKS + "task_create_sirivm_tfl_zipfile",
                 "schedule": 10.0,
             },
+            "refresh_abods_registry": {
+                "task": AVL_TASKS + "task_refresh_abods_registry",
+                "schedule": 30.0 * 60.0,
+            },
             "log_stuck_tasks": {
                 "task": TIMETABLE_TASKS + "task_log_stuck_revisions",
                 "schedule": crontab(minute=0, hour="*"),
@@ -208,6 +236,10 @@ class CeleryAppConfig(AppConfig):
                 "task": ORGANISATION_TASKS + "task_precalculate_operator_sra",
                 "schedule": crontab(minute=0, hour="*"),
             },
+            "task_update_dataset_search_vectors": {
+                "task": ORGANISATION_TASKS + "task_update_dataset_search_vectors",
+                "schedule": crontab(minute=30, hour=2),
+            },
             "task_precalculate_ui_lta_sra": {
                 "task": OTC_TASKS + "task_precalculate_ui_lta_sra",
                 "schedule": crontab(minute=0, hour="*"),
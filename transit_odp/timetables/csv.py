@@ -10,7 +10,8 @@ from waffle import flag_is_active
 
 from transit_odp.avl.require_attention.abods.registery import AbodsRegistery
 from transit_odp.avl.require_attention.weekly_ppc_zip_loader import (
-    get_vehicle_activity_operatorref_linename,
+    VehicleActivityErrors,
+    get_vehicle_activity_errors,
 )
 from transit_odp.browse.common import get_franchise_registration_numbers
 from transit_odp.common.collections import Column
@@ -1280,7 +1281,7 @@ def add_avl_published_status(row: Series, synced_in_last_month) -> str:
 
 
 def add_error_in_avl_to_timetable_matching(
-    row: Series, uncounted_activity_df: pd.DataFrame
+    row: Series, vehicle_activity_errors: VehicleActivityErrors
 ) -> str:
     """
     Returns value for 'Error in AVL to Timetable Matching' column.
@@ -1294,14 +1295,7 @@ def add_error_in_avl_to_timetable_matching(
     line_name = str(row["service_number"])
     operator_ref = row["national_operator_code"]
 
-    if not uncounted_activity_df.loc[
-        (uncounted_activity_df["OperatorRef"] == operator_ref)
-        & (
-            uncounted_activity_df["LineRef"].isin(
-                [line_name, line_name.replace(" ", "_")]
-            )
-        )
-    ].empty:
+    if vehicle_activity_errors.has_errors(operator_ref, line_name):
         return "Yes"
     return "No"
 
@@ -1505,7 +1499,7 @@ def _get_timetable_compliance_report_dataframe() -> pd.DataFrame:
     today = datetime.date.today()
     abods_registry = AbodsRegistery()
     synced_in_last_month = abods_registry.records()
-    uncounted_activity_df = get_vehicle_activity_operatorref_linename()
+    vehicle_activity_errors = get_vehicle_activity_errors()
 
     txc_service_map = {}
     txc_attributes = TXCFileAttributes.objects.get_active_txc_files_line_level()
@@ -1638,7 +1632,7 @@ def _get_timetable_compliance_report_dataframe() -> pd.DataFrame:
         )
     )
     merged["error_in_avl_to_timetable_matching"] = merged.apply(
-        lambda x: add_error_in_avl_to_timetable_matching(x, uncounted_activity_df),
+        lambda x: add_error_in_avl_to_timetable_matching(x, vehicle_activity_errors),
         axis=1,
     )
     merged["avl_requires_attention"] = merged.apply(
@@ -161,14 +161,17 @@ def flexible_journey_patterns_to_dataframe(services, stop_activities):
 
 
 def services_to_dataframe(
-    services: list, txc_file_id: Union[int, None]
+    services: list,
+    txc_file_id: Union[int, None],
+    is_timetable_visualiser_active: Union[bool, None] = None,
 ) -> pd.DataFrame:
     """Convert a TransXChange Service XMLElement to a pandas DataFrame"""
     items = []
     lines_list = []
-    is_timetable_visualiser_active = flag_is_active(
-        "", "is_timetable_visualiser_active"
-    )
+    if is_timetable_visualiser_active is None:
+        is_timetable_visualiser_active = flag_is_active(
+            "", "is_timetable_visualiser_active"
+        )
     for service in services:
         service_code = service.get_element("ServiceCode").text
         start_date = service.get_element(["OperatingPeriod", "StartDate"]).text
@@ -76,7 +76,11 @@ class TransXChangePipeline:
             )
         elif self.file_obj.file.name.endswith("xml"):
             extractor = TransXChangeExtractor(
-                self.file_obj, self.start_time, self.stop_activity_cache, txc_files
+                self.file_obj,
+                self.start_time,
+                self.stop_activity_cache,
+                txc_files,
+                cache=True,
             )
         else:
             raise exceptions.NoDataFoundError(filename)
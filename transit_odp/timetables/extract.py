@@ -1,10 +1,13 @@
+import pickle
 import uuid
 import zipfile
 from datetime import datetime
 from pathlib import Path
 
+import billiard
 import pandas as pd
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from django.core.files.base import File
 from shapely.geometry import Point
 from waffle import flag_is_active
@@ -37,11 +40,20 @@ from transit_odp.timetables.dataframes import (
     stop_point_refs_to_dataframe,
     create_vj_tracks_map,
 )
+from transit_odp.timetables import extract_workers
 from transit_odp.timetables.exceptions import MissingLines
 from transit_odp.timetables.transxchange import TransXChangeDocument
+from transit_odp.validate.utils import local_file_path
 
 logger = get_task_logger(__name__)
 
+EXTRACT_FLAGS = ("is_timetable_visualiser_active", "extract_tracks_data")
+
+
+def get_extract_flags():
+    """Returns the state of the waffle flags the extraction step depends on."""
+    return {name: flag_is_active("", name) for name in EXTRACT_FLAGS}
+
 
 class TransXChangeExtractor:
     """An API equivalent replacement for XmlFileParser."""
@@ -52,12 +64,15 @@ class TransXChangeExtractor:
         start_time,
         stop_activity_cache=[],
         df_txc_files=pd.DataFrame(),
+        flags=None,
+        cache=False,
     ):
         self.file_id = uuid.uuid4()
         self.filename = file_obj.name
-        self.doc = TransXChangeDocument(file_obj.file)
+        self.doc = TransXChangeDocument(file_obj.file, cache=cache)
         self.start_time = start_time
         self.stop_activity_cache = stop_activity_cache
+        self.flags = flags
         self.txc_file_id = None
         if self.filename:
             self.txc_file_id = self.get_txc_file_id(
@@ -85,8 +100,8 @@ class TransXChangeExtractor:
         Finally, we identify the Routes by hashing together the list of
         'route_section_hash' to form 'route_hash'.
         """
-        is_timetable_visualiser_active = flag_is_active(
-            "", "is_timetable_visualiser_active"
+        is_timetable_visualiser_active = self.is_flag_active(
+            "is_timetable_visualiser_active"
         )
         logger.debug("Extracting data")
         logger.debug(f"file_id: {self.file_id}, file_name: {self.filename}")
@@ -232,6 +247,12 @@ class TransXChangeExtractor:
             flexible_operation_periods=flexible_operation_periods,
         )
 
+    def is_flag_active(self, name):
+        """Returns the state of a waffle flag, preferring the one passed in."""
+        if self.flags is not None and name in self.flags:
+            return self.flags[name]
+        return flag_is_active("", name)
+
     def get_txc_file_id(self, txc_files, filename):
         txc_file_id = None
         if filename and not txc_files.empty:
@@ -271,7 +292,9 @@ class TransXChangeExtractor:
     def extract_services(self) -> pd.DataFrame:
         try:
             services_df, lines_df = services_to_dataframe(
-                self.doc.get_services(), self.txc_file_id
+                self.doc.get_services(),
+                self.txc_file_id,
+                self.is_flag_active("is_timetable_visualiser_active"),
             )
         except MissingLines as err:
             message = (
@@ -342,7 +365,7 @@ class TransXChangeExtractor:
         # Get services and journey patterns
         tracks = pd.DataFrame()
         vj_tracks_map = pd.DataFrame()
-        extract_tracks_data = flag_is_active("", "extract_tracks_data")
+        extract_tracks_data = self.is_flag_active("extract_tracks_data")
         if not extract_tracks_data:
             return pd.DataFrame(), pd.DataFrame()
         services = self.doc.get_services()
@@ -616,11 +639,15 @@ class TransXChangeZipExtractor:
         start_time,
         stop_activity_cache,
         txc_files=pd.DataFrame(),
+        workers=None,
     ):
         self.file_obj = file_obj
         self.start_time = start_time
         self.stop_activity_cache = stop_activity_cache
         self.df_txc_files = txc_files
+        if workers is None:
+            workers = settings.TXC_EXTRACT_WORKERS
+        self.workers = workers
 
     def extract(self) -> ExtractedData:
         """
@@ -650,8 +677,19 @@ class TransXChangeZipExtractor:
         file_count = len(filenames)
         logger.info(f"Total files in zip: {file_count}")
 
-        for i, filename in enumerate(filenames):
+        xml_filenames = []
+        for filename in filenames:
             if filename.endswith(".xml") and not filename.startswith("__"):
+                xml_filenames.append(filename)
+            else:
+                logger.info(
+                    f"skipping: {filename} as file has failed the validation checks"
+                )
+
+        if self.workers > 1 and len(xml_filenames) > 1:
+            extracts = self.extract_files_in_parallel(xml_filenames)
+        else:
+            for filename in xml_filenames:
                 logger.info(f"Extracting: {filename}")
                 with z.open(filename, "r") as f:
                     file_obj = File(f, name=filename)
@@ -660,13 +698,47 @@ class TransXChangeZipExtractor:
                         self.start_time,
                         self.stop_activity_cache,
                         self.df_txc_files,
+                        cache=True,
                     )
                     extracted = extractor.extract()
                     extracts.append(extracted)
-            else:
-                logger.info(
-                    f"skipping: {filename} as file has failed the validation checks"
-                )
+        return self.merge(extracts)
+
+    def extract_files_in_parallel(self, filenames):
+        """
+        Extracts the xml files across a pool of worker processes.
+
+        Each worker reads its files straight out of the zip, so the files are
+        never held in this process. The results are returned in the order of
+        `filenames` so that merging them gives exactly the same ExtractedData as
+        extracting the files serially.
+        billiard is used rather than multiprocessing since the Celery workers this
+        runs in are daemonic and multiprocessing refuses to start their children.
+        """
+        processes = min(self.workers, len(filenames))
+        logger.info(f"Extracting {len(filenames)} files with {processes} workers")
+        context = {
+            "start_time": self.start_time,
+            "stop_activity_cache": list(self.stop_activity_cache),
+            "df_txc_files": self.df_txc_files,
+            "flags": get_extract_flags(),
+        }
+        with local_file_path(self.file_obj) as zip_path:
+            pool = billiard.get_context("spawn").Pool(
+                processes=processes,
+                initializer=extract_workers.init_worker,
+                initargs=(zip_path, pickle.dumps(context)),
+            )
+            try:
+                return list(pool.imap(extract_workers.extract_file, filenames))
+            finally:
+                pool.terminate()
+                pool.join()
+
+    def merge(self, extracts):
+        """
+        Merges the ExtractedData of each file into that of the whole zip.
+        """
         return ExtractedData(
             services=concat_and_dedupe((extract.services for extract in extracts)),
             stop_points=concat_and_dedupe(
@@ -0,0 +1,41 @@
+"""Entry points of the processes that extract the files of a zip in parallel.
+
+The processes are spawned, see transit_odp.validate.xml_workers. The context
+shared by every file is unpickled once Django is set up.
+"""
+import pickle
+import zipfile
+
+_context = {}
+_zip = None
+
+
+def init_worker(zip_path: str, context: bytes):
+    """Sets up Django, the context shared by every file and opens the zip.
+
+    Args:
+        zip_path (str): The path of the zip on the local file system.
+        context (bytes): The pickled keyword arguments of every extractor.
+    """
+    global _zip
+    import django
+
+    django.setup()
+    _context.update(pickle.loads(context))
+    _zip = zipfile.ZipFile(zip_path)
+
+
+def extract_file(filename: str):
+    """Extracts a single TransXChange file, read straight out of the zip.
+
+    Returns:
+        ExtractedData: The data extracted from the file.
+    """
+    from django.core.files.base import File
+
+    from transit_odp.timetables.extract import TransXChangeExtractor, logger
+
+    logger.info(f"Extracting: {filename}")
+    with _zip.open(filename, "r") as f:
+        extractor = TransXChangeExtractor(File(f, name=filename), **_context)
+        return extractor.extract()
@@ -0,0 +1,133 @@
+import datetime
+import statistics
+import time
+
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from transit_odp.timetables.utils import (
+    fill_missing_journey_codes,
+    get_df_operating_vehicle_journey,
+    get_df_timetable_visualiser,
+    get_non_operating_vj_serviced_org,
+)
+
+TARGET_DATE = datetime.date(2024, 2, 13)
+
+
+def get_df_vehicle_journeys(journeys: int, stops: int) -> pd.DataFrame:
+    """
+    A service running a journey every few minutes through the day, every journey
+    calling at every stop. Every tenth journey is missing its journey code.
+    """
+    rows = []
+    for journey in range(journeys):
+        minutes = 5 * 60 + journey * 17 * 60 // journeys
+        start_time = datetime.time(minutes // 60, minutes % 60)
+        for stop in range(stops):
+            departure = (minutes + stop) % (24 * 60)
+            rows.append(
+                {
+                    "common_name": f"Stop {stop}",
+                    "stop_sequence": stop + 1,
+                    "vehicle_journey_code": "" if journey % 10 == 0 else str(journey),
+                    "departure_time": datetime.time(departure // 60, departure % 60),
+                    "atco_code": f"0100BRP{stop:05}",
+                    "departure_day_shift": False,
+                    "start_time": start_time,
+                    "vehicle_journey_id": journey,
+                    "street": "High Street",
+                    "indicator": "opp",
+                    "stop_type": "BCT",
+                    "service_pattern_stop_id": journey * stops + stop,
+                    "day_of_week": "Tuesday",
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def get_df_serviced_org(journeys: int) -> pd.DataFrame:
+    """
+    Every fifth journey only runs in the working days of a serviced organisation
+    """
+    return pd.DataFrame(
+        [
+            {
+                "vehicle_journey_id": journey,
+                "operating_on_working_days": True,
+                "start_date": datetime.date(2024, 1, 8),
+                "end_date": datetime.date(2024, 2, 9),
+            }
+            for journey in range(0, journeys, 5)
+        ]
+    )
+
+
+def get_df_observations(journeys: int, stops: int) -> pd.DataFrame:
+    """
+    An observation on the first stop of every twentieth journey
+    """
+    return pd.DataFrame(
+        [
+            {
+                "importance": "Critical",
+                "observation": "Incorrect stop type",
+                "service_pattern_stop_id": journey * stops,
+                "vehicle_journey_id": journey,
+            }
+            for journey in range(0, journeys, 20)
+        ]
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks building the timetable visualiser of a line from its vehicle "
+        "journeys for a synthetic service"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--journeys", type=int, default=2000, help="The number of journeys"
+        )
+        parser.add_argument(
+            "--stops", type=int, default=200, help="The number of stops per journey"
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="The number of times to build the timetable",
+        )
+
+    def handle(self, *args, **options):
+        journeys, stops = options["journeys"], options["stops"]
+        df_vehicle_journeys = get_df_vehicle_journeys(journeys, stops)
+        df_serviced_org = get_df_serviced_org(journeys)
+        df_observations = get_df_observations(journeys, stops)
+        observation_contents = {"Incorrect stop type": {"title": "Incorrect stop type"}}
+        self.stdout.write(
+            f"{journeys} journeys of {stops} stops, " f"{len(df_vehicle_journeys)} rows"
+        )
+
+        timings = []
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            df = fill_missing_journey_codes(df_vehicle_journeys.copy())
+            df = get_df_operating_vehicle_journey(
+                TARGET_DATE.strftime("%A"), df, [], []
+            )
+            non_operating = get_non_operating_vj_serviced_org(
+                TARGET_DATE, df_serviced_org
+            )
+            df = df[~df["vehicle_journey_id"].isin(non_operating)]
+            df_timetable, *_ = get_df_timetable_visualiser(
+                df, observation_contents, df_observations
+            )
+            timings.append(time.perf_counter() - start)
+
+        self.stdout.write(
+            f"timetable of {df_timetable.shape[0]} stops by "
+            f"{df_timetable.shape[1] - 1} journeys, "
+            f"min {min(timings):.3f}s, mean {statistics.mean(timings):.3f}s"
+        )
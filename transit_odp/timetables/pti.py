@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import io
 import zipfile
 from logging import getLogger
 from pathlib import Path
 from typing import BinaryIO, Iterable, List
 
+import billiard
+from django.conf import settings
+
 from transit_odp.common.loggers import DatasetPipelineLoggerContext, PipelineAdapter
 from transit_odp.common.types import JSONFile
 from transit_odp.common.utils import sha1sum
 from transit_odp.data_quality.pti.models import Violation
 from transit_odp.data_quality.pti.validators import PTIValidator
 from transit_odp.organisation.models import DatasetRevision
+from transit_odp.timetables import pti_workers
 from transit_odp.timetables.proxies import TimetableDatasetRevision
+from transit_odp.timetables.transxchange import TransXChangeDocument
+from transit_odp.validate.utils import local_file_path
 
 PTI_PATH = Path(__file__).parent / "pti_schema.json"
 
@@ -19,8 +26,12 @@ logger = getLogger(__name__)
 
 
 class DatasetPTIValidator:
-    def __init__(self, schema: JSONFile, valid_txc_files=[]):
-        self._validator = PTIValidator(schema)
+    def __init__(self, schema: JSONFile, valid_txc_files=[], workers=None):
+        self._schema = schema.read()
+        self._validator = PTIValidator(io.StringIO(self._schema))
+        if workers is None:
+            workers = settings.PTI_VALIDATION_WORKERS
+        self.workers = workers
 
     def iter_get_files(self, revision: DatasetRevision) -> Iterable[BinaryIO]:
         context = DatasetPipelineLoggerContext(object_id=revision.dataset_id)
@@ -62,19 +73,65 @@ class DatasetPTIValidator:
         adapter = PipelineAdapter(logger, {"context": context})
         live_hashes = self.get_live_hashes(revision, adapter)
         adapter.info("Iterating over the files of the revision")
+        parallel = self.workers > 1 and zipfile.is_zipfile(revision.upload_file)
+        changed_files = []
         for xml in self.iter_get_files(revision=revision):
             if sha1sum(xml.read()) in live_hashes:
                 adapter.info(f"{xml.name} unchanged, skipping.")
                 continue
+            elif parallel:
+                changed_files.append(xml.name)
             else:
-                xml.seek(0)
-                adapter.info(f"File {xml.name} changed, validating...")
-                self._validator.is_valid(xml)
-                adapter.info(f"File {xml.name} completed validation")
+                self.validate_file(xml, adapter)
+
+        if len(changed_files) == 1:
+            with zipfile.ZipFile(revision.upload_file) as zf:
+                with zf.open(changed_files[0]) as xml:
+                    self.validate_file(xml, adapter)
+        elif changed_files:
+            self._validator.violations += self.get_violations_in_parallel(
+                revision.upload_file, changed_files, adapter
+            )
 
         adapter.info(f"Revision contains {len(self._validator.violations)} violations.")
         return self._validator.violations
 
+    def validate_file(self, xml: BinaryIO, adapter: PipelineAdapter) -> None:
+        adapter.info(f"File {xml.name} changed, validating...")
+        document = TransXChangeDocument(xml, cache=True)
+        self._validator.is_valid(xml, document=document.tree)
+        adapter.info(f"File {xml.name} completed validation")
+
+    def get_violations_in_parallel(
+        self, zip_file: BinaryIO, filenames: List[str], adapter: PipelineAdapter
+    ) -> List[Violation]:
+        """PTI validates files of a zip across a pool of worker processes.
+
+        Each worker opens the zip itself and only the names of the files are
+        sent to it. The violations of each file are returned in the order of
+        `filenames`, so they are exactly those a serial run would have found,
+        in the same order.
+        """
+        processes = min(self.workers, len(filenames))
+        chunksize = max(1, len(filenames) // (processes * 4))
+        adapter.info(f"PTI validating {len(filenames)} files with {processes} workers")
+        with local_file_path(zip_file) as zip_path:
+            pool = billiard.get_context("spawn").Pool(
+                processes=processes,
+                initializer=pti_workers.init_worker,
+                initargs=(zip_path, self._schema),
+            )
+            try:
+                violations = []
+                for file_violations in pool.imap(
+                    pti_workers.validate_file, filenames, chunksize=chunksize
+                ):
+                    violations += file_violations
+                return violations
+            finally:
+                pool.terminate()
+                pool.join()
+
     @classmethod
     def from_path(cls, path: Path) -> DatasetPTIValidator:
         with path.open("r") as schema_file:
@@ -0,0 +1,42 @@
+"""Entry points of the processes that PTI validate the files of a zip in parallel.
+
+The processes are spawned, see transit_odp.validate.xml_workers.
+"""
+import io
+import zipfile
+
+_validator = None
+_zip = None
+
+
+def init_worker(zip_path: str, schema: str):
+    """Sets up Django, the PTIValidator every file is checked with and opens the zip.
+
+    Args:
+        zip_path (str): The path of the zip on the local file system.
+        schema (str): The PTI schema.
+    """
+    global _validator, _zip
+    import django
+
+    django.setup()
+
+    from transit_odp.data_quality.pti.validators import PTIValidator
+
+    _validator = PTIValidator(io.StringIO(schema))
+    _zip = zipfile.ZipFile(zip_path)
+
+
+def validate_file(name: str):
+    """PTI validates a single TransXChange file, read straight out of the zip.
+
+    Returns:
+        List[Violation]: The violations found in the file.
+    """
+    from transit_odp.timetables.transxchange import TransXChangeDocument
+
+    _validator.violations = []
+    with _zip.open(name) as source:
+        document = TransXChangeDocument(source)
+        _validator.is_valid(source, document=document.tree)
+    return _validator.violations
@@ -295,7 +295,7 @@ def task_post_schema_check(revision_id: int, task_id: int):
     adapter = get_dataset_adapter_from_revision(logger=logger, revision=revision)
     adapter.info("Starting post schema validation check.")
     violations = []
-    parser = TransXChangeDatasetParser(revision.upload_file)
+    parser = TransXChangeDatasetParser(revision.upload_file, cache=True)
     doc_list = list(parser.get_documents())
     if not doc_list:
         message = f"Validation task: task_post_schema_check, no file to process, zip file: {revision.upload_file.name}"
@@ -354,7 +354,7 @@ def task_extract_txc_file_data(revision_id: int, task_id: int):
     try:
         # If we're in the update flow lets clear out "old" files.
         revision.txc_file_attributes.all().delete()
-        parser = TransXChangeDatasetParser(revision.upload_file)
+        parser = TransXChangeDatasetParser(revision.upload_file, cache=True)
         files = [
             TXCFile.from_txc_document(doc, use_path_filename=True)
             for doc in parser.get_documents()
@@ -1,14 +1,21 @@
+import datetime
 import io
 import zipfile
+from pathlib import Path
 
-from django.core.files.base import ContentFile
+import pandas as pd
+from django.core.files.base import ContentFile, File
 from django.test import TestCase
 
 from transit_odp.organisation.constants import DatasetType
 from transit_odp.organisation.factories import DatasetRevisionFactory
 from transit_odp.timetables.etl import TransXChangePipeline
+from transit_odp.timetables.extract import TransXChangeZipExtractor
+from transit_odp.transmodel.models import StopActivity
 from transit_odp.validate.utils import filter_and_repackage_zip
 
+DATA_DIR = Path(__file__).parent / "data"
+
 
 class TestFilterAndRepackageZip(TestCase):
     def setUp(self):
@@ -134,3 +141,48 @@ class TestFilterAndRepackageZip(TestCase):
             self.assertEqual(
                 output_zip.read("file3.xml").decode(), "<root>Content3</root>"
             )
+
+
+def test_parallel_extraction_matches_serial_extraction(mocker):
+    mocker.patch("transit_odp.timetables.extract.flag_is_active", return_value=False)
+    filenames = [
+        "ea_20-1A-A-y08-1.xml",
+        "test_flexible_and_standard_service.xml",
+        "test_flexiblezones_tag_fixedstop_tag.xml",
+        "grid_wsg84_stoppoints.xml",
+    ]
+    zip_stream = io.BytesIO()
+    with zipfile.ZipFile(zip_stream, "w") as zf:
+        for filename in filenames:
+            zf.write(DATA_DIR / filename, filename)
+    stop_activities = [
+        StopActivity(id=index, name=name)
+        for index, name in enumerate(["pickUp", "setDown", "pickUpAndSetDown", "none"])
+    ]
+    start_time = datetime.datetime.now()
+
+    extracted = []
+    for workers in (0, 2):
+        zip_stream.seek(0)
+        extractor = TransXChangeZipExtractor(
+            File(zip_stream, name="timetables.zip"),
+            start_time,
+            stop_activities,
+            workers=workers,
+        )
+        extracted.append(extractor.extract())
+
+    serial, parallel = extracted
+    assert parallel.line_names == serial.line_names
+    assert parallel.stop_count == serial.stop_count
+    assert parallel.timing_point_count == serial.timing_point_count
+    for name in ("services", "stop_points", "journey_patterns", "timing_links"):
+        expected = (
+            getattr(serial, name).reset_index().drop(columns="file_id", errors="ignore")
+        )
+        actual = (
+            getattr(parallel, name)
+            .reset_index()
+            .drop(columns="file_id", errors="ignore")
+        )
+        pd.testing.assert_frame_equal(actual, expected)
@@ -1,3 +1,4 @@
+import zipfile
 from pathlib import Path
 
 import pytest
@@ -10,7 +11,7 @@ from transit_odp.organisation.factories import (
 )
 from transit_odp.pipelines.exceptions import PipelineException
 from transit_odp.timetables.proxies import TimetableDatasetRevision
-from transit_odp.timetables.pti import DatasetPTIValidator, get_pti_validator
+from transit_odp.timetables.pti import PTI_PATH, DatasetPTIValidator, get_pti_validator
 from transit_odp.timetables.tasks import task_pti_validation
 
 DATA_DIR = Path(__file__).parent / "data"
@@ -39,6 +40,45 @@ def test_pti_validation():
     assert len(violations) > 0
 
 
+class InProcessPool:
+    """Runs a pool's work in the test process, so it shares the test database."""
+
+    def __init__(self, processes, initializer, initargs):
+        initializer(*initargs)
+
+    def imap(self, func, iterable, chunksize=1):
+        return map(func, iterable)
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def test_pti_validation_in_parallel_matches_serial(mocker, tmp_path):
+    filepath = tmp_path / "timetables.zip"
+    with zipfile.ZipFile(DATA_DIR / "3_pti_pass.zip") as source:
+        with zipfile.ZipFile(filepath, "w") as zf:
+            for name in source.namelist():
+                zf.writestr(name, source.read(name))
+            zf.write(DATA_DIR / "pti_xml_test.xml", "pti_xml_test.xml")
+            zf.write(DATA_DIR / "pti_xml_test.xml", "pti_xml_test_copy.xml")
+    revision = DatasetRevisionFactory(
+        upload_file__from_path=filepath.as_posix(), is_published=False
+    )
+    revision = TimetableDatasetRevision.objects.get(id=revision.id)
+    context = mocker.patch("transit_odp.timetables.pti.billiard.get_context")
+    context.return_value.Pool = InProcessPool
+
+    serial = DatasetPTIValidator.from_path(PTI_PATH).get_violations(revision)
+    with PTI_PATH.open("r") as f:
+        parallel = DatasetPTIValidator(f, workers=2).get_violations(revision)
+
+    assert len(serial) > 0
+    assert [v.model_dump() for v in parallel] == [v.model_dump() for v in serial]
+
+
 def test_pti_validation_passes_on_zip():
     """
     Given a revision with a zipfile containing no pti violations
@@ -1,9 +1,23 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from django.core.files.base import File
+from lxml import etree
+
 from transit_odp.timetables.transxchange import (
     TransXChangeDocument,
+    TransXChangeDocumentCache,
     GRID_LOCATION,
     WSG84_LOCATION,
+    estimate_tree_size,
 )
 from transit_odp.data_quality.pti.tests.conftest import TXCFile
+from transit_odp.data_quality.pti.validators import PTIValidator
+from transit_odp.timetables.extract import TransXChangeExtractor
+from transit_odp.timetables.pti import PTI_PATH
+
+DATA_DIR = Path(__file__).parent / "data"
 
 
 def test_get_location_system():
@@ -174,3 +188,57 @@ def test_has_latitude():
     stop_points = doc.get_stop_points()
     has_latitude = doc.has_latitude(stop_points[0])
     assert has_latitude == True
+
+
+def test_cached_documents_with_the_same_content_share_a_parse():
+    first = TransXChangeDocument(TXCFile("<Services/>"), cache=True)
+    second = TransXChangeDocument(TXCFile("<Services/>"), cache=True)
+    different = TransXChangeDocument(TXCFile("<Operators/>"), cache=True)
+
+    assert first.hash == second.hash
+    assert first.tree is second.tree
+    assert different.tree is not first.tree
+
+
+def test_documents_are_not_cached_by_default():
+    first = TransXChangeDocument(TXCFile("<Lines/>"))
+    second = TransXChangeDocument(TXCFile("<Lines/>"))
+    cached = TransXChangeDocument(TXCFile("<Lines/>"), cache=True)
+
+    assert first.hash is None
+    assert first.tree is not second.tree
+    assert cached.tree is not first.tree
+
+
+def test_document_cache_evicts_least_recently_used_trees():
+    cache = TransXChangeDocumentCache(max_bytes=estimate_tree_size(10))
+    cache.add("a.xml", "a", "tree_a", 4)
+    cache.add("b.xml", "b", "tree_b", 4)
+    assert cache.get("a.xml", "a") == "tree_a"
+
+    cache.add("c.xml", "c", "tree_c", 4)
+
+    assert cache.get("a.xml", "a") == "tree_a"
+    assert cache.get("b.xml", "b") is None
+    assert cache.get("c.xml", "c") == "tree_c"
+    assert cache.get("c.xml", None) is None
+
+
+@pytest.mark.django_db
+def test_pipeline_stages_do_not_modify_the_cached_tree(mocker):
+    mocker.patch("transit_odp.timetables.extract.flag_is_active", return_value=False)
+    path = DATA_DIR / "ea_20-1A-A-y08-1.xml"
+    with path.open("rb") as f:
+        document = TransXChangeDocument(f, cache=True)
+    before = etree.tostring(document.tree)
+
+    with path.open("rb") as f:
+        extractor = TransXChangeExtractor(
+            File(f, name=path.name), datetime.now(), cache=True
+        )
+        extractor.extract()
+    with PTI_PATH.open("r") as schema, path.open("rb") as f:
+        PTIValidator(schema).is_valid(File(f, name=path.name), document=document.tree)
+
+    assert extractor.doc.tree is document.tree
+    assert etree.tostring(document.tree) == before
@@ -199,6 +199,35 @@ def test_get_df_timetable_visualiser():
     )
     assert actual_df_vehicle_journey.empty
 
+    df_operating = df_vehicle_journey_operating.assign(
+        departure_time=pd.to_datetime(
+            df_vehicle_journey_operating["departure_time"], format="%H:%M:%S"
+        ).dt.time,
+        start_time=pd.to_datetime(
+            df_vehicle_journey_operating["start_time"], format="%H:%M:%S"
+        ).dt.time,
+        stop_type="BCT",
+    )
+    actual_df_vehicle_journey, stops, observations = get_df_timetable_visualiser(
+        df_operating, {}, pd.DataFrame()
+    )
+    actual_departure_times = actual_df_vehicle_journey.set_index("Journey Code").map(
+        lambda cell: cell["departure_time"]
+    )
+
+    pd.testing.assert_frame_equal(
+        actual_departure_times,
+        expected_df_timetable_visualiser,
+        check_names=False,
+    )
+    assert actual_df_vehicle_journey["6001"][0] == {
+        "departure_time": "06:45",
+        "journey_id": 540,
+    }
+    assert len(stops) == len(expected_df_timetable_visualiser)
+    assert stops["Hgte Bus Stn Stand 3_0"]["atco_code"] == "3200YND12500"
+    assert observations == {}
+
 
 def test_get_vehicle_journey_codes_sorted():
     """
@@ -1,8 +1,10 @@
+import zipfile
 from datetime import timedelta
 from pathlib import Path
 
 import pytest
 from django.utils import timezone
+from lxml import etree
 
 from transit_odp.organisation.factories import (
     DatasetFactory,
@@ -13,7 +15,11 @@ from transit_odp.pipelines.exceptions import PipelineException
 from transit_odp.pipelines.models import DatasetETLTaskResult
 from transit_odp.timetables.proxies import TimetableDatasetRevision
 from transit_odp.timetables.tasks import task_scan_timetables
-from transit_odp.timetables.validate import PostSchemaValidator, TXCRevisionValidator
+from transit_odp.timetables.validate import (
+    DatasetTXCValidator,
+    PostSchemaValidator,
+    TXCRevisionValidator,
+)
 from transit_odp.validate.antivirus import (
     AntiVirusError,
     ClamConnectionError,
@@ -416,3 +422,58 @@ def test_check_file_names_pii_information(file_names, violation_count):
     validator = PostSchemaValidator(file_names)
     violations = validator.get_violations()
     assert len(violations) == violation_count
+
+
+class InProcessPool:
+    """Runs a pool's work in the test process, so it shares the test database."""
+
+    def __init__(self, processes, initializer, initargs):
+        initializer(*initargs)
+
+    def imap(self, func, iterable, chunksize=1):
+        return map(func, iterable)
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def test_schema_validation_in_parallel_matches_serial(mocker, tmp_path):
+    schema = etree.XMLSchema(
+        etree.fromstring(
+            b"""<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+            <xs:element name="TransXChange" type="xs:string"/>
+            </xs:schema>"""
+        )
+    )
+    mocker.patch(
+        "transit_odp.timetables.validate.get_transxchange_schema", return_value=schema
+    )
+    mocker.patch(
+        "transit_odp.timetables.utils.get_transxchange_schema", return_value=schema
+    )
+    context = mocker.patch("transit_odp.timetables.validate.billiard.get_context")
+    context.return_value.Pool = InProcessPool
+
+    filepath = tmp_path / "timetables.zip"
+    with zipfile.ZipFile(filepath, "w") as zf:
+        zf.writestr("file1.xml", "<TransXChange>valid</TransXChange>")
+        zf.writestr("file2.xml", "<TransXChange><Services/></TransXChange>")
+        zf.writestr("file3.xml", "<TransXChange>valid</TransXChange>")
+        zf.writestr("file4.xml", "<TransXChange>")
+        zf.writestr("file5.xml", "<Services/>")
+    revision = DatasetRevisionFactory(upload_file__from_path=filepath.as_posix())
+
+    serial_validator = DatasetTXCValidator(revision, workers=0)
+    serial = serial_validator.get_violations()
+    parallel_validator = DatasetTXCValidator(revision, workers=2)
+    parallel = parallel_validator.get_violations()
+
+    assert [v.filename for v in serial] == ["file2.xml", "file4.xml", "file5.xml"]
+    assert [v.model_dump() for v in parallel] == [v.model_dump() for v in serial]
+    assert (
+        parallel_validator.get_failed_violations_filenames()
+        == serial_validator.get_failed_violations_filenames()
+    )
@@ -1,9 +1,13 @@
 import logging
+import os
+import threading
 import zipfile
+from collections import OrderedDict
 from collections.abc import Iterator
 from pathlib import Path
 from typing import List, Optional
 
+from django.conf import settings
 from lxml import etree
 from pydantic import BaseModel
 
@@ -85,26 +89,120 @@ class TransXChangeElement(XMLElement):
         return super()._make_xpath(xpath)
 
 
+# A parsed lxml tree takes roughly 8 to 10 times the memory of its source XML,
+# measured over the larger TransXChange files in the test data.
+TREE_MEMORY_FACTOR = 10
+
+
+def estimate_tree_size(source_size: int) -> int:
+    """Estimates the memory, in bytes, of the parsed tree of a source."""
+    return source_size * TREE_MEMORY_FACTOR
+
+
+class TransXChangeDocumentCache:
+    """A process-wide LRU cache of parsed TransXChange trees.
+
+    Only the timetable pipeline stages use the cache, by creating their
+    documents with `cache=True`. The stages are separate Celery tasks chained
+    together, so a parsed lxml tree cannot be handed from one stage to the next,
+    but the tasks of a chain run in the same worker process. Keeping the trees
+    here lets every stage that reads the same file of a revision share a single
+    parse. Trees are keyed by the name and SHA-1 hash of their source, so a
+    stage only ever gets the parse of the exact bytes it read. The cache is
+    bounded by the estimated memory of the cached trees, see
+    `estimate_tree_size`.
+
+    The same tree is handed to every stage, and to every thread, that reads the
+    file, so the trees must only ever be read. Nothing in the pipeline modifies
+    a parsed TransXChange tree, copy it first if that is ever needed.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._trees = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, hash_: Optional[str]):
+        if hash_ is None:
+            return None
+
+        key = (str(name), hash_)
+        with self._lock:
+            entry = self._trees.get(key)
+            if entry is None:
+                return None
+            self._trees.move_to_end(key)
+            return entry[0]
+
+    def add(self, name: str, hash_: Optional[str], tree, source_size: int) -> None:
+        size = estimate_tree_size(source_size)
+        if hash_ is None or size > self.max_bytes:
+            return
+
+        key = (str(name), hash_)
+        with self._lock:
+            previous = self._trees.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._trees[key] = (tree, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._trees.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._trees.clear()
+            self._size = 0
+
+
+document_cache = TransXChangeDocumentCache(settings.TXC_DOCUMENT_CACHE_MAX_BYTES)
+
+
 class TransXChangeDocument:
     """A class for handling and validating TransXChange XML Documents."""
 
-    def __init__(self, source):
+    def __init__(self, source, tree=None, cache=False):
         """Initialise class.
 
         Args:
             source (path|file|url): Something that can parsed by `lxml.etree.parse`.
+            tree (etree._ElementTree): An already parsed tree of `source`.
+            cache (bool): Share the parse of `source` through `document_cache`,
+                only the timetable pipeline stages should set this.
 
         """
         self.hash = None
-        if hasattr(source, "seek"):
-            source.seek(0)
-            self.hash = sha1sum(source.read())
-            source.seek(0)
+        self.size = 0
         self.source = source
         self.name = getattr(source, "name", source)
-        self._tree = etree.parse(self.source)
+        if cache:
+            self._hash_source()
+            if tree is None:
+                tree = document_cache.get(self.name, self.hash)
+        if tree is None:
+            tree = etree.parse(self.source)
+        if cache:
+            document_cache.add(self.name, self.hash, tree, self.size)
+        self._tree = tree
         self._root = TransXChangeElement(self._tree.getroot())
 
+    def _hash_source(self):
+        if hasattr(self.source, "seek"):
+            self.source.seek(0)
+            content = self.source.read()
+            self.hash = sha1sum(content)
+            self.size = len(content)
+            self.source.seek(0)
+        elif isinstance(self.source, (str, Path)) and os.path.isfile(self.source):
+            self.size = os.path.getsize(self.source)
+
+    @property
+    def tree(self):
+        """The parsed lxml ElementTree of the document."""
+        return self._tree
+
     def __repr__(self):
         class_name = self.__class__.__name__
         return f"{class_name}(source={self.name!r})"
@@ -486,12 +584,13 @@ class TransXChangeDocument:
 class TransXChangeZip(ZippedValidator):
     """A class for working with a zip file containing transxchange files."""
 
-    def __init__(self, source):
+    def __init__(self, source, cache=False):
         if not hasattr(source, "seek"):
             f_ = open(source, "rb")
         else:
             f_ = source
         super().__init__(f_)
+        self._cache = cache
         self._schema_21 = None
         self._schema_24 = None
         self.docs = []
@@ -535,7 +634,7 @@ class TransXChangeZip(ZippedValidator):
 
         """
         with self.open(name) as f_:
-            doc = TransXChangeDocument(f_)
+            doc = TransXChangeDocument(f_, cache=self._cache)
         return doc
 
     def validate_contents(self):
@@ -575,27 +674,28 @@ class TransXChangeZip(ZippedValidator):
 class TransXChangeDatasetParser:
     """Class for iterating over transxchange file/s."""
 
-    def __init__(self, source):
+    def __init__(self, source, cache=False):
         self._source = source
+        self._cache = cache
 
     def is_zipfile(self) -> bool:
         return zipfile.is_zipfile(self._source)
 
     def _iter_docs(self):
         if self.is_zipfile():
-            with TransXChangeZip(self._source) as zip_:
+            with TransXChangeZip(self._source, cache=self._cache) as zip_:
                 for doc in zip_.iter_doc():
                     yield doc
         else:
-            yield TransXChangeDocument(self._source)
+            yield TransXChangeDocument(self._source, cache=self._cache)
 
     def get_documents(self) -> Iterator[TransXChangeDocument]:
         if self.is_zipfile():
-            with TransXChangeZip(self._source) as zip_:
+            with TransXChangeZip(self._source, cache=self._cache) as zip_:
                 for doc in zip_.iter_doc():
                     yield doc
         else:
-            yield TransXChangeDocument(self._source)
+            yield TransXChangeDocument(self._source, cache=self._cache)
 
     def get_transxchange_versions(self) -> List[TransXChangeElement]:
         return [doc.get_transxchange_version() for doc in self.get_documents()]
@@ -1,10 +1,11 @@
-import copy
 import json
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import requests
 from django.conf import settings
@@ -14,7 +15,7 @@ from requests import RequestException
 from transit_odp.dqs.constants import OBSERVATIONS, STOPNAMEOBSERVATION
 from transit_odp.pipelines.constants import SchemaCategory
 from transit_odp.pipelines.models import SchemaDefinition
-from transit_odp.pipelines.pipelines.xml_schema import SchemaLoader
+from transit_odp.pipelines.pipelines.xml_schema import schema_cache
 from transit_odp.timetables.constants import TXC_XSD_PATH
 from transit_odp.transmodel.models import BankHolidays
 
@@ -23,8 +24,7 @@ logger = logging.getLogger(__name__)
 
 def get_transxchange_schema():
     definition = SchemaDefinition.objects.get(category=SchemaCategory.TXC)
-    schema_loader = SchemaLoader(definition, TXC_XSD_PATH)
-    return schema_loader.schema
+    return schema_cache.get(definition, TXC_XSD_PATH)
 
 
 class HolidaysNonSubstituteEnum(Enum):
@@ -251,6 +251,80 @@ def get_vehicle_journey_codes_sorted(
     return list(vehicle_journeys.itertuples(index=False, name=None))
 
 
+def format_departure_times(departure_times: pd.Series) -> pd.Series:
+    """
+    Format the departure times as HH:MM, formatting each distinct time only once
+    """
+    formatted = {
+        departure_time: departure_time.strftime("%H:%M")
+        for departure_time in departure_times.unique()
+    }
+    return departure_times.map(formatted)
+
+
+def get_stop_observations(
+    df_observed_stops: pd.DataFrame,
+    df_full_observation_list: pd.DataFrame,
+    observation_contents: dict,
+    stop_keys: List[str],
+    vehicle_journey_codes_sorted: List,
+    stops: Dict,
+) -> Dict:
+    """
+    Get the observations of the stops of each journey, adding the observations
+    about the stop itself to the stops
+    """
+    observation_stops = {}
+    observations_by_stop = defaultdict(list)
+    df_full_observation_list = df_full_observation_list.drop_duplicates()
+    for service_pattern_stop_id, observation_type in zip(
+        df_full_observation_list["service_pattern_stop_id"],
+        df_full_observation_list["observation"],
+    ):
+        observations_by_stop[int(service_pattern_stop_id)].append(observation_type)
+
+    df_observed_stops = df_observed_stops.drop_duplicates(
+        subset=["stop_index", "journey_index"]
+    ).sort_values(["stop_index", "journey_index"])
+
+    for stop_index, journey_index, service_pattern_stop_id in zip(
+        df_observed_stops["stop_index"],
+        df_observed_stops["journey_index"],
+        df_observed_stops["service_pattern_stop_id"],
+    ):
+        observation_types = observations_by_stop.get(int(service_pattern_stop_id))
+        if not observation_types:
+            continue
+
+        stop_key = stop_keys[stop_index]
+        _, journey_id = vehicle_journey_codes_sorted[journey_index]
+        observation = {}
+        # check if observations contain Incorrect stop type
+        stop_name_observations = [
+            observation_type
+            for observation_type in observation_types
+            if observation_type in STOPNAMEOBSERVATION
+        ]
+        if stop_name_observations:
+            stops[stop_key].update(
+                {"observation": observation_contents.get(stop_name_observations[0])}
+            )
+
+        obs_list = [
+            observation_contents.get(observation_type)
+            for observation_type in observation_types
+            if observation_type not in STOPNAMEOBSERVATION
+        ]
+        if len(obs_list) > 0:
+            observation.update({journey_id: obs_list})
+        if stop_key in observation_stops:
+            observation_stops[stop_key]["observations"].update(observation)
+        else:
+            observation_stops.update({stop_key: {"observations": observation}})
+
+    return observation_stops
+
+
 def get_df_timetable_visualiser(
     df_vehicle_journey_operating: pd.DataFrame,
     observation_contents: dict,
@@ -279,48 +353,39 @@ def get_df_timetable_visualiser(
         "stop_type",
         "service_pattern_stop_id",
     ]
+    stop_columns = ["common_name", "stop_sequence"]
+    journey_columns = ["vehicle_journey_code", "vehicle_journey_id"]
 
     df_vehicle_journey_operating = df_vehicle_journey_operating[columns_to_keep]
+    has_key = df_vehicle_journey_operating[stop_columns + journey_columns].notna()
+    # Stop names and journey codes repeat on every row, as categoricals they are
+    # sorted, de-duplicated and matched by their integer codes
+    df_vehicle_journey_operating = df_vehicle_journey_operating.astype(
+        {"common_name": "category"}
+    )
+    df_vehicle_journey_operating["vehicle_journey_code"] = (
+        df_vehicle_journey_operating["vehicle_journey_code"]
+        .astype(str)
+        .astype("category")
+    )
+
+    df_observed_stops = pd.DataFrame()
     if not df_full_observation_list.empty:
-        df_vehicle_journey_with_pattern_stop = copy.deepcopy(
-            df_vehicle_journey_operating
-        )
         # Drop Missing journey code as it will be attach to the table header
         df_full_observation_list = df_full_observation_list[
             df_full_observation_list["observation"] != "Missing journey code"
         ]
         # Filter service pattern stop id with observations only.
-        df_vehicle_journey_with_pattern_stop = df_vehicle_journey_with_pattern_stop[
-            df_vehicle_journey_with_pattern_stop["service_pattern_stop_id"].isin(
-                list(df_full_observation_list["service_pattern_stop_id"])
+        df_observed_stops = df_vehicle_journey_operating[
+            has_key.all(axis=1)
+            & df_vehicle_journey_operating["service_pattern_stop_id"].isin(
+                df_full_observation_list["service_pattern_stop_id"]
             )
         ]
-        # Add key to the filtered df.
-        df_vehicle_journey_with_pattern_stop[
-            "key"
-        ] = df_vehicle_journey_with_pattern_stop.apply(
-            lambda row: (
-                f"{str(row['common_name'])}_{str(row['stop_sequence'])}_{str(row['vehicle_journey_code'])}_{str(row['vehicle_journey_id'])}"
-                if pd.notnull(row["common_name"])
-                and pd.notnull(row["stop_sequence"])
-                and pd.notnull(row["vehicle_journey_code"])
-                and pd.notnull(row["vehicle_journey_id"])
-                else ""
-            ),
-            axis=1,
-        )
-
-    # drop service pattern stop id column if exists:
-    if "service_pattern_stop_id" in df_vehicle_journey_operating.columns:
-        df_vehicle_journey_operating = df_vehicle_journey_operating.drop(
-            columns=["service_pattern_stop_id"]
-        )
 
-    df_vehicle_journey_operating = df_vehicle_journey_operating.drop_duplicates()
-    df_vehicle_journey_operating["key"] = df_vehicle_journey_operating.apply(
-        lambda row: f"{row['common_name']}_{row['stop_sequence']}_{row['vehicle_journey_code']}_{row['vehicle_journey_id']}",
-        axis=1,
-    )
+    df_vehicle_journey_operating = df_vehicle_journey_operating.drop(
+        columns=["service_pattern_stop_id"]
+    ).drop_duplicates()
     vehicle_journey_codes_sorted = get_vehicle_journey_codes_sorted(
         df_vehicle_journey_operating
     )
@@ -328,32 +393,31 @@ def get_df_timetable_visualiser(
     df_sequence_time: pd.DataFrame = df_vehicle_journey_operating.sort_values(
         ["stop_sequence", "departure_time"]
     )
-    df_sequence_time = df_sequence_time[
-        [
-            "stop_sequence",
-            "common_name",
-            "street",
-            "indicator",
-            "atco_code",
-            "stop_type",
+    df_sequence_time = (
+        df_sequence_time[
+            [
+                "stop_sequence",
+                "common_name",
+                "street",
+                "indicator",
+                "atco_code",
+                "stop_type",
+            ]
         ]
-    ]
-    df_sequence_time = df_sequence_time.drop_duplicates()
-    df_sequence_time["key"] = df_sequence_time.apply(
-        lambda row: f"{row['common_name']}_{row['stop_sequence']}",
-        axis=1,
+        .drop_duplicates()
+        .reset_index(drop=True)
+    )
+    df_stop_index = df_sequence_time[stop_columns].assign(
+        stop_index=df_sequence_time.index
     )
     bus_stops = df_sequence_time["common_name"].tolist()
-    observation_stops = {}
-    stops = {}
-    departure_time_data = {}
 
-    for row in df_vehicle_journey_operating.to_dict("records"):
-        departure_time_data[row["key"]] = row["departure_time"].strftime("%H:%M")
-    stops_journey_code_time_list = []
+    stops = {}
+    stop_keys = []
     for idx, row in enumerate(df_sequence_time.to_dict("records")):
-        record = {}
-        stops[f"{row['common_name']}_{idx}"] = {
+        stop_key = f"{row['common_name']}_{idx}"
+        stop_keys.append(stop_key)
+        stops[stop_key] = {
             "atco_code": row["atco_code"],
             "street": row["street"],
             "indicator": row["indicator"],
@@ -361,105 +425,70 @@ def get_df_timetable_visualiser(
             "stop_seq": row["stop_sequence"],
             "stop_type": row["stop_type"],
         }
-        record["Journey Code"] = bus_stops[idx]
-        for (
-            journey_code,
-            journey_id,
-        ) in (
-            vehicle_journey_codes_sorted
-        ):  # tuple with journey code(cols) and journey id
-            key = f"{row['key']}_{journey_code}_{journey_id}"
-            record[journey_code] = {
-                "departure_time": departure_time_data.get(key, "-"),
-                "journey_id": journey_id,
-            }
-            if not df_full_observation_list.empty:
-                queried_df = df_vehicle_journey_with_pattern_stop[
-                    df_vehicle_journey_with_pattern_stop["key"] == key
-                ]
-                if not queried_df.empty:
-                    service_pattern_stop_id = int(
-                        queried_df["service_pattern_stop_id"].item()
-                    )
-                    observations_df = df_full_observation_list[
-                        df_full_observation_list["service_pattern_stop_id"]
-                        == service_pattern_stop_id
-                    ]
-                    if not observations_df.empty:
-                        observation = {}
-                        # Drop duplicate rows
-                        observations_df = observations_df.drop_duplicates()
-                        # check if observations contain Incorrect stop type
-                        obs_mapped_to_stop_name = observations_df[
-                            observations_df["observation"].isin(STOPNAMEOBSERVATION)
-                        ]
-                        if not obs_mapped_to_stop_name.empty:
-                            observation_type = str(
-                                obs_mapped_to_stop_name.observation.item()
-                            )
-                            stops[f"{row['common_name']}_{idx}"].update(
-                                {
-                                    "observation": observation_contents.get(
-                                        observation_type
-                                    )
-                                }
-                            )
-
-                        obs_list = [
-                            observation_contents.get(row.observation)
-                            for _, row in observations_df.iterrows()
-                            if row.observation not in STOPNAMEOBSERVATION
-                        ]
-                        if len(obs_list) > 0:
-                            observation.update({journey_id: obs_list})
-                        if f"{row['common_name']}_{idx}" in observation_stops:
-                            observation_stops[f"{row['common_name']}_{idx}"][
-                                "observations"
-                            ].update(observation)
-                        else:
-                            observation_stops.update(
-                                {
-                                    f"{row['common_name']}_{idx}": {
-                                        "observations": observation
-                                    }
-                                }
-                            )
-
-        stops_journey_code_time_list.append(record)
-
-    df_vehicle_journey_operating = pd.DataFrame(stops_journey_code_time_list)
-    # Adding missing journey code observation to the table header
-    if any(
-        "missing_journey_code" in col for col in df_vehicle_journey_operating.columns
-    ):
-        observation_stops["-"] = observation_contents.get("Missing journey code")
-    return (df_vehicle_journey_operating, stops, observation_stops)
 
-
-def is_vehicle_journey_operating(df_vj, target_date) -> bool:
-    df_vj["IsInRange"] = df_vj.apply(
-        lambda row: (target_date >= row["start_date"])
-        & (target_date <= row["end_date"]),
-        axis=1,
+    # A journey code is a column in the order it first departs, when journeys
+    # share a code the column shows the last of them
+    journey_ids = {}
+    for journey_code, journey_id in vehicle_journey_codes_sorted:
+        journey_ids[journey_code] = journey_id
+    journey_codes = list(journey_ids)
+
+    # Place the departure times of each stop of each journey in the matrix, where
+    # a journey calls at a stop more than once the last departure is shown
+    df_departures = (
+        df_vehicle_journey_operating[
+            stop_columns + journey_columns + ["departure_time"]
+        ]
+        .drop_duplicates(subset=stop_columns + journey_columns, keep="last")
+        .merge(df_stop_index, on=stop_columns)
     )
+    columns = pd.Categorical(
+        df_departures["vehicle_journey_code"], categories=journey_codes
+    ).codes
+    is_column_journey = (
+        np.array(list(journey_ids.values()))[columns]
+        == df_departures["vehicle_journey_id"].to_numpy()
+    )
+    departure_times = np.full((len(bus_stops), len(journey_codes)), "-", dtype=object)
+    departure_times[
+        df_departures["stop_index"].to_numpy()[is_column_journey],
+        columns[is_column_journey],
+    ] = format_departure_times(df_departures["departure_time"]).to_numpy()[
+        is_column_journey
+    ]
 
-    # Step 2: Find out the vehicle journeys which are not operating and lies within start and end date on the target date
-    df_non_operating = df_vj[~df_vj["operating_on_working_days"]]
-    df_service_nonoperating = df_non_operating[df_non_operating["IsInRange"]]
+    timetable = {"Journey Code": bus_stops}
+    for column, (journey_code, journey_id) in enumerate(journey_ids.items()):
+        timetable[journey_code] = [
+            {"departure_time": departure_time, "journey_id": journey_id}
+            for departure_time in departure_times[:, column]
+        ]
+    df_vehicle_journey_operating = pd.DataFrame(timetable)
 
-    if not df_service_nonoperating.empty:
-        return False
+    observation_stops = {}
+    if not df_observed_stops.empty:
+        df_journey_index = pd.DataFrame(
+            vehicle_journey_codes_sorted, columns=journey_columns
+        )
+        df_journey_index["journey_index"] = df_journey_index.index
+        df_observed_stops = df_observed_stops.merge(
+            df_stop_index, on=stop_columns
+        ).merge(df_journey_index, on=journey_columns)
+        observation_stops = get_stop_observations(
+            df_observed_stops,
+            df_full_observation_list,
+            observation_contents,
+            stop_keys,
+            vehicle_journey_codes_sorted,
+            stops,
+        )
 
-    # Step 3: Find out the vehicle journeys which are operating and fall outside the operating range
-    df_vj = df_vj[df_vj["operating_on_working_days"]]
-    if (
-        (not df_vj.empty)
-        and ((df_vj["IsInRange"] == False).all())
-        and (df_non_operating.empty)
+    # Adding missing journey code observation to the table header
+    if any(
+        "missing_journey_code" in col for col in df_vehicle_journey_operating.columns
     ):
-        return False
-
-    return True
+        observation_stops["-"] = observation_contents.get("Missing journey code")
+    return (df_vehicle_journey_operating, stops, observation_stops)
 
 
 def get_non_operating_vj_serviced_org(
@@ -467,31 +496,43 @@ def get_non_operating_vj_serviced_org(
 ) -> List:
     """
     Get the vehicle journeys non-operating based on the serviced organisation
-    working days
+    working days. A vehicle journey is not operating if the target date is in
+    a non-working period of a serviced organisation it does not run for, or if
+    it only runs for serviced organisations and the target date is outside all
+    of their working periods.
 
     :return: List
     Return the non-operating vehicle journey ids
     """
     if df_serviced_org_working_days.empty:
         return []
-    df_serviced_org_working_days = df_serviced_org_working_days.drop_duplicates()
-    df_serviced_org_working_days = df_serviced_org_working_days.sort_values(
-        by=["start_date"]
-    )
-    vehicle_journey_nonoperating = []
 
-    df_group_vehicle_journey_date = df_serviced_org_working_days.groupby(
-        by="vehicle_journey_id"
+    operating = df_serviced_org_working_days["operating_on_working_days"].astype(bool)
+    in_range = (df_serviced_org_working_days["start_date"] <= target_date) & (
+        df_serviced_org_working_days["end_date"] >= target_date
+    )
+    df_status = (
+        pd.DataFrame(
+            {
+                "vehicle_journey_id": df_serviced_org_working_days[
+                    "vehicle_journey_id"
+                ],
+                "operating": operating,
+                "operating_in_range": operating & in_range,
+                "non_operating": ~operating,
+                "non_operating_in_range": ~operating & in_range,
+            }
+        )
+        .groupby("vehicle_journey_id")
+        .any()
     )
-    vehicle_journey_operating_status = df_group_vehicle_journey_date.apply(
-        is_vehicle_journey_operating, target_date
-    ).to_dict()
-
-    vehicle_journey_nonoperating = [
-        vj for vj, status in vehicle_journey_operating_status.items() if not status
-    ]
 
-    return vehicle_journey_nonoperating
+    is_non_operating = df_status["non_operating_in_range"] | (
+        df_status["operating"]
+        & ~df_status["operating_in_range"]
+        & ~df_status["non_operating"]
+    )
+    return df_status.index[is_non_operating].tolist()
 
 
 def get_vehicle_journeyids_exceptions(
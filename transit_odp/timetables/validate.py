@@ -1,17 +1,23 @@
 import re
 import zipfile
 from logging import getLogger
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from lxml import etree
+import billiard
+from django.conf import settings
 
 from transit_odp.common.loggers import DatasetPipelineLoggerContext, PipelineAdapter
 from transit_odp.data_quality.pti.models import Observation, Violation
 from transit_odp.organisation.models import DatasetRevision, TXCFileAttributes
 from transit_odp.timetables.constants import PII_ERROR
 from transit_odp.timetables.proxies import TimetableDatasetRevision
-from transit_odp.timetables.transxchange import BaseSchemaViolation
+from transit_odp.timetables.transxchange import (
+    BaseSchemaViolation,
+    TransXChangeDocument,
+)
 from transit_odp.timetables.utils import get_transxchange_schema
+from transit_odp.validate import xml_workers
+from transit_odp.validate.utils import local_file_path
 from transit_odp.validate.xml import FileValidator, XMLValidator
 from transit_odp.validate.zip import ZippedValidator
 
@@ -46,11 +52,41 @@ REVISION_NUMBER_OBSERVATION = Observation(
 )
 
 
+def validate_txc_file(
+    file_, schema, cache=False
+) -> Tuple[List[BaseSchemaViolation], List[str]]:
+    """Schema validates a single TransXChange file.
+
+    With `cache` the parse seeds the document cache so the later stages of the
+    pipeline reuse it, see `TransXChangeDocumentCache`.
+
+    Returns:
+        The violations found in the file and the names of the files they were
+        found in.
+    """
+    validator = XMLValidator(file_)
+    tree = validator.parse()
+    if tree is None:
+        return [BaseSchemaViolation.from_error(validator.violations[0])], []
+
+    doc = TransXChangeDocument(file_, tree=tree, cache=cache).tree
+    violations = []
+    failed_filenames = []
+    if not schema.validate(doc):
+        for error in schema.error_log:
+            violations.append(BaseSchemaViolation.from_error(error))
+            failed_filenames.append(error.filename)
+    return violations, failed_filenames
+
+
 class DatasetTXCValidator:
-    def __init__(self, revision: DatasetRevision):
+    def __init__(self, revision: DatasetRevision, workers: Optional[int] = None):
         self._schema = get_transxchange_schema()
         self._revision = revision
         self._failed_violation_filenames = []
+        if workers is None:
+            workers = settings.XML_VALIDATION_WORKERS
+        self.workers = workers
 
     def get_number_of_files_uploaded(self):
         file_ = self._revision.upload_file
@@ -81,20 +117,59 @@ class DatasetTXCValidator:
             yield file_
 
     def get_violations(self):
+        if (
+            self.workers > 1
+            and self._revision.is_file_zip
+            and self.get_number_of_files_uploaded() > 1
+        ):
+            return self.get_violations_in_parallel()
+
         violations = []
         for file_ in self.iter_get_files():
-            error = XMLValidator(file_).dangerous_xml_check()
-            if error:
-                violations.append(BaseSchemaViolation.from_error(error[0]))
-                continue
+            file_violations, failed_filenames = validate_txc_file(
+                file_, self._schema, cache=True
+            )
+            violations += file_violations
+            self._failed_violation_filenames += failed_filenames
+        return violations
 
-            file_.seek(0)
-            doc = etree.parse(file_)
-            is_valid = self._schema.validate(doc)
-            if not is_valid:
-                for error in self._schema.error_log:
-                    violations.append(BaseSchemaViolation.from_error(error))
-                    self._failed_violation_filenames.append(error.filename)
+    def get_violations_in_parallel(self):
+        """Schema validates the files of the zip across a pool of worker processes.
+
+        Each worker compiles the schema once and reads the files straight out of
+        the zip. The violations are returned in the order of the files in the zip,
+        the same order as validating them serially.
+        """
+        context = DatasetPipelineLoggerContext(object_id=self._revision.dataset_id)
+        adapter = PipelineAdapter(logger, {"context": context})
+
+        file_ = self._revision.upload_file
+        with zipfile.ZipFile(file_) as zf:
+            names = [n for n in zf.namelist() if n.endswith(".xml")]
+        processes = min(self.workers, len(names))
+        chunksize = max(1, len(names) // (processes * 4))
+        adapter.info(f"Validating {len(names)} files with {processes} workers.")
+
+        violations = []
+        with local_file_path(file_) as zip_path:
+            pool = billiard.get_context("spawn").Pool(
+                processes=processes,
+                initializer=xml_workers.init_worker,
+                initargs=(
+                    zip_path,
+                    "transit_odp.timetables.utils.get_transxchange_schema",
+                    "transit_odp.timetables.validate.validate_txc_file",
+                ),
+            )
+            try:
+                for file_violations, failed_filenames in pool.imap(
+                    xml_workers.validate_file, names, chunksize=chunksize
+                ):
+                    violations += file_violations
+                    self._failed_violation_filenames += failed_filenames
+            finally:
+                pool.terminate()
+                pool.join()
         return violations
 
     def get_failed_violations_filenames(self):
@@ -120,7 +195,7 @@ class TimetableFileValidator:
         Raises:
             FileTooLarge: if file size is greater than max_file_size.
 
-            DangerousXML: if DefusedXmlException is raised during parsing.
+            DangerousXML: if the file contains a DTD or entity declarations.
             XMLSyntaxError: if the file cannot be parsed.
 
             NestedZipForbidden: if zip file contains another zip file.
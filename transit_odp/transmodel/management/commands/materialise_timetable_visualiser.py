@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from transit_odp.browse.timetable_visualiser import materialise_timetable_visualiser
+from transit_odp.organisation.constants import DatasetType
+from transit_odp.organisation.models import Dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Materialises the timetable visualiser of live timetable revisions "
+        "published before it was materialised on publishing"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "revision_ids",
+            nargs="*",
+            type=int,
+            help="The revisions to materialise, all live timetable revisions if none",
+        )
+
+    def handle(self, *args, **options):
+        revision_ids = options["revision_ids"]
+        if not revision_ids:
+            revision_ids = Dataset.objects.filter(
+                dataset_type=DatasetType.TIMETABLE, live_revision__isnull=False
+            ).values_list("live_revision_id", flat=True)
+
+        for revision_id in revision_ids:
+            created = materialise_timetable_visualiser(revision_id)
+            self.stdout.write(f"Revision {revision_id}: {created} matrices")
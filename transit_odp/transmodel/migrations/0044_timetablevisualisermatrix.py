@@ -0,0 +1,76 @@
+# Generated by Django 4.2.23 on 2026-10-17 10:12
+
+import django.db.models.deletion
+import django_extensions.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organisation", "0079_add_dataset_org_type_idx"),
+        ("transmodel", "0043_servicepatterndistance_coord_track_distance_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimetableVisualiserMatrix",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("service_code", models.CharField(max_length=255)),
+                (
+                    "line_name",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "day_of_week",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("Monday", "Monday"),
+                            ("Tuesday", "Tuesday"),
+                            ("Wednesday", "Wednesday"),
+                            ("Thursday", "Thursday"),
+                            ("Friday", "Friday"),
+                            ("Saturday", "Saturday"),
+                            ("Sunday", "Sunday"),
+                        ],
+                        max_length=20,
+                        null=True,
+                    ),
+                ),
+                ("files", models.JSONField(default=list)),
+                ("data", models.JSONField()),
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True
+                    ),
+                ),
+                (
+                    "revision",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timetable_visualiser_matrices",
+                        to="organisation.datasetrevision",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["revision", "service_code"],
+                        name="transmodel__revisio_363154_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -380,3 +380,39 @@ class BankHolidays(models.Model):
     date = models.DateField()
     notes = models.CharField(max_length=255, null=True, blank=True)
     division = models.CharField(max_length=255, null=True, blank=True)
+
+
+class TimetableVisualiserMatrix(models.Model):
+    """
+    The stops of the vehicle journeys of a service line operating on a day of the
+    week, materialised when the revision is published so the timetable visualiser
+    does not need to query them on every request.
+    """
+
+    revision = models.ForeignKey(
+        DatasetRevision,
+        related_name="timetable_visualiser_matrices",
+        on_delete=models.CASCADE,
+    )
+    service_code = models.CharField(max_length=255)
+    line_name = models.CharField(max_length=255, null=True, blank=True)
+    day_of_week = models.CharField(
+        max_length=20, choices=OperatingProfile.DAY_CHOICES, null=True, blank=True
+    )
+    # Distinct [revision_number, operating_period_start_date, public_use] of the
+    # files the rows came from, to find the latest file without loading the rows
+    files = models.JSONField(default=list)
+    # Dictionary encoded columns of the rows, see browse.timetable_visualiser
+    data = models.JSONField()
+    created = CreationDateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["revision", "service_code"]),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.id}, revision: {self.revision_id}, {self.service_code}, "
+            f"{self.line_name}, {self.day_of_week}"
+        )
@@ -1,6 +1,5 @@
 import pytest
-from defusedxml import DefusedXmlException
-from defusedxml.ElementTree import ParseError
+from lxml import etree
 
 from transit_odp.validate.tests.utils import (
     create_sparse_file,
@@ -109,13 +108,15 @@ def test_get_document_exception(tmp_path):
         assert len(op) == 1
 
 
-def test_dangerouse_xml_exception(tmp_path, mocker):
-    """Test that correct exception is raised when DefusedXmlException is thrown."""
-    parse = "transit_odp.validate.xml.detree.parse"
-    mocker.patch(parse, side_effect=DefusedXmlException)
-
+def test_dangerouse_xml_exception(tmp_path):
+    """Test that correct exception is raised when the XML contains a DTD."""
     file1 = tmp_path / "file1.xml"
-    create_sparse_file(file1, file_size=int(1e2))
+    xml_str = (
+        '<?xml version="1.0"?>'
+        '<!DOCTYPE root [<!ENTITY a "hello"><!ENTITY b "&a;&a;">]>'
+        "<root><child>&b;</child></root>"
+    )
+    create_text_file(file1, xml_str)
 
     str_file = str(file1)
     error_message = f"XML file {str_file} contains dangerous XML."
@@ -125,14 +126,11 @@ def test_dangerouse_xml_exception(tmp_path, mocker):
         op = validator.validate()
         assert op[0].filename == str_file
         assert op[0].message == error_message
+        assert validator.parse() is None
 
 
-def test_parse_error_exception(tmp_path, mocker):
-    """Test that correct exception is raised when ParseError is thrown."""
-
-    parse = "transit_odp.validate.xml.detree.parse"
-    mocker.patch(parse, side_effect=ParseError)
-
+def test_parse_error_exception(tmp_path):
+    """Test that correct exception is raised when the XML cannot be parsed."""
     file1 = tmp_path / "file1.xml"
     create_sparse_file(file1, file_size=int(1e2))
 
@@ -142,6 +140,37 @@ def test_parse_error_exception(tmp_path, mocker):
         assert op[0].filename == str(file1)
 
 
+def test_parse_returns_document(tmp_path):
+    """Test that parse returns the tree of a valid file."""
+    file1 = tmp_path / "file1.xml"
+    xml_declaration = '<?xml version="1.0"?>'
+    xml_str = "<root><child>hello,world</child></root>"
+    create_text_file(file1, xml_declaration + xml_str)
+    schema1 = tmp_path / "schema.xml"
+    create_text_file(schema1, TEST_SCHEMA)
+
+    with open(file1, "rb") as f, open(schema1, "rb") as schema:
+        validator = XMLValidator(f, schema=schema)
+        op = validator.validate()
+        assert len(op) == 0
+        assert validator.parse().getroot().tag == "root"
+
+
+def test_schema_violation_has_line(tmp_path):
+    """Test that a schema violation reports the line of the invalid element."""
+    file1 = tmp_path / "file1.xml"
+    xml_str = '<?xml version="1.0"?>\n<root>\n<branch>hello,world</branch>\n</root>'
+    create_text_file(file1, xml_str)
+    schema1 = tmp_path / "schema.xml"
+    create_text_file(schema1, TEST_SCHEMA)
+
+    with open(file1, "rb") as f, open(schema1, "rb") as schema:
+        validator = XMLValidator(f, schema=schema)
+        op = validator.validate()
+        assert len(op) == 1
+        assert op[0].line == 3
+
+
 def test_validate_xmls_from_zip_valid(tmp_path):
     filenames = [tmp_path / f"file{i}.xml" for i in range(1, 3)]
     xml_str = "<Root><Child>hello,world</Child></Root>"
@@ -174,3 +203,53 @@ def test_validate_xmls_from_zip_invalid_file(tmp_path):
         op, total_files = validate_xml_files_in_zip(zout)
         assert op[0].filename.split("/")[-1] == str_filename.split("/")[-1]
         assert total_files == 3
+
+
+def load_test_schema():
+    return etree.XMLSchema(etree.fromstring(TEST_SCHEMA.encode()))
+
+
+class InProcessPool:
+    """Runs a pool's work in the test process."""
+
+    def __init__(self, processes, initializer, initargs):
+        initializer(*initargs)
+
+    def imap(self, func, iterable, chunksize=1):
+        return map(func, iterable)
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def test_validate_xmls_from_zip_in_parallel_matches_serial(tmp_path, mocker):
+    filenames = []
+    for i in range(1, 6):
+        filename = tmp_path / f"file{i}.xml"
+        child = "child" if i % 2 else "branch"
+        create_text_file(filename, f"<root><{child}>hello,world</{child}></root>")
+        filenames.append(filename)
+
+    zip_filename = tmp_path / "zipfile.zip"
+    create_zip_file(zip_filename, filenames)
+    context = mocker.patch("transit_odp.validate.xml.billiard.get_context")
+    context.return_value.Pool = InProcessPool
+
+    with open(zip_filename, "rb") as zout:
+        serial, serial_total = validate_xml_files_in_zip(
+            zout, schema=load_test_schema(), workers=0
+        )
+        parallel, parallel_total = validate_xml_files_in_zip(
+            zout,
+            schema_loader="transit_odp.validate.tests.test_xml.load_test_schema",
+            workers=2,
+        )
+
+    assert serial_total == parallel_total == 5
+    assert len(serial) == 2
+    assert [(v.filename, v.message) for v in parallel] == [
+        (v.filename, v.message) for v in serial
+    ]
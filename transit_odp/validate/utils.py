@@ -1,5 +1,10 @@
 import io
+import os
+import shutil
+import tempfile
 import zipfile
+from contextlib import contextmanager
+from pathlib import Path
 from typing import Optional
 
 
@@ -54,3 +59,32 @@ def get_filetype_from_response(response) -> Optional[str]:
         return "xml"
 
     return None
+
+
+@contextmanager
+def local_file_path(file_):
+    """Yields a path to `file_` on the local file system.
+
+    Files that are not on the local file system, e.g. uploads held in S3 or
+    in-memory streams, are copied to a temporary file for the duration of the
+    context.
+    """
+    if isinstance(file_, (str, Path)):
+        yield str(file_)
+        return
+
+    try:
+        path = file_.path
+    except (AttributeError, NotImplementedError):
+        path = None
+
+    if path and os.path.exists(path):
+        yield path
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=Path(file_.name).suffix) as tmp:
+        file_.seek(0)
+        shutil.copyfileobj(file_, tmp)
+        tmp.flush()
+        file_.seek(0)
+        yield tmp.name
@@ -1,14 +1,16 @@
 import logging
 import zipfile
+from functools import lru_cache
+from pathlib import Path
 
-from defusedxml import DefusedXmlException
-from defusedxml import ElementTree as detree
-from defusedxml.ElementTree import ParseError
+import billiard
+from django.conf import settings
 from lxml import etree
 
 from transit_odp.common.loggers import DatasetPipelineLoggerContext, PipelineAdapter
+from transit_odp.validate import xml_workers
 from transit_odp.validate.exceptions import ValidationException
-from transit_odp.validate.utils import get_file_size
+from transit_odp.validate.utils import get_file_size, local_file_path
 
 logger = logging.getLogger(__name__)
 
@@ -86,67 +88,115 @@ class XMLValidator(FileValidator):
         self.violations = []
 
     def dangerous_xml_check(self):
+        """Parses the file with the hardened parser, recording a violation if it
+        cannot be parsed or contains a DTD.
+        """
+        self.parse()
+        return self.violations
+
+    def parse(self):
+        """Parses the file once with a parser that never resolves entities, loads
+        DTDs or accesses the network.
+
+        Returns:
+            doc(_ElementTree): the parsed document, or None if the file is not
+                valid XML or contains dangerous XML.
+        """
+        if self.is_file:
+            self.source.seek(0)
         try:
-            detree.parse(
-                self.source, forbid_dtd=True, forbid_entities=True, forbid_external=True
+            doc = etree.parse(self.source, get_hardened_parser())
+        except etree.XMLSyntaxError as err:
+            self.violations.append(
+                XMLSyntaxError(self.source.name, message=err.msg, line=err.lineno)
             )
-        except ParseError as err:
-            # DefusedXml wraps ExpatErrors in ParseErrors, requires extra step to
-            # get actual error message
-            if isinstance(err.msg, Exception):
-                self.violations.append(
-                    XMLSyntaxError(self.source.name, message=err.msg.args[0])
-                )
-            else:
-                self.violations.append(
-                    XMLSyntaxError(self.source.name, message=err.msg, line=err.lineno)
-                )
-        except DefusedXmlException:
+            return None
+        finally:
+            if self.is_file:
+                self.source.seek(0)
+
+        # Any document type declaration can define entities or reference
+        # external resources, so these are rejected outright.
+        if doc.docinfo.doctype:
             self.violations.append(DangerousXML(self.source.name))
-        return self.violations
+            return None
+
+        return doc
 
     def validate(self):
         """Validates the XML file.
 
+        The file is parsed a single time and the parsed tree is validated
+        against the schema.
+
         Raises:
             FileTooLarge: if file size is greater than max_file_size.
-            DangerousXML: if DefusedXmlException is raised during parsing.
+            DangerousXML: if the file contains a DTD or entity declarations.
             XMLSyntaxError: if the file cannot be parsed.
         """
         if self.is_too_large():
             self.violations.append(FileTooLarge(self.source.name))
             return self.violations
-        if len(self.dangerous_xml_check()) > 0:
-            return self.violations
         return self.validate_xml()
 
     def validate_xml(self):
-        """Parses `file` returning an lxml element object.
-        If `schema` is not None then `file` is validated against the schema.
+        """Parses `file` and, if `schema` is not None, validates the parsed tree
+        against the schema.
 
         Returns:
-           doc(_ElementTree): an lxml element tree representing the document.
-
-        Raises:
-            lxml.XMLSyntaxError: if contents of `file` do not match the `schema`
+           violations(list): the violations found in the file.
         """
-        if self.is_file:
-            self.source.seek(0)
-        parser = None
-        if self.schema is not None:
-            lxml_schema = get_lxml_schema(self.schema)
-            parser = etree.XMLParser(schema=lxml_schema)
-        try:
-            doc = etree.parse(self.source, parser)
-        except etree.XMLSyntaxError as err:
+        doc = self.parse()
+        if doc is None or self.schema is None:
+            return self.violations
+
+        lxml_schema = get_lxml_schema(self.schema)
+        if not lxml_schema.validate(doc):
+            error = lxml_schema.error_log[0]
             self.violations.append(
-                XMLSyntaxError(self.source.name, message=err.msg, line=err.lineno)
+                XMLSyntaxError(self.source.name, message=error.message, line=error.line)
             )
         return self.violations
 
 
-def validate_xml_files_in_zip(zip_file, schema=None, dataset=-1):
-    """Validate all the xml files in a zip archive."""
+def get_hardened_parser() -> etree.XMLParser:
+    """Returns a parser that is safe to use on untrusted XML.
+
+    lxml parsers must not be shared between threads, so a new one is created on
+    every call.
+    """
+    return etree.XMLParser(
+        resolve_entities=False, no_network=True, load_dtd=False, dtd_validation=False
+    )
+
+
+def validate_xml_file(file_, schema) -> list:
+    """Schema validates a single xml file, returning the violations found in it."""
+    return XMLValidator(file_, schema=schema).validate()
+
+
+def validate_xml_files_in_zip(
+    zip_file, schema=None, dataset=-1, schema_loader=None, workers=None
+):
+    """Validate all the xml files in a zip archive.
+
+    Args:
+        zip_file: The zip archive, a path or file-like object.
+        schema: The schema to validate the files against.
+        dataset (int): The id of the dataset, used in log messages.
+        schema_loader (str): The dotted path of a function that returns `schema`.
+            Workers need this to compile their own copy of the schema, so the
+            files are only validated in parallel when it is given.
+        workers (int): The number of processes to validate the files with.
+            Defaults to `settings.XML_VALIDATION_WORKERS`.
+
+    Returns:
+        Tuple[list, int]: The violations, in the order of the files in the zip,
+            and the number of files validated.
+    """
+    if workers is None:
+        workers = settings.XML_VALIDATION_WORKERS
+
     violations = []
     context = DatasetPipelineLoggerContext(
         component_name="FaresPipeline", object_id=dataset
@@ -158,23 +208,80 @@ def validate_xml_files_in_zip(zip_file, schema=None, dataset=-1):
             for name in zout.namelist()
             if name.endswith("xml") and not name.startswith("__")
         ]
-        lxml_schema = get_lxml_schema(schema)
         total_files = len(filenames)
+        if workers > 1 and total_files > 1 and schema_loader is not None:
+            violations = validate_xml_files_in_parallel(
+                zip_file, filenames, schema_loader, workers, adapter
+            )
+            return violations, total_files
+
+        lxml_schema = get_lxml_schema(schema)
         for index, name in enumerate(filenames, 1):
             adapter.info(f"XML Validation of file {index} of {total_files} - {name}.")
             with zout.open(name) as xmlout:
-                violations += XMLValidator(xmlout, schema=lxml_schema).validate()
+                violations += validate_xml_file(xmlout, lxml_schema)
                 adapter.info(
                     f"Completed XML Validation of file {index} of {total_files} - {name}."
                 )
     return violations, total_files
 
 
+def validate_xml_files_in_parallel(
+    zip_file, filenames, schema_loader: str, workers: int, adapter: PipelineAdapter
+):
+    """Validates the files of a zip across a pool of worker processes.
+
+    Each worker compiles the schema once and reads the files straight out of the
+    zip. The violations are returned in the order of `filenames`, the same order
+    as validating the files serially.
+    """
+    processes = min(workers, len(filenames))
+    chunksize = max(1, len(filenames) // (processes * 4))
+    adapter.info(f"XML Validation of {len(filenames)} files with {processes} workers.")
+    violations = []
+    with local_file_path(zip_file) as zip_path:
+        pool = billiard.get_context("spawn").Pool(
+            processes=processes,
+            initializer=xml_workers.init_worker,
+            initargs=(zip_path, schema_loader),
+        )
+        try:
+            for file_violations in pool.imap(
+                xml_workers.validate_file, filenames, chunksize=chunksize
+            ):
+                violations += file_violations
+        finally:
+            pool.terminate()
+            pool.join()
+    adapter.info(f"Completed XML Validation of {len(filenames)} files.")
+    return violations
+
+
+@lru_cache(maxsize=8)
+def compile_schema_from_location(location: str, modified=None) -> etree.XMLSchema:
+    """Compiles the schema at a file path or url, once per process.
+
+    `modified` is the modification time of a local file, so that a schema is
+    compiled again when the file changes.
+    """
+    logger.info(f"[XML] => Parsing {location}.")
+    return etree.XMLSchema(etree.parse(location))
+
+
 def get_lxml_schema(schema):
-    """Creates an lxml XMLSchema object from a file, file path or url."""
+    """Creates an lxml XMLSchema object from a file, file path or url.
+
+    Schemas given by path or url are compiled once per process, schemas given as
+    file objects are compiled on every call.
+    """
     if schema is None:
         return
 
+    if isinstance(schema, (str, Path)):
+        path = Path(schema)
+        modified = path.stat().st_mtime_ns if path.is_file() else None
+        return compile_schema_from_location(str(schema), modified)
+
     if not isinstance(schema, etree.XMLSchema):
         logger.info(f"[XML] => Parsing {schema}.")
         root = etree.parse(schema)
@@ -0,0 +1,48 @@
+"""Entry points of the processes that schema validate the files of a zip in parallel.
+
+The worker processes of the parallel pipeline steps are spawned rather than
+forked, so that they do not share the database connection of the Celery worker.
+Django is therefore not set up when they import their worker module, so these
+modules only import the standard library at module level and set Django up in
+their initializer.
+"""
+import zipfile
+
+_schema = None
+_validate = None
+_zip = None
+
+
+def init_worker(
+    zip_path: str,
+    schema_loader: str,
+    file_validator: str = "transit_odp.validate.xml.validate_xml_file",
+):
+    """Sets up Django, compiles the schema and opens the zip being validated.
+
+    Args:
+        zip_path (str): The path of the zip on the local file system.
+        schema_loader (str): The dotted path of a function returning the schema.
+        file_validator (str): The dotted path of a function validating a file
+            against the schema.
+    """
+    global _schema, _validate, _zip
+    import django
+
+    django.setup()
+
+    from django.utils.module_loading import import_string
+
+    _schema = import_string(schema_loader)()
+    _validate = import_string(file_validator)
+    _zip = zipfile.ZipFile(zip_path)
+
+
+def validate_file(name: str):
+    """Schema validates a single file, read straight out of the zip.
+
+    Returns:
+        The result of `file_validator` for the file.
+    """
+    with _zip.open(name) as xmlout:
+        return _validate(xmlout, _schema)